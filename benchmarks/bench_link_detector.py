@@ -0,0 +1,45 @@
+"""
+Micro-benchmark: regex antiga do anti-link x LinkDetector, incluindo entradas adversariais.
+Uso: python benchmarks/bench_link_detector.py
+"""
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.link_detector import LinkDetector  # noqa: E402
+
+OLD_LINK_RE = re.compile(
+    r"(https?://|www\.)[^\s]+|([a-z0-9-]+\.)+(com|net|org|gg|io|tv)(/[^\s]*)?",
+    re.I
+)
+
+CASES = {
+    "chat normal": "kkkkk que jogada absurda, alguém viu o clip de ontem? GG demais",
+    "link simples": "olha isso https://clips.twitch.tv/AbcDef123 muito bom",
+    "dominio solto": "entra no meusite.com.br/promo agora",
+    "a.a.a (2k)": "a." * 1000,
+    "a.a.a sem espaço (4k)": "a." * 2000 + "x",
+    "labels longos (2k)": ".".join(["abcdefghij" * 5] * 40),
+    "muitos tokens": " ".join(["palavra.qualquer"] * 300),
+}
+
+
+def bench(fn, text, number):
+    return min(timeit.repeat(lambda: fn(text), number=number, repeat=3)) / number * 1e6
+
+
+def main():
+    detector = LinkDetector()
+    print(f"{'caso':<24}{'regex (us)':>14}{'detector (us)':>16}{'ganho':>10}")
+    for name, text in CASES.items():
+        number = 3 if len(text) > 1000 else 2000
+        old = bench(OLD_LINK_RE.search, text, number)
+        new = bench(detector.find, text, number)
+        print(f"{name:<24}{old:>14.1f}{new:>16.1f}{old / new:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,26 @@
 import cmd
 import socket
-import time
 import random
-import re
+import threading
 from datetime import datetime
-from typing import Counter
 
 from services.twitch_api import TwitchAPIService
 from services.points_service import PointsService
 from services.moderation_service import ModerationService
-from services.variable_resolver import VariableResolver
+from services.variable_resolver import VariableResolver, COST_CACHED, COST_NETWORK
 from services.giveaway_service import GiveawayService
+from services.irc_parser import IRCMessage, parse_irc_line, iter_irc_lines
+from services.command_registry import CommandRegistry
+from services.response_template import TemplateCache
+from services.storage import open_store
+from services.points_accrual import PointsAccrual
+from services.watchtime_service import WatchtimeService
+from services.chatters_roster import ChattersRoster
+from services.giveaway_entries import GiveawayEntryPipeline
+from services.event_bus import EventBus, ChatMessage, ActivityEvent, GiveawayChanged, GiveawayWinner
+from services.outgoing_queue import (
+    OutgoingQueue, LIMIT_MOD, LIMIT_USER, PRIORITY_MODERATION, PRIORITY_COMMAND, PRIORITY_EVENT
+)
 
 
 class TwitchChatBot:
@@ -19,39 +29,82 @@ class TwitchChatBot:
         self.config = config
         self.connected = False
         self.sock = None
+        self._sock_lock = threading.Lock()
+        # único writer de PRIVMSG, com limite do Twitch e faixas de prioridade; PONG/CAP vão direto
+        self.outgoing = OutgoingQueue(self._write_privmsg, limit=LIMIT_USER, logger=self.gui.log_message)
+        self.is_mod = False
 
         self.moderation = ModerationService(
-            self.config, self.gui.log_message, self.send_raw, self.send_message
-        )
-
-        self.vars = VariableResolver(
-            self.config,
-            points_service=PointsService(
-                self.config.get('settings', {}).get('points_store_file', 'points.json'),
-                self.gui.log_message
-            ),
-            twitch_api=TwitchAPIService(self.config, self.gui.log_message)
+            self.config, self.gui.log_message, self.send_raw,
+            lambda text: self.send_message(text, priority=PRIORITY_MODERATION)
         )
 
         self.server = "irc.chat.twitch.tv"
         self.port = 6667
 
-        self.last_chatter_update = 0
-        self.chatters = []
-        self.chat_lines_this_tick = 0
+        # total de linhas do chat desde a conexão; o scheduler de timers guarda marcas sobre ele
+        self.chat_lines_total = 0
 
         self.twitch_api = TwitchAPIService(self.config, self.gui.log_message)
-        self.giveaways = GiveawayService(
-            storage_path=self.gui.settings.get('giveaways_store_file', 'giveaways.json'),
-            logger=self.gui.log_message
+        ps = self.config.get('settings', {})
+        log = self.gui.log_message
+        points_file = ps.get('points_store_file', 'points.json')
+        self.points = PointsService(points_file, log, store=open_store(
+            ps, 'points', points_file, log,
+            flush_interval_s=int(ps.get('points_flush_interval_s', 10)),
+            flush_ops=int(ps.get('points_flush_ops', 500))
+        ))
+        # bus da GUI quando existe; sem GUI, consumidores headless assinam bot.bus
+        self.bus = getattr(self.gui, "bus", None) or EventBus(log)
+        # uma única instância: a da GUI quando existe, para bot e UI verem o mesmo estado
+        shared = getattr(self.gui, "giveaways_service", None)
+        self.giveaways = shared if isinstance(shared, GiveawayService) else GiveawayService.from_settings(self.gui.settings, log)
+
+        self.templates = TemplateCache()
+        self.vars = VariableResolver(
+            self.config,
+            points_service=self.points,
+            twitch_api=self.twitch_api,
+            templates=self.templates,
+            logger=log,
+            users_store=open_store(ps, 'users', 'users.json', log, indent=2)
+        )
+        self.roster = ChattersRoster(
+            lambda: self.twitch_api.get_chatters(
+                str(self.config['target_channel_id']), str(self.config['bot_user_id'])
+            ),
+            refresh_s=int(ps.get('chatters_refresh_s', 60)),
+            logger=log
         )
-        self.giveaways = GiveawayService(
-            self.gui.settings.get('giveaways_store_file', 'giveaways.json'),
-            self.gui.log_message
+        self.watchtime = WatchtimeService(
+            self.twitch_api, self.vars.users, self.points,
+            lambda: self.gui.settings, self.config, logger=log,
+            present_source=self.roster.snapshot
         )
+        self.vars.register('uptime', lambda ctx: self._format_uptime(), COST_NETWORK)
+        self.vars.register('rand_user', lambda ctx: self._random_chatter(), COST_CACHED)
+        self.vars.register('touser', self._touser_var)
 
         self.moderation.api = self.api = self.twitch_api
-        self._points_last_msg_time = {}
+        self.moderation.vars = self.vars
+        self.accrual = PointsAccrual(
+            self.points, lambda: self.gui.settings,
+            interval_s=float(ps.get('points_accrual_flush_s', 5)),
+            logger=log
+        )
+        self.giveaway_entries = GiveawayEntryPipeline(
+            self.giveaways, self.points, lambda: self.gui.settings, self.send_message,
+            on_flush=lambda accepted: self._notify_giveaways(refresh=True),
+            before_batch=self.accrual.flush,
+            window_s=float(ps.get('giveaways_entry_window_s', 0.5)),
+            logger=log
+        )
+
+        self.registry = CommandRegistry(
+            lambda: self.gui.settings,
+            lambda: self.config.get('commands', {})
+        )
+        self.templates.warm(self.config.get('commands', {}))
 
     def connect(self):
         """Conectar ao servidor Twitch"""
@@ -64,8 +117,10 @@ class TwitchChatBot:
             self.send_raw(f"JOIN #{self.config['channel']}")
             self.send_raw("CAP REQ :twitch.tv/commands")
             self.send_raw("CAP REQ :twitch.tv/tags")
+            self.send_raw("CAP REQ :twitch.tv/membership")
 
             self.connected = True
+            self.outgoing.start()
             self.gui.log_message(f"✅ Conectado ao canal #{self.config['channel']}!", "success")
             self.gui.log_message("💡 Use !cmdd add/remove para gerenciar comandos!", "info")
 
@@ -75,6 +130,22 @@ class TwitchChatBot:
 
     def disconnect(self):
         """Desconectar do servidor"""
+        # cada etapa isolada: uma falha não pode pular a gravação dos pontos/usuários
+        for name, step in (
+            ("moderação", self.moderation.stop),
+            ("watchtime", self.watchtime.stop),
+            ("roster", self.roster.stop),
+            ("API da Twitch", self.twitch_api.close),
+            ("entradas do sorteio", self.giveaway_entries.stop),
+            ("acúmulo de pontos", self.accrual.stop),
+            ("pontos", self.points.close),
+            ("usuários", self.vars.users.close),
+            ("fila de envio", self.outgoing.stop),
+        ):
+            try:
+                step()
+            except Exception as e:
+                self.gui.log_message(f"⚠️ Erro ao encerrar {name}: {e}", "warning")
         if self.sock:
             try:
                 self.sock.close()
@@ -83,54 +154,59 @@ class TwitchChatBot:
         self.connected = False
 
     def send_raw(self, message):
-        """Enviar mensagem raw"""
+        """Enviar mensagem raw (sem limite; PRIVMSG deve passar por send_message)"""
         if self.sock:
-            self.sock.send(f"{message}\r\n".encode('utf-8'))
+            data = f"{message}\r\n".encode('utf-8')
+            with self._sock_lock:
+                self.sock.sendall(data)
 
-    def send_message(self, message):
-        """Enviar mensagem para o chat"""
+    def send_message(self, message, priority=PRIORITY_COMMAND, coalesce_key=None, part=None, render=None):
+        """Enfileirar mensagem para o chat (enviada pelo writer respeitando o rate limit)"""
         if self.connected:
-            self.send_raw(f"PRIVMSG #{self.config['channel']} :{message}")
-            self.gui.log_message(f"🤖 {message}", "bot")
+            self.outgoing.submit(message, priority, coalesce_key=coalesce_key, part=part, render=render)
+
+    def _write_privmsg(self, message):
+        self.send_raw(f"PRIVMSG #{self.config['channel']} :{message}")
+        self.gui.log_message(f"🤖 {message}", "bot")
+
+    def _on_userstate(self, msg):
+        """USERSTATE diz se o bot é mod/broadcaster no canal: ajusta o limite de envio."""
+        tags = msg.tags or {}
+        badges = tags.get('badges', '') or ''
+        is_mod = tags.get('mod') == '1' or 'broadcaster/' in badges or 'moderator/' in badges
+        if is_mod != self.is_mod:
+            self.is_mod = is_mod
+            self.outgoing.set_limit(LIMIT_MOD if is_mod else LIMIT_USER)
+            self.gui.log_message(
+                f"📨 Limite de envio: {self.outgoing.limit}/{int(self.outgoing.window_s)}s"
+                + (" (bot é mod)" if is_mod else ""), "info"
+            )
 
     def parse_message(self, line):
         """Parsear mensagem do IRC e extrair tags de permissão."""
-        if "PRIVMSG" not in line:
+        msg = line if isinstance(line, IRCMessage) else parse_irc_line(line)
+        if msg is None or msg.command != "PRIVMSG":
             return
 
         try:
-            tags_match = re.search(r'^@([^ ]+) :', line)
-            user_match = re.search(r':(\w+)!', line)
-            message_match = re.search(r'PRIVMSG #\w+ :(.+)', line)
-
-            tags = {}
-            msg_id = None
-            if tags_match:
-                raw = tags_match.group(1)
-                pairs = [p for p in raw.split(';') if '=' in p]
-                tags = {k: v for k, v in (p.split('=', 1) for p in pairs)}
-                msg_id = tags.get('id')
-
-            if not (user_match and message_match):
+            user = msg.nick
+            if not user or msg.trailing is None:
                 return
 
-            user = user_match.group(1)
-            message = message_match.group(1).strip()
+            tags = msg.tags
+            msg_id = tags.get('id')
+            message = msg.trailing.strip()
 
-            try:
-                pg = self._find_giveaways_page()
-                if pg:
-                    self._ui_call(pg.feed_chat, user, message)
-            except Exception:
-                pass
+            self.bus.publish(ChatMessage(user, message, tags))
 
             permissions = {'is_mod': False, 'is_broadcaster': False, 'is_vip': False}
             is_cheer = False
             bits_amount = 0
 
-            if tags_match:
-                tags_raw = tags_match.group(1)
-                tags = {t.split('=')[0]: t.split('=')[1] for t in tags_raw.split(';') if '=' in t}
+            if msg.has_tags:
+                user_id = tags.get('user-id')
+                if user_id:
+                    self.twitch_api.remember_user_id(user, user_id)
 
                 if user.lower() == self.config['channel'].lower() or ('badges' in tags and 'broadcaster/1' in tags.get('badges', '')):
                     permissions['is_broadcaster'] = True
@@ -151,12 +227,14 @@ class TwitchChatBot:
                     message,
                     is_mod=permissions.get('is_mod', False),
                     is_broadcaster=permissions.get('is_broadcaster', False),
-                    message_id=msg_id
+                    message_id=msg_id,
+                    user_id=user_id
                 ):
                     return
 
             if user.lower() != self.config['bot_user_name'].lower():
-                self.chat_lines_this_tick += 1
+                self.chat_lines_total += 1
+                self.roster.on_message(user)
 
             self.gui.log_message(f"{user}: {message}", "chat")
 
@@ -164,93 +242,39 @@ class TwitchChatBot:
                 ps = self.gui.settings or {}
                 if ps.get("points_enabled", False) and ps.get("points_accrual_enabled", True):
                     if user.lower() != self.config['bot_user_name'].lower():
-                        now = time.time()
-                        cd = int(ps.get("points_accrual_cooldown_s", 60) or 0)
-                        last = self._points_last_msg_time.get(user.lower(), 0)
-
                         bypass = ps.get("points_bypass_mods", True) and (permissions.get('is_mod') or permissions.get('is_broadcaster'))
-                        if bypass or now - last >= cd:
-                            amount = int(ps.get("points_accrual_per_msg", 1) or 0)
-                            if amount > 0:
-                                self.points.add(user, amount)
-                            self._points_last_msg_time[user.lower()] = now
+                        self.accrual.note_message(user, bypass_cooldown=bool(bypass))
             except Exception as e:
                 self.gui.log_message(f"⚠️ points acumulados: {e}", "warning")
 
             if is_cheer:
                 self._process_cheer_event(user, message, bits_amount)
 
-            ps = self.gui.settings or {}
-            points_on = ps.get("points_enabled", False)
-    
-            def _cmd_maybe(name_key, enabled_key, default_cmd, default_enabled=True):
-                c = (ps.get(name_key, default_cmd) or default_cmd).strip().lower()
-                en = bool(ps.get(enabled_key, default_enabled))
-                if not c:
-                    en = False
-                return c if (points_on and en) else None
-
-            cmd_balance = _cmd_maybe("points_cmd_balance", "points_cmd_balance_enabled", "!pontos", True)
-            cmd_give    = _cmd_maybe("points_cmd_give",    "points_cmd_give_enabled",    "!give",   True)
-            cmd_add     = _cmd_maybe("points_cmd_add",     "points_cmd_add_enabled",     "!addpoints", True)
-            cmd_set     = _cmd_maybe("points_cmd_set",     "points_cmd_set_enabled",     "!setpoints", True)
-            points_cmds = {c for c in [cmd_balance, cmd_give, cmd_add, cmd_set] if c}
-
-            mod_only_cmds = set()
-            if permissions['is_mod']:
-                mod_only_cmds.update(["!cmdd", "!setcount", "!addcount"])
-
-            config_cmds = set(self.config.get('commands', {}).keys())
-
-            permit_cmd = (
-                ps.get("moderation", {})
-                  .get("permit", {})
-                  .get("command_name", "!permit")
-            )
-            permit_cmd = (permit_cmd or "!permit").strip().lower()
-
-            try:
-                gs_on = bool(ps.get("giveaways_enabled", True))
-                g_join  = (ps.get("giveaways_cmd_join",  "!sorteio")     or "!sorteio").strip().lower()
-                g_draw  = (ps.get("giveaways_cmd_draw",  "!sortear")     or "!sortear").strip().lower()
-                g_start = (ps.get("giveaways_cmd_start", "!criasorteio") or "!criasorteio").strip().lower()
-                g_end   = (ps.get("giveaways_cmd_end",   "!encerrasorteio") or "!encerrasorteio").strip().lower()
-            except Exception:
-                gs_on = False
-                g_join = g_draw = g_start = g_end = ""
-
-            candidate_cmds = points_cmds.union(config_cmds).union(mod_only_cmds)
-            candidate_cmds.add(permit_cmd)
-
-            if gs_on:
-                candidate_cmds.update({g_join, g_draw, g_start, g_end})
-
-            found_command, start_index = None, -1
-            for part in message.split():
-                if not part.startswith('!'):
-                    continue
-                m = re.match(r'^![a-z0-9_]+', part.lower())
-                if not m:
-                    continue
-                root = m.group(0)
-                if root in candidate_cmds:
-                    found_command = root
-                    start_index = message.lower().find(root)
-                    break
-
-            if found_command and start_index != -1:
+            entry, start_index = self.registry.find(message, is_mod=permissions['is_mod'])
+            if entry is not None:
                 full_command_message = message[start_index:].strip()
-                self.process_command(user, full_command_message, permissions, tags=tags)
+                self.process_command(user, full_command_message, permissions, tags=tags, entry=entry)
 
         except Exception as e:
             self.gui.log_message(f"Erro ao parsear: {e}", "error")
 
-    def process_command(self, user, message, permissions, tags=None):
+    def process_command(self, user, message, permissions, tags=None, entry=None):
         """Processar comandos do chat"""
         tags = tags or {}
         cmd_parts = message.split(' ')
         cmd = cmd_parts[0].lower()
 
+        if entry is None:
+            entry = self.registry.lookup(cmd)
+            if entry is None:
+                return
+        kind = entry.kind
+        cmd = entry.trigger
+
+        if kind.startswith("points_"):
+            # saldos precisam incluir os pontos por mensagem ainda pendentes no lote
+            self.accrual.flush()
+
         user_level = 0
         if permissions.get('is_vip', False): user_level = 1
         if permissions.get('is_mod', False): user_level = 2
@@ -259,46 +283,25 @@ class TwitchChatBot:
         perm_map = {"everyone": 0, "vip": 1, "mod": 2, "broadcaster": 3}
         ps = self.gui.settings or {}
 
-        points_on = ps.get("points_enabled", False)
-
-        try:
-            gs_on = bool(ps.get("giveaways_enabled", True))
-            cmd_join  = (ps.get("giveaways_cmd_join","!sorteio") or "!sorteio").strip().lower()
-            cmd_draw  = (ps.get("giveaways_cmd_draw","!sortear") or "!sortear").strip().lower()
-            cmd_start = (ps.get("giveaways_cmd_start","!criasorteio") or "!criasorteio").strip().lower()
-            cmd_end   = (ps.get("giveaways_cmd_end","!encerrasorteio") or "!encerrasorteio").strip().lower()
-        except Exception:
-            gs_on=False
-            cmd_join=cmd_draw=cmd_start=cmd_end=""
-
-        if gs_on and cmd:
-            if cmd == cmd_start:
+        if kind.startswith("giveaway_"):
+            if kind == "giveaway_start":
                 title = " ".join(cmd_parts[1:]).strip() or "Sorteio"
+                cmd_join = self.registry.trigger_for("giveaway_join", "!sorteio")
                 self.giveaways.create(title)
                 self.send_message(f"🎁 Sorteio criado: {title} | Digite {cmd_join} para participar!")
                 self._notify_giveaways(winner=None, refresh=True)
                 return
 
-            if cmd == cmd_end:
+            if kind == "giveaway_end":
+                # entradas que chegaram antes do comando ainda estão na fila do pipeline
+                self.giveaway_entries.flush()
                 self.gui.settings['giveaways_entries_locked'] = True
                 self.gui.save_settings()
                 self.send_message("🔒 Entradas encerradas. Aguarde o sorteio!")
-                try:
-                    if hasattr(self, "_notify_giveaways"):
-                        self._notify_giveaways(refresh=True)
-                except Exception:
-                    pass
+                self._notify_giveaways(refresh=True)
                 return
 
-            if cmd == cmd_join:
-                ps = self.gui.settings or {}
-                if ps.get("giveaways_entries_locked", False):
-                    return
-                
-                cur = self.giveaways.current()
-                if not cur or cur.get("closed"):
-                    return
-
+            if kind == "giveaway_join":
                 tickets = 1
                 if len(cmd_parts) >= 2:
                     try:
@@ -314,60 +317,14 @@ class TwitchChatBot:
                 except Exception:
                     pass
 
-                max_per_user = int(ps.get("giveaways_max_entries_per_user", 0) or 0)
-                if max_per_user > 0:
-                    try:
-                        counts = Counter(cur.get("entrants", []))
-                        current = int(counts.get(user, 0))
-                    except Exception:
-                        current = 0
-                    requested = tickets
-                    if current >= max_per_user:
-                        limit_msg = ps.get(
-                            "giveaways_limit_message",
-                            "@{user}, você já atingiu o limite de {max} bilhete(s)."
-                        )
-                        self.send_message(limit_msg.format(user=user, max=max_per_user, current=current, requested=requested))
-                        return
-                    if current + requested > max_per_user:
-                        tickets = max_per_user - current
-                        if tickets <= 0:
-                            limit_msg = ps.get(
-                                "giveaways_limit_message",
-                                "@{user}, você já atingiu o limite de {max} bilhete(s)."
-                            )
-                            self.send_message(limit_msg.format(user=user, max=max_per_user, current=current, requested=requested))
-                            return
-                else:
-                    pass
-                
-                price = int(ps.get("giveaways_entry_price", 0) or 0)
-                spent = 0
-                if price > 0:
-                    cost = price * tickets
-                    balance = self.points.get(user)
-                    if balance < cost:
-                        msg_no_points = ps.get(
-                            "giveaways_not_enough_points_msg",
-                            "❌ @{user}, você não tem pontos suficientes para entrar (custa {price})."
-                        )
-                        self.send_message(msg_no_points.format(user=user, price=price, spent=cost))
-                        return
-                    self.points.add(user, -cost)
-                    spent = cost
-
-                self.giveaways.enter(user, tickets=tickets)
-                if price > 0:
-                    msg_buy = ps.get(
-                        "giveaways_buy_message",
-                        "🎟️ @{user} comprou {tickets} bilhete(s) por {spent} pontos!"
-                    )
-                    self.send_message(msg_buy.format(user=user, tickets=tickets, spent=spent, price=price))
-
-                self._notify_giveaways(refresh=True)
+                # validação (trava, limite, preço) e gravação acontecem em lote no pipeline
+                self.giveaway_entries.submit(user, tickets)
                 return
 
-            if cmd == cmd_draw and (permissions.get("is_mod") or permissions.get("is_broadcaster")):
+            if kind == "giveaway_draw":
+                if not (permissions.get("is_mod") or permissions.get("is_broadcaster")):
+                    return
+                self.giveaway_entries.flush()
                 winner = self.giveaways.pick_winner()
                 if winner:
                     cur = self.giveaways.close(winner=winner) or {}
@@ -378,22 +335,10 @@ class TwitchChatBot:
                     self.send_message("⚠️ Ainda não há participantes.")
                 return
 
-        def _cmd_active(name_key, enabled_key, default_cmd, default_enabled=True):
-            c = (ps.get(name_key, default_cmd) or default_cmd).strip().lower()
-            en = bool(ps.get(enabled_key, default_enabled))
-            if not c:
-                en = False
-            return c, en
-
-        cmd_balance, cmd_balance_enabled = _cmd_active("points_cmd_balance", "points_cmd_balance_enabled", "!pontos", True)
-        cmd_give,    cmd_give_enabled    = _cmd_active("points_cmd_give",    "points_cmd_give_enabled",    "!give",   True)
-        cmd_add,     cmd_add_enabled     = _cmd_active("points_cmd_add",     "points_cmd_add_enabled",     "!addpoints", True)
-        cmd_set,     cmd_set_enabled     = _cmd_active("points_cmd_set",     "points_cmd_set_enabled",     "!setpoints", True)
-
         min_transfer = int(ps.get("points_min_transfer", 1) or 1)
         pm = ps.get("points_messages", {}) or {}
 
-        if points_on and cmd_balance_enabled and cmd == cmd_balance:
+        if kind == "points_balance":
             target = cmd_parts[1].lstrip("@") if len(cmd_parts) >= 2 else user
             bal = self.points.get(target)
             msg = (pm.get("balance", "💰 {user} tem {balance} pontos.")
@@ -401,9 +346,9 @@ class TwitchChatBot:
             self.send_message(msg)
             return
 
-        if points_on and cmd_give_enabled and cmd == cmd_give:
+        if kind == "points_give":
             if len(cmd_parts) < 3:
-                self.send_message((pm.get("usage_give", "Uso: {cmd_give} @alvo <quantidade>")).format(cmd_give=cmd_give))
+                self.send_message((pm.get("usage_give", "Uso: {cmd_give} @alvo <quantidade>")).format(cmd_give=cmd))
                 return
             to_user = cmd_parts[1].lstrip("@")
             try:
@@ -423,9 +368,7 @@ class TwitchChatBot:
                                   .format(**{"from": user}))
             return
 
-        if points_on and (cmd_add_enabled or cmd_set_enabled) and cmd in (cmd_add, cmd_set):
-            if (cmd == cmd_add and not cmd_add_enabled) or (cmd == cmd_set and not cmd_set_enabled):
-                return
+        if kind in ("points_add", "points_set"):
             if user_level < perm_map["mod"]:
                 self.send_message(f"🚨 {user}, você não tem permissão para usar {cmd}.")
                 return
@@ -439,7 +382,7 @@ class TwitchChatBot:
                 self.send_message((pm.get("usage_admin", "Uso: {cmd} @user <quantidade>")).format(cmd=cmd))
                 return
 
-            if cmd == cmd_add:
+            if kind == "points_add":
                 bal = self.points.add(target, amount)
                 self.send_message((pm.get("add_ok", "➕ {target} agora tem {balance} pontos."))
                                   .format(target=target, balance=bal))
@@ -449,14 +392,12 @@ class TwitchChatBot:
                                   .format(target=target, balance=bal))
             return
 
-        if cmd == self.config.get('settings', {}).get('moderation', {}).get('permit', {}).get('command_name', '!permit'):
+        if kind == "permit":
             if user_level < perm_map['mod']:
                 return
             target = cmd_parts[1].lstrip('@') if len(cmd_parts) > 1 else ''
             if not target:
-                self.send_message('uso: {cmd} @user'.format(
-                    cmd=self.config.get('settings', {}).get('moderation', {}).get('permit', {}).get('command_name', '!permit')
-                ))
+                self.send_message('uso: {cmd} @user'.format(cmd=cmd))
                 return
             secs = int(self.config.get('settings', {}).get('moderation', {}).get('permit', {}).get('duration_seconds', 60))
             try:
@@ -468,10 +409,10 @@ class TwitchChatBot:
                 tpl = self.config.get('settings', {}).get('moderation', {}).get('permit', {}).get(
                     'message_template', '@{target} pode postar 1 link por {seconds}s.'
                 )
-                self.send_message(tpl.replace('{target}', target).replace('{seconds}', str(secs)))
+                self.send_message(self.vars.format(tpl, user, extra={'target': target, 'seconds': secs}))
             return
 
-        if cmd in ("!setcount", "!addcount"):
+        if kind in ("setcount", "addcount"):
             if user_level < perm_map["mod"]:
                 self.send_message(f"🚨 {user}, você não tem permissão para usar {cmd}.")
                 return
@@ -479,7 +420,7 @@ class TwitchChatBot:
             if len(parts) < 3:
                 self.send_message(f"❌ {user}, uso incorreto. Tente: {cmd} <contador> <valor>")
                 return
-            action = cmd[1:]
+            action = kind
             count_name = parts[1].lower().strip()
             value_str = parts[2].strip()
             try:
@@ -503,7 +444,7 @@ class TwitchChatBot:
                 self.gui.log_message(f"❌ Erro ao manipular contador {count_name}: {e}", "error")
             return
 
-        if cmd == "!cmdd":
+        if kind == "cmdd":
             if user_level < perm_map["mod"]:
                 self.send_message(f"🚨 {user}, você não tem permissão para usar {cmd}.")
                 return
@@ -512,9 +453,9 @@ class TwitchChatBot:
                 self.send_message(response)
             return
 
-        if cmd in self.config['commands']:
-            command_config = self.config['commands'][cmd]
-            if command_config.get('disabled', False):
+        if kind == "custom":
+            command_config = self.config['commands'].get(entry.name)
+            if not command_config or command_config.get('disabled', False):
                 return
 
             required_level = {"everyone": 0, "vip": 1, "mod": 2, "broadcaster": 3}.get(
@@ -540,56 +481,20 @@ class TwitchChatBot:
     def generate_response(self, user, command_config, full_message):
         """Gera resposta para comando, com suporte a variáveis e contadores."""
         cmd_type = command_config.get('type', 'static')
-        response_template = command_config['response']
-
-        format_vars = {'user': user, 'channel': self.config['channel']}
-        response_output = response_template
+        template = self.templates.get(command_config['response'])
+        if template.error is not None:
+            self.gui.log_message(f"❌ Erro de formatação: {template.error}", "error")
+            return f"❌ Erro grave no comando! (Erro: {template.error})"
 
-        if '{uptime}' in response_output:
-            response_output = response_output.replace('{uptime}', self._format_uptime())
-
-        should_save_settings = False
-        counts_dict = self.config['settings'].get('counts', {}).copy()
-
-        parts = full_message.split(' ')
-        try:
-            target_user = parts[1].strip().lstrip('@')
-            format_vars['touser'] = '@' + target_user
-        except IndexError:
-            format_vars['touser'] = '@' + user
-
-        if '{rand_user}' in response_template:
-            if time.time() - self.last_chatter_update > 60 or not self.chatters:
-                self._update_chatters_list()
-            format_vars['rand_user'] = '@' + (random.choice(self.chatters) if self.chatters else 'visitante')
-
-        count_matches = re.findall(r'\$count\{([^}]+)\}', response_template)
-        if count_matches:
-            for full_tag_content in count_matches:
-                final_display_value = 0
-                count_key = full_tag_content.lower().strip()
-                match_op = re.match(r'^(\w+)\s*([\+\-])\s*(\d+)$', full_tag_content.strip(), re.IGNORECASE)
-                if match_op:
-                    count_key = match_op.group(1).lower()
-                    operator = match_op.group(2)
-                    operand = int(match_op.group(3))
-                    current_value = counts_dict.get(count_key, 0)
-                    new_value = current_value + operand if operator == '+' else current_value - operand
-                    counts_dict[count_key] = new_value
-                    final_display_value = new_value
-                    should_save_settings = True
-                else:
-                    final_display_value = counts_dict.get(count_key, 0)
-                response_output = response_output.replace(f"$count{{{full_tag_content}}}", str(final_display_value), 1)
+        format_vars = {}
 
         # usavel?
-        dynamic_vars = {}
         if cmd_type == 'random_range':
             min_val = command_config.get('min', 1)
             max_val = command_config.get('max', 100)
             value = random.randint(min_val, max_val)
-            dynamic_vars['value'] = value
-            dynamic_vars['size'] = value
+            format_vars['value'] = value
+            format_vars['size'] = value
             reaction = ""
             if 'reactions' in command_config:
                 reactions = command_config['reactions']
@@ -609,42 +514,26 @@ class TwitchChatBot:
                     reaction = random.choice(reactions.get('large', [""]))
                 else:
                     reaction = random.choice(reactions.get('huge', [""]))
-            dynamic_vars['reaction'] = reaction
+            format_vars['reaction'] = reaction
 
         elif cmd_type == 'random_list':
             options = command_config.get('options', [])
             if options:
                 selected = random.choice(options)
-                dynamic_vars['value'] = selected
-                dynamic_vars['joke'] = selected
+                format_vars['value'] = selected
+                format_vars['joke'] = selected
 
         elif cmd_type == 'dynamic_time':
             current_time = datetime.now().strftime("%H:%M:%S")
-            dynamic_vars['value'] = current_time
-            dynamic_vars['time'] = current_time
-
-        rand_matches = re.findall(r'\$rand\{(\s*\d+\s*,\s*\d+\s*)\}', response_output, re.IGNORECASE)
-        if rand_matches:
-            for full_range_content in rand_matches:
-                full_tag = f"$rand{{{full_range_content}}}"
-                try:
-                    min_val, max_val = [int(n.strip()) for n in full_range_content.split(',')]
-                    if min_val <= max_val:
-                        random_value = random.randint(min_val, max_val)
-                    else:
-                        random_value = random.randint(max_val, min_val)
-                    response_output = response_output.replace(full_tag, str(random_value), 1)
-                except ValueError:
-                    self.gui.log_message(f"❌ Erro de formato no $rand: {full_range_content}. Usando valor 0.", "error")
-                    response_output = response_output.replace(full_tag, "0", 1)
-
-        if should_save_settings:
-            self.config['settings']['counts'] = counts_dict
-            self.gui.save_settings(quiet=True)
+            format_vars['value'] = current_time
+            format_vars['time'] = current_time
 
-        final_format_vars = {**format_vars, **dynamic_vars}
         try:
-            return response_output.format(**final_format_vars)
+            response, count_updates = self.vars.render(
+                template, user, extra=format_vars,
+                counts=self.config['settings'].get('counts', {}),
+                strict=True, ctx={'message': full_message}
+            )
         except KeyError as e:
             self.gui.log_message(f"❌ Variável {e} não preenchida.", "error")
             return f"❌ Erro no comando! Variável {e} não reconhecida."
@@ -652,6 +541,28 @@ class TwitchChatBot:
             self.gui.log_message(f"❌ Erro de formatação: {e}", "error")
             return f"❌ Erro grave no comando! (Erro: {e})"
 
+        if count_updates:
+            self.config['settings'].setdefault('counts', {}).update(count_updates)
+            self.gui.save_settings(quiet=True)
+
+        return response
+
+    def _touser_var(self, ctx):
+        parts = (ctx.get('message') or '').split(' ')
+        if len(parts) > 1:
+            return '@' + parts[1].strip().lstrip('@')
+        return '@' + (ctx.get('user') or '')
+
+    def _random_chatter(self):
+        return '@' + (self.roster.sample() or 'visitante')
+
+    def invalidate_commands(self, templates=True):
+        """Recompila a tabela de comandos (e os templates, se commands.json mudou)."""
+        self.registry.invalidate()
+        if templates:
+            self.templates.clear()
+            self.templates.warm(self.config.get('commands', {}))
+
     def _format_uptime(self) -> str:
         try:
             login = self.config.get('channel', '') or self.config.get('channel_login', '')
@@ -675,143 +586,61 @@ class TwitchChatBot:
 
     def run(self):
         self.connect()
-        buffer = ""
-        while self.connected and self.gui.is_running:
+        if self.connected:
+            self.roster.start()
+            self.watchtime.start()
             try:
-                data = self.sock.recv(1024).decode('utf-8')
-                if not data:
-                    break
-
-                buffer += data
-                lines = buffer.split('\r\n')
-                buffer = lines.pop()
-
-                for line in lines:
+                for line in iter_irc_lines(self.sock):
+                    if not (self.connected and self.gui.is_running):
+                        break
                     line = line.strip()
-                    if line:
-                        if line.startswith('PING'):
-                            self.send_raw('PONG :tmi.twitch.tv')
-                        else:
-                            self.parse_message(line)
-
-            except Exception:
-                break
+                    if not line:
+                        continue
+                    try:
+                        self._handle_line(line)
+                    except Exception as e:
+                        self.gui.log_message(f"⚠️ Erro ao processar linha do IRC: {e}", "warning")
+            except OSError as e:
+                if self.connected:
+                    self.gui.log_message(f"🔌 Conexão IRC encerrada: {e}", "system")
 
         self.disconnect()
 
-    def _update_chatters_list(self):
-        """Atualiza lista de chatters via Helix (delegado ao TwitchAPIService)."""
-        try:
-            broadcaster_id = str(self.config['target_channel_id'])
-            moderator_id = str(self.config['bot_user_id'])
-            chatters = self.twitch_api.get_chatters(broadcaster_id, moderator_id, first=1000) or []
-
-            chatters.extend([self.config['bot_user_name'], self.config['channel']])
-            self.chatters = sorted(set(chatters))
-            self.last_chatter_update = time.time()
-            return True
-        except Exception as e:
-            self.gui.log_message(f"❌ Erro ao atualizar chatters: {e}", "error")
-            return False
+    def _handle_line(self, line):
+        msg = parse_irc_line(line)
+        if msg is None:
+            return
+        if msg.command == 'PING':
+            self.send_raw(f"PONG :{msg.trailing or 'tmi.twitch.tv'}")
+        elif msg.command == 'USERSTATE':
+            self._on_userstate(msg)
+        elif msg.command == 'JOIN' and msg.nick:
+            self.roster.on_join(msg.nick)
+        elif msg.command == 'PART' and msg.nick:
+            self.roster.on_part(msg.nick)
+        else:
+            self.parse_message(msg)
 
     def _process_cheer_event(self, user, message, bits):
         """Manipula o evento de Cheer (Alerta e/ou TTS)."""
         settings = self.gui.settings
-        placeholders = {'user': user, 'bits': bits, 'message': message, 'channel': self.config['channel']}
+        placeholders = {'bits': bits, 'message': message}
 
         if settings.get('msg_cheer_alert_enabled', False):
             msg_template = settings.get('msg_cheer_alert', '{user} cheerou {bits} bits!')
-            try:
-                chat_message = msg_template.format_map(placeholders)
-                self.send_message(chat_message)
-            except KeyError as e:
-                self.gui.log_message(f"Erro no formato da msg de cheer (alerta): {e}", "error")
+            self.send_message(self.vars.format(msg_template, user, extra=placeholders), priority=PRIORITY_EVENT)
 
         if settings.get('tts_cheer_enabled', False):
             min_bits = settings.get('tts_cheer_min_bits', 100)
             if bits >= min_bits:
                 tts_template = settings.get('tts_cheer_format', '{user} disse: {message}')
-                try:
-                    tts_message = tts_template.format_map(placeholders)
-                    self.gui.request_tts_playback(tts_message)
-                except KeyError as e:
-                    self.gui.log_message(f"Erro no formato da msg de cheer (TTS): {e}", "error")
+                self.gui.request_tts_playback(self.vars.format(tts_template, user, extra=placeholders))
 
         activity_details = f"{bits} bits: {message[:20]}..."
-        self.gui.add_activity_entry("cheer.message", user, activity_details)
-
-    def _find_giveaways_page(self):
-        try:
-            pages = getattr(self.gui, "pages", None)
-            if isinstance(pages, dict):
-                for key in ("sorteios", "giveaways", "giveaway", "giveaways_page"):
-                    pg = pages.get(key)
-                    if pg and hasattr(pg, "refresh_from_bot") and hasattr(pg, "set_winner_from_bot"):
-                        return pg
-                for pg in pages.values():
-                    if hasattr(pg, "refresh_from_bot") and hasattr(pg, "set_winner_from_bot"):
-                        return pg
-        except Exception:
-            pass
-
-        for name in ("giveaways_page", "sorteios_page", "giveaways", "sorteios"):
-            try:
-                pg = getattr(self.gui, name)
-                if pg and hasattr(pg, "refresh_from_bot") and hasattr(pg, "set_winner_from_bot"):
-                    return pg
-            except Exception:
-                pass
-        return None
-
-    def _ui_call(self, fn, *args):
-        try:
-            if hasattr(self.gui, "after"):
-                self.gui.after(0, fn, *args)
-            elif hasattr(self.gui, "root") and hasattr(self.gui.root, "after"):
-                self.gui.root.after(0, fn, *args)
-            else:
-                fn(*args)
-        except Exception as e:
-            try:
-                self.gui.log_message(f"giveaways ui call falhou: {e}", "warning")
-            except Exception:
-                pass
-
-    def _reload_giveaways(self):
-        try:
-            for m in ("reload", "reload_from_disk", "load", "refresh"):
-                if hasattr(self.giveaways, m) and callable(getattr(self.giveaways, m)):
-                    getattr(self.giveaways, m)()
-                    return
-            self.giveaways = GiveawayService(
-                storage_path=self.gui.settings.get('giveaways_store_file', 'giveaways.json'),
-                logger=self.gui.log_message
-            )
-        except Exception as e:
-            self.gui.log_message(f"⚠️ reload giveaways falhou: {e}", "warning")
+        self.bus.publish(ActivityEvent("cheer.message", user, activity_details))
 
-    def _notify_giveaways(self, winner=None, refresh=False, _retries=2):
-        try:
-            if refresh:
-                self._reload_giveaways()
-
-            page = getattr(self.gui, "pages", {}).get("sorteios")
-            if not page:
-                if _retries > 0:
-                    def _retry():
-                        self._notify_giveaways(winner=winner, refresh=refresh, _retries=_retries-1)
-                    if hasattr(self.gui, "after"):
-                        self.gui.after(400, _retry)
-                    elif hasattr(self.gui, "root") and hasattr(self.gui.root, "after"):
-                        self.gui.root.after(400, _retry)
-                return
-
-            if winner is not None and hasattr(page, "set_winner_from_bot"):
-                self.gui.after(0, lambda: page.set_winner_from_bot(winner))
-            if refresh and hasattr(page, "refresh_from_bot"):
-                self.gui.after(0, page.refresh_from_bot)
-        except Exception as e:
-            try:
-                self.gui.log_message(f"notify giveaways falhou: {e}", "warning")
-            except Exception:
-                pass
\ No newline at end of file
+    def _notify_giveaways(self, winner=None, refresh=False):
+        if winner is not None:
+            self.bus.publish(GiveawayWinner(winner))
+        if refresh:
+            self.bus.publish(GiveawayChanged("refresh"))
@@ -3,6 +3,10 @@ import json
 import requests
 import time
 
+from services.helix_client import get_helix_client
+from services.event_bus import EventBus, ActivityEvent
+from services.outgoing_queue import PRIORITY_EVENT
+
 class TwitchEventSubClient:
     def __init__(self, gui, config):
         self.gui = gui
@@ -11,6 +15,8 @@ class TwitchEventSubClient:
         self.session_id = None
         self.is_running = True
         self.logger = self.gui.log_message
+        self.bus = getattr(self.gui, "bus", None) or EventBus(self.logger)
+        self.helix = get_helix_client()
         self.headers_api = {
             'Authorization': f'Bearer {self.config["api_token"]}',
             'Client-Id': self.config['client_id'],
@@ -87,12 +93,12 @@ class TwitchEventSubClient:
         }
         
         try:
-            resp = requests.post('https://api.twitch.tv/helix/eventsub/subscriptions', headers=self.headers_api, json=body)
+            resp = self.helix.post('eventsub/subscriptions', headers=self.headers_api, json=body)
             resp.raise_for_status()
 
         except requests.RequestException as e:
             self.logger(f"❌ Falha ao inscrever em {event_type}", "error")
-            if e.response:
+            if e.response is not None:
                 self.logger(f"Detalhe: {e.response.json()}", "error")
 
     def subscribe_to_events(self):
@@ -121,6 +127,13 @@ class TwitchEventSubClient:
             {"broadcaster_user_id": self.config['target_channel_id']}
         )
 
+    def _render(self, template, placeholders):
+        """Formata mensagens de evento pelo VariableResolver do bot (mesmas variáveis dos comandos)."""
+        resolver = getattr(getattr(self.gui, 'bot', None), 'vars', None)
+        if resolver is not None:
+            return resolver.format(template, placeholders.get('user'), extra=placeholders)
+        return template.format(**placeholders)
+
     def handle_notification(self, payload):
         """Lida com a notificação do evento e envia a mensagem no chat"""
         event_type = payload['subscription']['type']
@@ -142,9 +155,9 @@ class TwitchEventSubClient:
             'channel': self.config['channel']
         }
         
-        def send_chat_msg(message):
+        def send_chat_msg(message, **coalesce):
             if self.gui.bot and self.gui.bot.connected:
-                self.gui.bot.send_message(message)
+                self.gui.bot.send_message(message, priority=PRIORITY_EVENT, **coalesce)
             else:
                 self.logger("... Evento recebido, mas bot IRC está offline.", "info")
 
@@ -158,10 +171,11 @@ class TwitchEventSubClient:
             user_name = event['user_name']
             activity_msg = f"Follow: {user_name}"
             self.logger(f"✨ {activity_msg}!", "system")
-            self.gui.add_activity_entry(event_type, user_name, "Follow")
+            self.bus.publish(ActivityEvent(event_type, user_name, "Follow"))
             
             msg_template = settings.get('msg_follow', "Obrigado pelo follow, @{user}! <3")
-            send_chat_msg(msg_template.format(**placeholders))
+            placeholders['user'] = user_name
+            send_chat_msg(self._render(msg_template, placeholders))
             
         elif event_type == 'channel.subscribe':
             event = payload['event']
@@ -172,13 +186,23 @@ class TwitchEventSubClient:
             activity_details = f"T{tier}" + (" (Gift)" if is_gift else "")
             activity_msg = f"Sub (T{tier}): {user_name}" + (" (Gift)" if is_gift else "")
             self.logger(f"⭐ {activity_msg}!", "system")
-            self.gui.add_activity_entry(event_type, user_name, activity_details)
+            self.bus.publish(ActivityEvent(event_type, user_name, activity_details))
             
             if is_gift:
                  msg_template = settings.get('msg_gift_sub', "Obrigado pelo Sub de presente, @{user}! <3")
             else:
                  msg_template = settings.get('msg_sub', "Obrigado pelo Sub (Tier {tier}), @{user}! <3")
-            send_chat_msg(msg_template.format(**placeholders))
+            placeholders.update({'user': user_name, 'tier': tier})
+            if is_gift:
+                # gift bomb: agradecimentos ainda na fila viram um só, com todos os nomes
+                base = dict(placeholders)
+                send_chat_msg(
+                    self._render(msg_template, placeholders),
+                    coalesce_key=f"gift_sub:{tier}", part=user_name,
+                    render=lambda users: self._render(msg_template, dict(base, user=", @".join(users)))
+                )
+            else:
+                send_chat_msg(self._render(msg_template, placeholders))
 
         elif event_type == 'channel.raid':
             event = payload['event']
@@ -188,10 +212,11 @@ class TwitchEventSubClient:
             activity_details = f"{viewers} viewers"
             activity_msg = f"Raid de {raider_name} ({viewers} viewers)"
             self.logger(f"⚔️ {activity_msg}!", "system")
-            self.gui.add_activity_entry(event_type, raider_name, activity_details)
+            self.bus.publish(ActivityEvent(event_type, raider_name, activity_details))
             
             msg_template = settings.get('msg_raid', "RAID! Bem-vindos, time do @{raider}! ({viewers} pessoas)")
-            send_chat_msg(msg_template.format(**placeholders))
+            placeholders.update({'user': raider_name, 'raider': raider_name, 'viewers': viewers})
+            send_chat_msg(self._render(msg_template, placeholders))
 
         elif event_type == 'channel.channel_points_custom_reward_redemption.add':
             reward_title = event['reward']['title']
@@ -212,10 +237,10 @@ class TwitchEventSubClient:
             )
             
             if is_tts_event:
-                self.gui.add_activity_entry("tts.redemption", user_name, user_input)
+                self.bus.publish(ActivityEvent("tts.redemption", user_name, user_input))
                 self.gui.request_tts_playback(user_input)
             else:
-                self.gui.add_activity_entry(event_type, user_name, reward_title)
+                self.bus.publish(ActivityEvent(event_type, user_name, reward_title))
 
 
             if reward_title in reward_actions:
@@ -226,6 +251,6 @@ class TwitchEventSubClient:
                 
                 if 'message' in action and action['message']:
                     msg_template = action['message']
-                    send_chat_msg(msg_template.format(**placeholders))
+                    send_chat_msg(self._render(msg_template, placeholders))
 
             
\ No newline at end of file
@@ -0,0 +1,298 @@
+import json
+import os
+import threading
+from collections import Counter, deque
+from datetime import datetime, date
+
+
+class ActivityJournal:
+    """
+    Histórico de atividades sem limite: um JSONL append-only por dia (AAAA-MM-DD.jsonl)
+    e, ao lado, um índice pequeno por segmento (AAAA-MM-DD.idx.json) com contagens por
+    tipo e usuário, intervalo de tempo e offset do primeiro evento de cada hora.
+    As consultas leem os segmentos linha a linha (streaming), pulando os que o índice descarta.
+    """
+    SEGMENT_EXT = ".jsonl"
+    INDEX_EXT = ".idx.json"
+
+    def __init__(self, directory="activity_journal", logger=lambda *a, **k: None, index_every=50):
+        self.directory = directory
+        self.log = logger
+        self.index_every = max(1, int(index_every))
+        self._lock = threading.Lock()
+        self._day = None
+        self._fh = None
+        self._index = None
+        self._dirty = 0
+        os.makedirs(directory, exist_ok=True)
+
+    # ---------- segmentos / índice ----------
+    def _segment_path(self, day: str):
+        return os.path.join(self.directory, day + self.SEGMENT_EXT)
+
+    def _index_path(self, day: str):
+        return os.path.join(self.directory, day + self.INDEX_EXT)
+
+    def days(self):
+        """Dias com segmento, em ordem crescente."""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(n[:-len(self.SEGMENT_EXT)] for n in names if n.endswith(self.SEGMENT_EXT))
+
+    @staticmethod
+    def _empty_index():
+        return {"bytes": 0, "count": 0, "first": None, "last": None, "types": {}, "users": {}, "hours": {}}
+
+    @staticmethod
+    def _index_record(idx, rec, offset, size):
+        t = rec.get("t")
+        idx["count"] += 1
+        idx["bytes"] = offset + size
+        if t:
+            idx["first"] = idx["first"] or t
+            idx["last"] = t
+            hour = t[11:13]
+            idx["hours"].setdefault(hour, offset)
+        types, users = idx["types"], idx["users"]
+        typ = rec.get("type", "")
+        types[typ] = types.get(typ, 0) + 1
+        user = (rec.get("user") or "").lower()
+        users[user] = users.get(user, 0) + 1
+
+    def _load_index(self, day):
+        """Índice do dia; se estiver atrás do segmento (crash, índice ausente), completa lendo só o resto."""
+        idx = None
+        try:
+            with open(self._index_path(day), "r", encoding="utf-8") as f:
+                idx = json.load(f)
+        except (OSError, ValueError):
+            pass
+        if not isinstance(idx, dict) or "bytes" not in idx:
+            idx = self._empty_index()
+        path = self._segment_path(day)
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return idx
+        if size < idx["bytes"]:
+            idx = self._empty_index()
+        if size > idx["bytes"]:
+            with open(path, "rb") as f:
+                f.seek(idx["bytes"])
+                offset = idx["bytes"]
+                for raw in f:
+                    if not raw.endswith(b"\n"):
+                        break
+                    try:
+                        rec = json.loads(raw)
+                    except ValueError:
+                        rec = {}
+                    self._index_record(idx, rec, offset, len(raw))
+                    offset += len(raw)
+            self._write_index(day, idx)
+        return idx
+
+    def _write_index(self, day, idx):
+        path = self._index_path(day)
+        tmp = path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(idx, f, ensure_ascii=False)
+            os.replace(tmp, path)
+        except Exception as e:
+            self.log(f"❌ Erro ao salvar índice {path}: {e}", "error")
+
+    def index(self, day: str) -> dict:
+        with self._lock:
+            if day == self._day and self._index is not None:
+                return json.loads(json.dumps(self._index))
+            return self._load_index(day)
+
+    # ---------- escrita ----------
+    def _open_day(self, day):
+        """Rotação: fecha o segmento anterior (gravando o índice) e abre o do dia. Chamar com o lock."""
+        if self._day == day and self._fh is not None:
+            return
+        self._close_segment()
+        self._index = self._load_index(day)
+        self._fh = open(self._segment_path(day), "ab")
+        self._day = day
+
+    def _close_segment(self):
+        if self._fh is not None:
+            try:
+                self._fh.close()
+            finally:
+                self._fh = None
+        if self._day is not None and self._index is not None and self._dirty:
+            self._write_index(self._day, self._index)
+        self._dirty = 0
+
+    def append(self, entry: dict):
+        """entry no formato do feed: raw_event_type, user, details, timestamp_obj."""
+        ts = entry.get("timestamp_obj") or datetime.now()
+        rec = {
+            "t": ts.isoformat(),
+            "type": entry.get("raw_event_type", ""),
+            "user": entry.get("user", ""),
+            "details": entry.get("details", ""),
+        }
+        raw = (json.dumps(rec, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            try:
+                self._open_day(ts.date().isoformat())
+                offset = self._index["bytes"]
+                self._fh.write(raw)
+                self._fh.flush()
+                self._index_record(self._index, rec, offset, len(raw))
+                self._dirty += 1
+                if self._dirty >= self.index_every:
+                    self._write_index(self._day, self._index)
+                    self._dirty = 0
+            except Exception as e:
+                self.log(f"❌ Erro ao gravar atividade: {e}", "error")
+
+    def flush(self):
+        with self._lock:
+            if self._fh is not None:
+                self._fh.flush()
+            if self._day is not None and self._dirty:
+                self._write_index(self._day, self._index)
+                self._dirty = 0
+
+    def close(self):
+        with self._lock:
+            self._close_segment()
+            self._day = None
+            self._index = None
+
+    # ---------- leitura ----------
+    @staticmethod
+    def _to_entry(rec):
+        try:
+            ts = datetime.fromisoformat(rec["t"])
+        except (KeyError, TypeError, ValueError):
+            return None
+        return {
+            "raw_event_type": rec.get("type", ""),
+            "user": rec.get("user", ""),
+            "details": rec.get("details", ""),
+            "timestamp_obj": ts,
+        }
+
+    @staticmethod
+    def _as_day(value):
+        if value is None:
+            return None
+        if isinstance(value, datetime):
+            return value.date().isoformat()
+        if isinstance(value, date):
+            return value.isoformat()
+        return str(value)[:10]
+
+    def _candidate_days(self, types, user, since, until):
+        lo, hi = self._as_day(since), self._as_day(until)
+        for day in self.days():
+            if (lo and day < lo) or (hi and day > hi):
+                continue
+            idx = self.index(day)
+            if types and not any(idx["types"].get(t) for t in types):
+                continue
+            if user and not idx["users"].get(user):
+                continue
+            yield day, idx
+
+    def query(self, types=None, user=None, since=None, until=None):
+        """
+        Gera as atividades (mais antigas primeiro) que batem com os filtros, sem carregar o
+        histórico na memória. types: iterável de raw_event_type; user: login; since/until: datetime.
+        """
+        types = set(types) if types else None
+        user = user.lower() if user else None
+        since_iso = since.isoformat() if isinstance(since, datetime) else None
+        until_iso = until.isoformat() if isinstance(until, datetime) else None
+        for day, idx in self._candidate_days(types, user, since, until):
+            start = 0
+            if since_iso and since_iso[:10] == day:
+                # pula direto para a primeira hora >= since (offsets do índice)
+                hours = [(h, off) for h, off in idx.get("hours", {}).items() if h >= since_iso[11:13]]
+                start = min((off for _, off in hours), default=idx["bytes"])
+            try:
+                with open(self._segment_path(day), "rb") as f:
+                    f.seek(start)
+                    for raw in f:
+                        if not raw.endswith(b"\n"):
+                            break
+                        try:
+                            rec = json.loads(raw)
+                        except ValueError:
+                            continue
+                        t = rec.get("t", "")
+                        if since_iso and t < since_iso:
+                            continue
+                        if until_iso and t > until_iso:
+                            return
+                        if types and rec.get("type") not in types:
+                            continue
+                        if user and (rec.get("user") or "").lower() != user:
+                            continue
+                        entry = self._to_entry(rec)
+                        if entry:
+                            yield entry
+            except OSError as e:
+                self.log(f"⚠️ Segmento {day} ilegível: {e}", "warning")
+
+    def tail(self, n=100):
+        """As últimas n atividades (mais antigas primeiro), lendo só os segmentos mais recentes."""
+        out = deque(maxlen=n)
+        need = n
+        chosen = []
+        for day in reversed(self.days()):
+            chosen.append(day)
+            need -= self.index(day)["count"]
+            if need <= 0:
+                break
+        for day in reversed(chosen):
+            out.extend(self.query(since=day, until=day))
+        return list(out)
+
+    def top_users(self, types, since=None, until=None, n=10, weight=None):
+        """Ranking de usuários [(user, total)]; weight(entry) -> número (padrão: 1 por evento)."""
+        totals = Counter()
+        for entry in self.query(types=types, since=since, until=until):
+            totals[entry["user"]] += weight(entry) if weight else 1
+        return totals.most_common(n)
+
+    # ---------- migração ----------
+    def migrate_json(self, json_path):
+        """Importa o antigo activity_log.json (lista) uma única vez e o renomeia para *.migrated."""
+        if not json_path or not os.path.exists(json_path):
+            return 0
+        try:
+            with open(json_path, "r", encoding="utf-8") as f:
+                items = json.load(f) or []
+        except Exception as e:
+            self.log(f"❌ Erro ao migrar {json_path}: {e}", "error")
+            return 0
+        migrated = 0
+        for item in items:
+            try:
+                ts = datetime.fromisoformat(item["timestamp_iso"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            self.append({
+                "raw_event_type": item.get("raw_event_type", ""),
+                "user": item.get("user", ""),
+                "details": item.get("details", ""),
+                "timestamp_obj": ts,
+            })
+            migrated += 1
+        self.close()
+        try:
+            os.replace(json_path, json_path + ".migrated")
+        except OSError:
+            pass
+        self.log(f"📦 {migrated} atividades migradas de {json_path} para {self.directory}/", "system")
+        return migrated
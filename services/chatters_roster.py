@@ -0,0 +1,132 @@
+import random
+import threading
+import time
+
+
+class ChattersRoster:
+    """
+    Lista de quem está no chat, mantida em segundo plano:
+    Helix (paginado, a cada `refresh_s`, aplicado por diff) ∪ JOIN/PART do IRC ∪ quem falou
+    nos últimos `active_window_s`. Guarda um array indexado (swap-remove) para sorteio O(1).
+    """
+    def __init__(self, fetch_chatters, refresh_s=60, active_window_s=600,
+                 logger=lambda *a, **k: None, clock=time.monotonic):
+        self._fetch = fetch_chatters
+        self.refresh_s = refresh_s
+        self.active_window_s = active_window_s
+        self.log = logger
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._users = []
+        self._index = {}
+        self._helix = set()
+        self._joined = set()
+        self._active = {}
+        self._stop = threading.Event()
+        self._thread = None
+        self.last_refresh = 0.0
+
+    def __len__(self):
+        return len(self._users)
+
+    def __contains__(self, user):
+        return user.lower() in self._index
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="chatters-roster", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(2)
+            self._thread = None
+
+    def _add(self, u):
+        if u not in self._index:
+            self._index[u] = len(self._users)
+            self._users.append(u)
+
+    def _remove(self, u):
+        i = self._index.pop(u, None)
+        if i is None:
+            return
+        last = self._users.pop()
+        if i < len(self._users):
+            self._users[i] = last
+            self._index[last] = i
+
+    def _sync(self, u, now):
+        """Recalcula a presença de u a partir das três fontes. Chamar com o lock."""
+        ts = self._active.get(u)
+        if u in self._helix or u in self._joined or (ts is not None and now - ts < self.active_window_s):
+            self._add(u)
+        else:
+            self._remove(u)
+
+    def on_join(self, user):
+        u = user.lower()
+        with self._lock:
+            self._joined.add(u)
+            self._add(u)
+
+    def on_part(self, user):
+        u = user.lower()
+        with self._lock:
+            self._joined.discard(u)
+            self._sync(u, self._clock())
+
+    def on_message(self, user):
+        u = user.lower()
+        with self._lock:
+            self._active[u] = self._clock()
+            self._add(u)
+
+    def apply_helix(self, logins):
+        """Aplica a lista completa da Helix como diff sobre o conjunto anterior."""
+        new = {u.lower() for u in logins if u}
+        now = self._clock()
+        with self._lock:
+            old = self._helix
+            self._helix = new
+            for u in new - old:
+                self._add(u)
+            for u in old - new:
+                self._sync(u, now)
+            self._expire(now)
+        self.last_refresh = time.time()
+
+    def _expire(self, now):
+        cutoff = now - self.active_window_s
+        stale = [u for u, ts in self._active.items() if ts < cutoff]
+        for u in stale:
+            del self._active[u]
+            self._sync(u, now)
+
+    def refresh(self):
+        try:
+            logins = self._fetch()
+        except Exception as e:
+            self.log(f"❌ Erro ao atualizar chatters: {e}", "error")
+            return False
+        if logins is None:
+            return False
+        self.apply_helix(logins)
+        return True
+
+    def sample(self):
+        """Usuário aleatório presente (O(1), sem rede) ou None."""
+        with self._lock:
+            return random.choice(self._users) if self._users else None
+
+    def snapshot(self) -> set:
+        with self._lock:
+            self._expire(self._clock())
+            return set(self._users)
+
+    def _loop(self):
+        self.refresh()
+        while not self._stop.wait(self.refresh_s):
+            self.refresh()
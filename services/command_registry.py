@@ -0,0 +1,104 @@
+import re
+import threading
+from collections import namedtuple
+
+CommandEntry = namedtuple("CommandEntry", "kind trigger name mod_only")
+
+_TRIGGER_RE = re.compile(r"(?<!\S)(![A-Za-z0-9_]+)")
+
+_POINTS_CMDS = (
+    ("points_balance", "points_cmd_balance", "points_cmd_balance_enabled", "!pontos"),
+    ("points_give",    "points_cmd_give",    "points_cmd_give_enabled",    "!give"),
+    ("points_add",     "points_cmd_add",     "points_cmd_add_enabled",     "!addpoints"),
+    ("points_set",     "points_cmd_set",     "points_cmd_set_enabled",     "!setpoints"),
+)
+
+_GIVEAWAY_CMDS = (
+    ("giveaway_join",  "giveaways_cmd_join",  "!sorteio"),
+    ("giveaway_draw",  "giveaways_cmd_draw",  "!sortear"),
+    ("giveaway_start", "giveaways_cmd_start", "!criasorteio"),
+    ("giveaway_end",   "giveaways_cmd_end",   "!encerrasorteio"),
+)
+
+_MOD_CMDS = (
+    ("cmdd", "!cmdd"),
+    ("setcount", "!setcount"),
+    ("addcount", "!addcount"),
+)
+
+
+class CommandRegistry:
+    """
+    Tabela trigger -> CommandEntry compilada a partir de settings + commands.json.
+    Só recompila depois de invalidate() (save_settings, save_commands, !cmdd...).
+    """
+    def __init__(self, get_settings, get_commands):
+        self._get_settings = get_settings
+        self._get_commands = get_commands
+        self._lock = threading.Lock()
+        self.version = 0
+        self._compiled_version = -1
+        self._table = {}
+        self._by_kind = {}
+
+    def invalidate(self):
+        self.version += 1
+
+    def table(self) -> dict:
+        if self._compiled_version != self.version:
+            with self._lock:
+                if self._compiled_version != self.version:
+                    version = self.version
+                    self._table, self._by_kind = self._compile()
+                    self._compiled_version = version
+        return self._table
+
+    def lookup(self, trigger: str) -> CommandEntry | None:
+        return self.table().get(trigger)
+
+    def trigger_for(self, kind: str, default: str = "") -> str:
+        self.table()
+        return self._by_kind.get(kind, default)
+
+    def find(self, message: str, is_mod: bool = False) -> tuple[CommandEntry | None, int]:
+        """Primeiro `!token` do texto que é um comando válido. Retorna (entry, posição)."""
+        if "!" not in message:
+            return None, -1
+        table = self.table()
+        for m in _TRIGGER_RE.finditer(message):
+            entry = table.get(m.group(1).lower())
+            if entry is None or (entry.mod_only and not is_mod):
+                continue
+            return entry, m.start()
+        return None, -1
+
+    def _compile(self):
+        ps = self._get_settings() or {}
+        table = {}
+
+        def add(trigger, kind, name=None, mod_only=False):
+            t = (trigger or "").strip().lower()
+            if t:
+                table[t] = CommandEntry(kind, t, name or t, mod_only)
+
+        # Ordem inversa de precedência: o último add() vence em caso de conflito.
+        for name in list(self._get_commands() or {}):
+            add(name, "custom", name=name)
+
+        for kind, trigger in _MOD_CMDS:
+            add(trigger, kind, mod_only=True)
+
+        permit = ps.get("moderation", {}).get("permit", {}).get("command_name", "!permit")
+        add(permit or "!permit", "permit")
+
+        if ps.get("points_enabled", False):
+            for kind, name_key, enabled_key, default in _POINTS_CMDS:
+                if bool(ps.get(enabled_key, True)):
+                    add(ps.get(name_key, default) or default, kind)
+
+        if bool(ps.get("giveaways_enabled", True)):
+            for kind, key, default in _GIVEAWAY_CMDS:
+                add(ps.get(key, default) or default, kind)
+
+        by_kind = {e.kind: e.trigger for e in table.values() if e.kind != "custom"}
+        return table, by_kind
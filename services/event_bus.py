@@ -0,0 +1,163 @@
+import threading
+from collections import OrderedDict, deque, namedtuple
+
+# Eventos de domínio publicados pelo bot / EventSub
+ChatMessage = namedtuple("ChatMessage", "user message tags")
+ActivityEvent = namedtuple("ActivityEvent", "event_type user details")
+GiveawayChanged = namedtuple("GiveawayChanged", "reason")
+GiveawayWinner = namedtuple("GiveawayWinner", "winner")
+
+DROP_OLDEST = "drop_oldest"
+COALESCE = "coalesce"
+
+
+class Subscription:
+    """
+    Fila limitada de um assinante. Políticas quando a fila enche:
+    - drop_oldest: descarta o evento mais antigo;
+    - coalesce: guarda só o último evento por chave (key(evento), padrão: o tipo).
+    Consumida por drain() (ex.: pump do Tk) ou por uma thread própria (threaded=True).
+    """
+    def __init__(self, bus, event_type, handler, maxsize=1000, policy=DROP_OLDEST,
+                 key=None, where=None, threaded=False):
+        if policy not in (DROP_OLDEST, COALESCE):
+            raise ValueError(f"política desconhecida: {policy}")
+        self.bus = bus
+        self.event_type = event_type
+        self.handler = handler
+        self.maxsize = max(1, int(maxsize))
+        self.policy = policy
+        self.key = key or type
+        self.where = where
+        self.threaded = threaded
+        self.dropped = 0
+        self.delivered = 0
+        self._lock = threading.Lock()
+        self._queue = OrderedDict() if policy == COALESCE else deque()
+        self._wake = threading.Event()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def __len__(self):
+        return len(self._queue)
+
+    def offer(self, event):
+        if self.where is not None:
+            try:
+                if not self.where(event):
+                    return
+            except Exception:
+                return
+        with self._lock:
+            q = self._queue
+            if self.policy == COALESCE:
+                k = self.key(event)
+                if k in q:
+                    del q[k]
+                    self.dropped += 1
+                q[k] = event
+                if len(q) > self.maxsize:
+                    q.popitem(last=False)
+                    self.dropped += 1
+            else:
+                if len(q) >= self.maxsize:
+                    q.popleft()
+                    self.dropped += 1
+                q.append(event)
+        if self.threaded:
+            self._wake.set()
+
+    def _pop(self):
+        with self._lock:
+            if not self._queue:
+                return None
+            if self.policy == COALESCE:
+                return self._queue.popitem(last=False)[1]
+            return self._queue.popleft()
+
+    def drain(self, budget=None):
+        """Entrega até `budget` eventos (todos, se None). Retorna quantos entregou."""
+        n = 0
+        while budget is None or n < budget:
+            event = self._pop()
+            if event is None:
+                break
+            n += 1
+            try:
+                self.handler(event)
+            except Exception as e:
+                self.bus.log(f"⚠️ Assinante de {self.event_type.__name__} falhou: {e}", "warning")
+        self.delivered += n
+        return n
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._loop, name=f"bus-{self.event_type.__name__}", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(2)
+            self._thread = None
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self._wake.wait()
+            self._wake.clear()
+            self.drain()
+
+
+class EventBus:
+    """
+    Pub/sub em processo entre bot, EventSub e GUI. publish() nunca bloqueia nem chama
+    handlers: só enfileira nos assinantes daquele tipo. A GUI esvazia suas filas no
+    loop do Tk (drain); consumidores headless usam subscribe(..., threaded=True).
+    """
+    def __init__(self, logger=lambda *a, **k: None):
+        self.log = logger
+        self._lock = threading.Lock()
+        self._subs = {}
+
+    def subscribe(self, event_type, handler, **opts) -> Subscription:
+        sub = Subscription(self, event_type, handler, **opts)
+        with self._lock:
+            # copy-on-write: publish() lê a tupla sem lock
+            self._subs[event_type] = self._subs.get(event_type, ()) + (sub,)
+        if sub.threaded:
+            sub.start()
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        with self._lock:
+            subs = tuple(s for s in self._subs.get(sub.event_type, ()) if s is not sub)
+            if subs:
+                self._subs[sub.event_type] = subs
+            else:
+                self._subs.pop(sub.event_type, None)
+        sub.stop()
+
+    def publish(self, event):
+        for sub in self._subs.get(type(event), ()):
+            sub.offer(event)
+
+    def drain(self, budget=500):
+        """Entrega eventos pendentes dos assinantes não-threaded (chamar na thread do Tk)."""
+        n = 0
+        for subs in list(self._subs.values()):
+            for sub in subs:
+                if not sub.threaded and len(sub):
+                    n += sub.drain(max(1, budget - n))
+                    if n >= budget:
+                        return n
+        return n
+
+    def stats(self) -> dict:
+        return {
+            f"{t.__name__}:{i}": {"depth": len(s), "dropped": s.dropped, "delivered": s.delivered, "policy": s.policy}
+            for t, subs in list(self._subs.items()) for i, s in enumerate(subs)
+        }
@@ -0,0 +1,135 @@
+import threading
+from collections import deque
+
+
+class GiveawayEntryPipeline:
+    """
+    Fila de entradas do !sorteio: o IRC só enfileira; a cada `window_s` uma thread valida
+    o lote (limite por usuário, preço em pontos), grava tudo numa operação
+    (enter_many + add_many) e dispara um único refresh da UI.
+    """
+    def __init__(self, giveaways, points, get_settings, send_message, on_flush=None,
+                 before_batch=None, window_s=0.5, logger=lambda *a, **k: None):
+        self.giveaways = giveaways
+        self.points = points
+        self._get_settings = get_settings
+        self.send_message = send_message
+        self.on_flush = on_flush
+        self.before_batch = before_batch
+        self.window_s = window_s
+        self.log = logger
+        self._queue = deque()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+    def submit(self, user: str, tickets: int = 1):
+        self._queue.append((user, max(1, int(tickets))))
+        if self._thread is None:
+            self.start()
+        self._wake.set()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._loop, name="giveaway-entries", daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(2)
+            self._thread = None
+        self.flush()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self._wake.wait()
+            self._wake.clear()
+            if self._stop.wait(self.window_s):
+                break
+            self.flush()
+
+    def _drain(self):
+        batch = []
+        while self._queue:
+            try:
+                batch.append(self._queue.popleft())
+            except IndexError:
+                break
+        return batch
+
+    def flush(self):
+        with self._flush_lock:
+            batch = self._drain()
+            if not batch:
+                return 0
+            try:
+                accepted = self._process(batch)
+            except Exception as e:
+                self.log(f"⚠️ Erro ao processar entradas do sorteio: {e}", "warning")
+                return 0
+        if accepted and self.on_flush:
+            try:
+                self.on_flush(accepted)
+            except Exception:
+                pass
+        return len(accepted)
+
+    def _process(self, batch):
+        ps = self._get_settings() or {}
+        if ps.get("giveaways_entries_locked", False):
+            return {}
+        cur = self.giveaways.current(entrants=False)
+        if not cur or cur.get("closed") or cur.get("winner") is not None:
+            return {}
+
+        if self.before_batch:
+            self.before_batch()
+
+        max_per_user = int(ps.get("giveaways_max_entries_per_user", 0) or 0)
+        price = int(ps.get("giveaways_entry_price", 0) or 0)
+        limit_msg = ps.get("giveaways_limit_message", "@{user}, você já atingiu o limite de {max} bilhete(s).")
+
+        accepted = {}
+        debits = {}
+        balances = {}
+        messages = []
+        for user, requested in batch:
+            tickets = requested
+            if max_per_user > 0:
+                current = self.giveaways.tickets_of(user) + accepted.get(user, 0)
+                if current >= max_per_user:
+                    messages.append(limit_msg.format(user=user, max=max_per_user, current=current, requested=requested))
+                    continue
+                tickets = min(tickets, max_per_user - current)
+
+            if price > 0:
+                cost = price * tickets
+                if user.lower() not in balances:
+                    balances[user.lower()] = self.points.get(user)
+                if balances[user.lower()] < cost:
+                    msg_no_points = ps.get(
+                        "giveaways_not_enough_points_msg",
+                        "❌ @{user}, você não tem pontos suficientes para entrar (custa {price})."
+                    )
+                    messages.append(msg_no_points.format(user=user, price=price, spent=cost))
+                    continue
+                balances[user.lower()] -= cost
+                debits[user.lower()] = debits.get(user.lower(), 0) - cost
+                msg_buy = ps.get("giveaways_buy_message", "🎟️ @{user} comprou {tickets} bilhete(s) por {spent} pontos!")
+                messages.append(msg_buy.format(user=user, tickets=tickets, spent=cost, price=price))
+
+            accepted[user] = accepted.get(user, 0) + tickets
+
+        if debits:
+            self.points.add_many(debits)
+        if accepted:
+            self.giveaways.enter_many(accepted)
+        for msg in messages:
+            self.send_message(msg)
+        return accepted
@@ -1,54 +1,121 @@
-
-import json, os, threading, time, random
+import os, threading
+from collections import Counter
 from datetime import datetime
 
+from services.storage import JsonStore, open_store
+from services.ticket_index import TicketIndex
+
 class GiveawayService:
-    """Gerencia o estado do sorteio atual e histórico em giveaways.json"""
-    def __init__(self, storage_path="giveaways.json", logger=lambda *a, **k: None):
+    """
+    Gerencia o estado do sorteio atual e histórico em giveaways.json (ou no backend configurado).
+    Participantes ficam num store separado (usuário -> bilhetes), gravado incrementalmente,
+    e num TicketIndex para contagem O(1) e sorteio ponderado O(log n).
+    """
+    def __init__(self, storage_path="giveaways.json", logger=lambda *a, **k: None, store=None,
+                 entrants_store=None):
         self.storage_path = storage_path
         self.log = logger
         self._lock = threading.Lock()
+        self.store = store or JsonStore(storage_path, logger, journal=False, indent=2)
+        self.entrants = entrants_store or JsonStore(self.entrants_path(storage_path), logger)
         self._data = {"history": [], "current": None}
+        self._index = TicketIndex()
         self._load()
 
+    @staticmethod
+    def entrants_path(storage_path):
+        base, ext = os.path.splitext(storage_path)
+        return f"{base}_entrants{ext or '.json'}"
+
+    @classmethod
+    def from_settings(cls, settings, logger=lambda *a, **k: None):
+        path = (settings or {}).get('giveaways_store_file', 'giveaways.json')
+        return cls(
+            storage_path=path,
+            logger=logger,
+            store=open_store(settings, 'giveaways', path, logger, journal=False, indent=2),
+            entrants_store=open_store(settings, 'giveaway_entrants', cls.entrants_path(path), logger)
+        )
+
     def _load(self):
         try:
-            if os.path.exists(self.storage_path):
-                with open(self.storage_path, "r", encoding="utf-8") as f:
-                    self._data = json.load(f)
-            else:
-                self._data = {"history": [], "current": None}
+            self._data = {
+                "history": self.store.get("history") or [],
+                "current": self.store.get("current"),
+            }
+            cur = self._data["current"]
+            if cur and "entrants" in cur:
+                self._migrate_entrants(cur)
+            self._index = TicketIndex(dict(self.entrants.items()) if cur else None)
         except Exception as e:
             self.log(f"❌ Erro ao carregar {self.storage_path}: {e}", "error")
             self._data = {"history": [], "current": None}
+            self._index = TicketIndex()
+
+    def _migrate_entrants(self, cur):
+        """Formato antigo: lista com o nome repetido por bilhete, dentro de 'current'."""
+        old = cur.pop("entrants") or []
+        counts = dict(Counter(old)) if isinstance(old, list) else dict(old)
+        cur.pop("unique_count", None)
+        cur.pop("total_tickets", None)
+        self.entrants.clear()
+        self.entrants.put_many(counts)
+        self.entrants.flush()
+        self._save()
 
-    def _save(self):
+    def reload(self):
+        with self._lock:
+            self.store.reload()
+            self.entrants.reload()
+            self._load()
+
+    def _save(self, keys=("current",)):
         try:
-            with open(self.storage_path, "w", encoding="utf-8") as f:
-                json.dump(self._data, f, indent=2, ensure_ascii=False)
+            self.store.put_many({k: self._data.get(k) for k in keys})
         except Exception as e:
             self.log(f"❌ Erro ao salvar {self.storage_path}: {e}", "error")
 
-    def current(self):
+    def _with_entrants(self, cur):
+        out = dict(cur)
+        out["entrants"] = dict(self._index.items())
+        out["unique_count"] = len(out["entrants"])
+        out["total_tickets"] = self._index.total
+        return out
+
+    def current(self, entrants=True):
+        """Sorteio atual (cópia). entrants=False evita montar o dicionário de participantes."""
         with self._lock:
-            return self._data.get("current") or None
+            cur = self._data.get("current")
+            if not cur:
+                return None
+            if not entrants:
+                out = dict(cur)
+                out["unique_count"] = self._index.unique_count()
+                out["total_tickets"] = self._index.total
+                return out
+            return self._with_entrants(cur)
 
     def history(self):
         with self._lock:
             return list(self._data.get("history", []))
 
+    def tickets_of(self, user: str) -> int:
+        with self._lock:
+            return self._index.tickets_of(user.strip())
+
     def create(self, title: str):
         now_iso = datetime.utcnow().isoformat() + "Z"
         with self._lock:
             self._data["current"] = {
                 "title": title.strip() or "Sorteio",
                 "started_at": now_iso,
-                "entrants": [],
                 "closed": False,
                 "winner": None
             }
+            self._index = TicketIndex()
+            self.entrants.clear()
             self._save()
-        return self._data["current"]
+            return self._with_entrants(self._data["current"])
 
     def close(self, winner: str | None = None):
         with self._lock:
@@ -60,38 +127,49 @@ class GiveawayService:
             if winner:
                 cur["winner"] = winner
 
+            cur = self._with_entrants(cur)
             self._data.setdefault("history", []).insert(0, cur)
             self._data["current"] = None
-            self._save()
+            self._save(("current", "history"))
+            self._index = TicketIndex()
+            self.entrants.clear()
             return cur
 
     def enter(self, user: str, tickets: int = 1):
         user = user.strip()
         if not user:
             return False
-        
+
         with self._lock:
             cur = self._data.get("current")
             if not cur or cur.get("closed") or cur.get("winner") is not None:
                 return False
-   
-            cur.setdefault("entrants", [])
-            for _ in range(max(1, tickets)):
-                cur["entrants"].append(user)
-
-            uniq = sorted(set(cur["entrants"]))
-            cur["unique_count"] = len(uniq)
-            cur["total_tickets"] = len(cur["entrants"])
-            self._save()
 
+            total = self._index.add(user, max(1, tickets))
+            self.entrants.put(user, total)
             return True
 
+    def enter_many(self, tickets_by_user: dict) -> int:
+        """Aplica um lote {usuário: bilhetes} com um único lock e uma única gravação."""
+        with self._lock:
+            cur = self._data.get("current")
+            if not cur or cur.get("closed") or cur.get("winner") is not None:
+                return 0
+            totals = {}
+            for user, tickets in tickets_by_user.items():
+                user = user.strip()
+                if user:
+                    totals[user] = self._index.add(user, max(1, int(tickets)))
+            if totals:
+                self.entrants.put_many(totals)
+            return len(totals)
+
     def pick_winner(self):
         with self._lock:
             cur = self._data.get("current")
-            if not cur or not cur.get("entrants"):
+            if not cur or self._index.total <= 0:
                 return None
-            winner = random.choice(cur["entrants"])
+            winner = self._index.draw()
             cur["winner"] = winner
             self._save()
             return winner
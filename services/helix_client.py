@@ -0,0 +1,124 @@
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class HelixClient:
+    """
+    Cliente HTTP compartilhado para a Helix: sessão com pool de conexões (keep-alive),
+    timeouts padrão, retry com backoff + jitter em 429/5xx e controle central do rate limit.
+    """
+    BASE_URL = "https://api.twitch.tv/helix"
+    RETRY_STATUS = (429, 500, 502, 503, 504)
+    IDEMPOTENT = ("GET", "HEAD", "PUT", "DELETE")
+
+    def __init__(self, timeout=(3.05, 8), max_retries=3, backoff_base=0.5, backoff_max=8.0,
+                 pool_size=16, logger=lambda *a, **k: None):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.log = logger
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self._lock = threading.Lock()
+        self.rate_limit = {"limit": None, "remaining": None, "reset": 0.0}
+
+    def _url(self, path):
+        if path.startswith("http://") or path.startswith("https://"):
+            return path
+        return f"{self.BASE_URL}/{path.lstrip('/')}"
+
+    def _update_rate_limit(self, resp):
+        h = resp.headers or {}
+        try:
+            with self._lock:
+                if "Ratelimit-Limit" in h:
+                    self.rate_limit["limit"] = int(h["Ratelimit-Limit"])
+                if "Ratelimit-Remaining" in h:
+                    self.rate_limit["remaining"] = int(h["Ratelimit-Remaining"])
+                if "Ratelimit-Reset" in h:
+                    self.rate_limit["reset"] = float(h["Ratelimit-Reset"])
+        except (TypeError, ValueError):
+            pass
+
+    def _wait_for_bucket(self):
+        """Se o balde esvaziou, espera o reset informado pela Twitch antes de enviar."""
+        with self._lock:
+            remaining = self.rate_limit["remaining"]
+            wait = self.rate_limit["reset"] - time.time()
+        if remaining is not None and remaining <= 0 and wait > 0:
+            time.sleep(min(wait, self.backoff_max))
+
+    def _backoff(self, attempt, resp=None):
+        if resp is not None and resp.status_code == 429:
+            reset = (resp.headers or {}).get("Ratelimit-Reset")
+            try:
+                wait = float(reset) - time.time()
+                if wait > 0:
+                    return min(wait + random.uniform(0, 0.25), self.backoff_max)
+            except (TypeError, ValueError):
+                pass
+        cap = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(cap / 2, cap)
+
+    def request(self, method, path, params=None, json=None, headers=None, timeout=None, retries=None):
+        """
+        Executa a requisição e retorna o Response (quem chama trata o status).
+        429 é sempre repetido; 5xx e erros de conexão só em métodos idempotentes.
+        Exceções de rede são relançadas depois de esgotar as tentativas.
+        """
+        method = method.upper()
+        url = self._url(path)
+        retries = self.max_retries if retries is None else retries
+        attempt = 0
+        while True:
+            self._wait_for_bucket()
+            try:
+                resp = self.session.request(method, url, params=params, json=json, headers=headers,
+                                            timeout=timeout or self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= retries or method not in self.IDEMPOTENT:
+                    raise
+                delay = self._backoff(attempt)
+                self.log(f"⚠️ Helix {method} {url} falhou ({e}); nova tentativa em {delay:.1f}s", "warning")
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            self._update_rate_limit(resp)
+            code = resp.status_code
+            retryable = code == 429 or (code in self.RETRY_STATUS and method in self.IDEMPOTENT)
+            if not retryable or attempt >= retries:
+                return resp
+            delay = self._backoff(attempt, resp)
+            self.log(f"⚠️ Helix {method} {url} -> {code}; nova tentativa em {delay:.1f}s", "warning")
+            time.sleep(delay)
+            attempt += 1
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def delete(self, path, **kwargs):
+        return self.request("DELETE", path, **kwargs)
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def get_helix_client() -> HelixClient:
+    """Instância única usada pelo bot, EventSub e verificação do token."""
+    global _shared
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = HelixClient()
+    return _shared
@@ -0,0 +1,113 @@
+import re
+
+_LINE_RE = re.compile(
+    r"^(?:@(?P<tags>\S*) +)?"
+    r"(?::(?P<prefix>\S+) +)?"
+    r"(?P<command>[^ :]\S*)"
+    r"(?P<params>(?: +[^ :]\S*)*)"
+    r"(?: +:(?P<trailing>.*))? *$",
+    re.S
+)
+
+_ESCAPE_RE = re.compile(r"\\(.?)", re.S)
+_ESCAPES = {":": ";", "s": " ", "\\": "\\", "r": "\r", "n": "\n", "": ""}
+
+
+def unescape_tag_value(value: str) -> str:
+    """Desfaz o escape IRCv3 dos valores de tag (\\s, \\:, \\\\, \\r, \\n)."""
+    if "\\" not in value:
+        return value
+    return _ESCAPE_RE.sub(lambda m: _ESCAPES.get(m.group(1), m.group(1)), value)
+
+
+class IRCMessage:
+    """
+    Linha IRC já separada em tags, prefixo, comando, parâmetros e texto final.
+    As tags só são convertidas em dict (com unescape) no primeiro acesso.
+    """
+    __slots__ = ("raw_tags", "prefix", "command", "params", "trailing", "_tags")
+
+    def __init__(self, raw_tags, prefix, command, params, trailing):
+        self.raw_tags = raw_tags
+        self.prefix = prefix
+        self.command = command
+        self.params = params
+        self.trailing = trailing
+        self._tags = None
+
+    @property
+    def has_tags(self) -> bool:
+        return self.raw_tags is not None
+
+    @property
+    def tags(self) -> dict:
+        if self._tags is None:
+            tags = {}
+            if self.raw_tags:
+                for pair in self.raw_tags.split(";"):
+                    if not pair:
+                        continue
+                    key, _, value = pair.partition("=")
+                    tags[key] = unescape_tag_value(value)
+            self._tags = tags
+        return self._tags
+
+    def tag(self, key, default=None):
+        return self.tags.get(key, default)
+
+    @property
+    def nick(self) -> str | None:
+        if not self.prefix:
+            return None
+        return self.prefix.split("!", 1)[0]
+
+    @property
+    def channel(self) -> str | None:
+        if self.params and self.params[0].startswith("#"):
+            return self.params[0][1:]
+        return None
+
+    def __repr__(self):
+        return (f"IRCMessage(command={self.command!r}, prefix={self.prefix!r}, "
+                f"params={self.params!r}, trailing={self.trailing!r})")
+
+
+def parse_irc_line(line: str) -> IRCMessage | None:
+    """Parseia uma linha IRC (sem o \\r\\n) em uma única passada. Retorna None se inválida."""
+    m = _LINE_RE.match(line)
+    if not m:
+        return None
+    params = m.group("params")
+    return IRCMessage(
+        m.group("tags"),
+        m.group("prefix"),
+        m.group("command").upper(),
+        tuple(params.split()) if params else (),
+        m.group("trailing"),
+    )
+
+
+def iter_irc_lines(sock, bufsize=65536):
+    """
+    Gera as linhas recebidas do socket (str, sem \\r\\n) até o servidor fechar a conexão.
+    Lê com recv_into num bytearray reutilizado e separa em bytes; cada linha só é decodificada
+    inteira, então caracteres multibyte partidos entre leituras não quebram o loop.
+    """
+    chunk = bytearray(bufsize)
+    view = memoryview(chunk)
+    pending = bytearray()
+    while True:
+        n = sock.recv_into(view)
+        if not n:
+            return
+        pending += view[:n]
+        start = 0
+        while True:
+            end = pending.find(b"\r\n", start)
+            if end < 0:
+                break
+            if end > start:
+                yield pending[start:end].decode("utf-8", "replace")
+            start = end + 2
+        if start:
+            del pending[:start]
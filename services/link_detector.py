@@ -0,0 +1,100 @@
+from collections import namedtuple
+
+LinkMatch = namedtuple("LinkMatch", "token host")
+
+# TLDs punidos por padrão; outros são somados pela config `link_tlds`
+# (uma lista grande pune frases em português digitadas sem espaço, ex.: "bem.me", "vamos.de")
+DEFAULT_TLDS = frozenset(("com", "net", "org", "gg", "io", "tv"))
+
+_LEADING = "([{<\"'`"
+_TRAILING = ".,;:!?)]}>\"'`"
+_SCHEMES = ("http://", "https://")
+
+
+def _valid_label(label):
+    return bool(label) and len(label) <= 63 and all(c.isalnum() or c == "-" for c in label)
+
+
+class LinkDetector:
+    """
+    Detector de links por token: cada palavra da mensagem é classificada uma vez,
+    sem backtracking. Domínios liberados (allow) e sempre bloqueados (deny) incluem subdomínios.
+    """
+    __slots__ = ("tlds", "allow", "deny")
+
+    def __init__(self, tlds=DEFAULT_TLDS, allow_domains=(), deny_domains=()):
+        self.tlds = frozenset(t.lower().lstrip(".") for t in tlds)
+        self.allow = frozenset(self._clean_domain(d) for d in allow_domains or () if d and d.strip())
+        self.deny = frozenset(self._clean_domain(d) for d in deny_domains or () if d and d.strip())
+
+    @staticmethod
+    def _clean_domain(domain):
+        d = domain.strip().lower()
+        for scheme in _SCHEMES:
+            if d.startswith(scheme):
+                d = d[len(scheme):]
+        return d.split("/", 1)[0].strip(".")
+
+    @staticmethod
+    def _in(host, domains):
+        if not domains:
+            return False
+        if host in domains:
+            return True
+        i = host.find(".")
+        while i != -1:
+            if host[i + 1:] in domains:
+                return True
+            i = host.find(".", i + 1)
+        return False
+
+    def classify(self, token):
+        """
+        Retorna o host se o token for um link bloqueável, senão None. Com http(s):// ou www. é
+        sempre link; sem, precisa de um TLD conhecido em algum rótulo após o primeiro
+        (ex.: meusite.com.br), como no regex antigo.
+        """
+        if "." not in token and "://" not in token:
+            return None
+        t = token.strip(_LEADING).rstrip(_TRAILING).lower()
+        explicit = False
+        for scheme in _SCHEMES:
+            if t.startswith(scheme):
+                t = t[len(scheme):]
+                explicit = True
+                break
+        if t.startswith("www."):
+            explicit = True
+
+        for sep in "/?#":
+            i = t.find(sep)
+            if i != -1:
+                t = t[:i]
+        host = t.rsplit("@", 1)[-1]
+        i = host.rfind(":")
+        if i != -1 and host[i + 1:].isdigit():
+            host = host[:i]
+        host = host.strip(".")
+        if len(host) > 253:
+            return None
+
+        labels = host.split(".")
+        if (len(labels) < 2 and not explicit) or not all(_valid_label(lb) for lb in labels):
+            return None
+        if self._in(host, self.deny):
+            return host
+        if not explicit and not any(lb in self.tlds for lb in labels[1:]):
+            return None
+        if self._in(host, self.allow):
+            return None
+        return host
+
+    def find(self, text):
+        """Primeiro link bloqueável da mensagem (LinkMatch) ou None."""
+        if not text or ("." not in text and "://" not in text):
+            return None
+        for token in text.split():
+            host = self.classify(token)
+            if host:
+                return LinkMatch(token, host)
+        return None
@@ -0,0 +1,87 @@
+import queue
+import threading
+import time
+
+
+class ModerationQueue:
+    """
+    Fila de ações de moderação executadas por um pool de workers, fora da thread do IRC.
+    Ações com a mesma chave (ex.: usuário) pendentes ou recentes são descartadas.
+    """
+    def __init__(self, workers=2, dedupe_window_s=5.0, logger=lambda *a, **k: None):
+        self.workers = max(1, int(workers))
+        self.dedupe_window_s = dedupe_window_s
+        self.log = logger
+        self._q = queue.Queue()
+        self._lock = threading.Lock()
+        self._threads = []
+        self._active = {}   # chave -> None (pendente/em execução) ou monotonic de término
+        self._stats = {"enqueued": 0, "deduped": 0, "done": 0, "failed": 0,
+                       "latency_total": 0.0, "latency_max": 0.0}
+
+    def start(self):
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                t = threading.Thread(target=self._worker, name=f"moderation-{i}", daemon=True)
+                t.start()
+                self._threads.append(t)
+
+    def stop(self, timeout=2.0):
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._q.put(None)
+        for t in threads:
+            t.join(timeout)
+
+    def submit(self, key, fn, *args, **kwargs) -> bool:
+        """Enfileira fn(*args, **kwargs). Retorna False se a chave já estava pendente/recente."""
+        now = time.monotonic()
+        with self._lock:
+            if key in self._active:
+                finished = self._active[key]
+                if finished is None or now - finished < self.dedupe_window_s:
+                    self._stats["deduped"] += 1
+                    return False
+            self._active[key] = None
+            self._stats["enqueued"] += 1
+            if len(self._active) > 1024:
+                self._sweep(now)
+        if not self._threads:
+            self.start()
+        self._q.put((key, fn, args, kwargs, now))
+        return True
+
+    def _sweep(self, now):
+        for k in [k for k, fin in self._active.items() if fin is not None and now - fin >= self.dedupe_window_s]:
+            del self._active[k]
+
+    def _worker(self):
+        while True:
+            job = self._q.get()
+            if job is None:
+                break
+            key, fn, args, kwargs, enqueued = job
+            ok = True
+            try:
+                fn(*args, **kwargs)
+            except Exception as e:
+                ok = False
+                self.log(f"❌ Erro na ação de moderação ({key}): {e}", "error")
+            finished = time.monotonic()
+            latency = finished - enqueued
+            with self._lock:
+                self._active[key] = finished
+                self._stats["done" if ok else "failed"] += 1
+                self._stats["latency_total"] += latency
+                self._stats["latency_max"] = max(self._stats["latency_max"], latency)
+
+    def stats(self) -> dict:
+        with self._lock:
+            s = dict(self._stats)
+        processed = s["done"] + s["failed"]
+        s["depth"] = self._q.qsize()
+        s["latency_avg"] = s.pop("latency_total") / processed if processed else 0.0
+        return s
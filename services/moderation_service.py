@@ -1,10 +1,8 @@
-import re
 import time
 
-LINK_RE = re.compile(
-    r"(https?://|www\.)[^\s]+|([a-z0-9-]+\.)+(com|net|org|gg|io|tv)(/[^\s]*)?",
-    re.I
-)
+from services.link_detector import DEFAULT_TLDS, LinkDetector
+from services.moderation_queue import ModerationQueue
+from services.text_matcher import BlacklistMatcher
 
 class ModerationService:
     def __init__(self, config, logger, send_raw, send_message):
@@ -14,6 +12,13 @@ class ModerationService:
         self.send_message = send_message
         self._permits = {}
         self.api = None
+        self.vars = None
+        self._blacklist = (None, None, BlacklistMatcher(()))
+        self._links = (None, LinkDetector())
+        self.queue = ModerationQueue(
+            workers=int(self._cfg().get("queue_workers", 2)),
+            logger=logger
+        )
 
     def _cfg(self):
         return self.config.get("settings", {}).get("moderation", {})
@@ -46,8 +51,8 @@ class ModerationService:
             return False
         return info.get("remaining", 0) > 0
 
-    def _consume_permit_if_link(self, username, text):
-        if not LINK_RE.search(text or ""):
+    def _consume_permit_if_link(self, username, link):
+        if not link:
             return False
 
         info = self._get_permit(username)
@@ -61,7 +66,7 @@ class ModerationService:
             self._permits[username.lower()] = info
         return True
 
-    def guard_message(self, username, text, is_mod=False, is_broadcaster=False, message_id=None):
+    def guard_message(self, username, text, is_mod=False, is_broadcaster=False, message_id=None, user_id=None):
         cfg = self._cfg()
         if not cfg.get("enabled", True):
             return True
@@ -69,24 +74,59 @@ class ModerationService:
         if is_mod or is_broadcaster:
             return True
 
-        if cfg.get("anti_link_spam", False) and LINK_RE.search(text or ""):
-            if self._consume_permit_if_link(username, text or ""):
+        link = self.link_detector(cfg).find(text) if cfg.get("anti_link_spam", False) else None
+        if link:
+            if self._consume_permit_if_link(username, link):
                 return True
-            self._punish(username, reason="link não permitido", message_id=message_id)
+            self._enqueue_punish(username, "link não permitido", message_id, user_id)
             return False
 
         if cfg.get("blacklist_enabled", False):
-            words = set(map(str.lower, cfg.get("blacklist_words", [])))
-            if words:
-                low = (text or "").lower()
-                for w in words:
-                    if w and w in low:
-                        self._punish(username, reason="uso de palavra proibida!", message_id=message_id)
-                        return False
+            if self.blacklist_matcher(cfg).find(text or ""):
+                self._enqueue_punish(username, "uso de palavra proibida!", message_id, user_id)
+                return False
 
         return True
 
-    def _punish(self, username, reason="", message_id=None):
+    def blacklist_matcher(self, cfg=None):
+        """Autômato da blacklist; só é recompilado quando a lista (nova a cada save) ou os modos mudam."""
+        cfg = self._cfg() if cfg is None else cfg
+        words = cfg.get("blacklist_words") or []
+        flags = (bool(cfg.get("blacklist_whole_word", False)), bool(cfg.get("blacklist_normalize", False)))
+        cached_words, cached_flags, matcher = self._blacklist
+        if words is cached_words and flags == cached_flags:
+            return matcher
+        matcher = BlacklistMatcher(words, whole_word=flags[0], normalize=flags[1])
+        self._blacklist = (words, flags, matcher)
+        return matcher
+
+    def link_detector(self, cfg=None):
+        """Detector de links com as listas allow/deny e TLDs extras atuais (recriado só quando mudam)."""
+        cfg = self._cfg() if cfg is None else cfg
+        key = (cfg.get("link_allow_domains"), cfg.get("link_deny_domains"), cfg.get("link_tlds"))
+        cached_key, detector = self._links
+        if cached_key is not None and all(a is b for a, b in zip(key, cached_key)):
+            return detector
+        detector = LinkDetector(
+            tlds=DEFAULT_TLDS.union(key[2] or ()),
+            allow_domains=key[0] or (),
+            deny_domains=key[1] or ()
+        )
+        self._links = (key, detector)
+        return detector
+
+    def _enqueue_punish(self, username, reason, message_id=None, user_id=None):
+        """Agenda a punição no pool; várias linhas do mesmo usuário viram uma ação só."""
+        cfg = self._cfg()
+        action = (cfg.get("action") or "both").lower()
+        per_user = action in ("timeout", "both") and int(cfg.get("timeout_seconds", 10)) > 1
+        key = username.lower() if per_user else f"{username.lower()}:{message_id}"
+        self.queue.submit(key, self._punish, username, reason=reason, message_id=message_id, user_id=user_id)
+
+    def stop(self):
+        self.queue.stop()
+
+    def _punish(self, username, reason="", message_id=None, user_id=None):
         cfg = self._cfg()
         action = (cfg.get("action") or "both").lower()
         timeout_secs = int(cfg.get("timeout_seconds", 10))
@@ -94,9 +134,13 @@ class ModerationService:
         api = getattr(self, "api", None)
         broadcaster_id = str(self.config["target_channel_id"])
         moderator_id   = str(self.config["bot_user_id"])
+        target = str(user_id) if user_id else username
+
+        # Timeout já apaga as mensagens do usuário: no modo "both" um único POST resolve.
+        timeout_purges = action == "both" and timeout_secs > 1
 
         deleted = False
-        if action in ("delete", "both") and message_id:
+        if action in ("delete", "both") and message_id and not timeout_purges:
             try:
                 if api and hasattr(api, "delete_chat_message"):
                     deleted = bool(api.delete_chat_message(
@@ -107,10 +151,10 @@ class ModerationService:
             except Exception as e:
                 self.log(f"❌ Falha no delete via API: {e}", "error")
 
-        if not deleted and action in ("delete", "both"):
+        if not deleted and action in ("delete", "both") and not timeout_purges:
             ok = False
             if api and hasattr(api, "timeout_user"):
-                ok = api.timeout_user(broadcaster_id, moderator_id, username, 1, reason)
+                ok = api.timeout_user(broadcaster_id, moderator_id, target, 1, reason)
                 deleted = True
             if not ok:
                 self.log(f"Falha no delete para {username}", "error")
@@ -118,7 +162,7 @@ class ModerationService:
         if action in ("timeout", "both") and timeout_secs > 1:
             ok = False
             if api and hasattr(api, "timeout_user"):
-                ok = api.timeout_user(broadcaster_id, moderator_id, username, timeout_secs, reason)
+                ok = api.timeout_user(broadcaster_id, moderator_id, target, timeout_secs, reason)
             if not ok:
                 self.log(f"Falha no timeout para {username}", "error")
 
@@ -126,9 +170,11 @@ class ModerationService:
             msg_tpl = (cfg.get("punish_message") or "").strip()
             if msg_tpl:
                 try:
-                    self.send_message(
-                        msg_tpl.replace("{user}", username).replace("{reason}", reason)
-                    )
+                    if self.vars is not None:
+                        text = self.vars.format(msg_tpl, username, extra={"reason": reason})
+                    else:
+                        text = msg_tpl.replace("{user}", username).replace("{reason}", reason)
+                    self.send_message(text)
                 except Exception:
                     pass
 
@@ -0,0 +1,185 @@
+import threading
+import time
+from collections import deque
+
+PRIORITY_MODERATION = 0
+PRIORITY_COMMAND = 1
+PRIORITY_EVENT = 2
+PRIORITY_TIMER = 3
+
+LIMIT_USER = 20
+LIMIT_MOD = 100
+WINDOW_S = 30.0
+
+
+class _Outgoing:
+    __slots__ = ("text", "key", "parts", "render", "enqueued_at")
+
+    def __init__(self, text, key, parts, render, enqueued_at):
+        self.text = text
+        self.key = key
+        self.parts = parts
+        self.render = render
+        self.enqueued_at = enqueued_at
+
+
+class OutgoingQueue:
+    """
+    Fila única de saída do chat com um writer dedicado:
+    - janela deslizante: no máximo `limit` envios em qualquer intervalo de `window_s`
+      (20/30s; 100/30s quando o bot é mod), pelo registro dos horários dos últimos envios;
+    - faixas de prioridade: moderação > respostas de comando > agradecimentos de evento > timers;
+    - coalescing: mensagens com a mesma `coalesce_key` ainda na fila viram uma só
+      (render(parts) remonta o texto, ex.: agradecimento de vários gift subs);
+    - sob sobrecarga: texto idêntico pendente é descartado, cada faixa é limitada (descarta a
+      mais antiga) e eventos/timers velhos demais são descartados na saída.
+    """
+    LANE_MAX = {PRIORITY_MODERATION: 200, PRIORITY_COMMAND: 100, PRIORITY_EVENT: 50, PRIORITY_TIMER: 5}
+    STALE_AFTER_S = {PRIORITY_EVENT: 60.0, PRIORITY_TIMER: 30.0}
+
+    def __init__(self, write, limit=LIMIT_USER, window_s=WINDOW_S,
+                 logger=lambda *a, **k: None, clock=time.monotonic):
+        self._write = write
+        self.window_s = window_s
+        self.log = logger
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._lanes = {p: deque() for p in self.LANE_MAX}
+        self._by_key = {}
+        self._stop = False
+        self._thread = None
+        self.limit = limit
+        self._sent = deque()
+        self.stats = {"sent": 0, "coalesced": 0, "dropped": 0, "stale": 0}
+
+    def set_limit(self, limit: int):
+        """Troca o limite (ex.: USERSTATE indicou mod); os envios já feitos na janela continuam contando."""
+        with self._cond:
+            if limit == self.limit:
+                return
+            self.limit = limit
+            self._cond.notify()
+
+    def pending(self) -> int:
+        with self._cond:
+            return sum(len(q) for q in self._lanes.values())
+
+    def submit(self, text, priority=PRIORITY_COMMAND, coalesce_key=None, part=None, render=None) -> bool:
+        """Enfileira; retorna False se a mensagem foi descartada ou fundida com uma pendente."""
+        lane_id = priority if priority in self._lanes else PRIORITY_COMMAND
+        merged = None
+        with self._cond:
+            lane = self._lanes[lane_id]
+            if coalesce_key is not None:
+                item = self._by_key.get(coalesce_key)
+                if item is not None:
+                    self.stats["coalesced"] += 1
+                    if part is None or render is None:
+                        return False
+                    item.parts.append(part)
+                    merged = item
+            if merged is None and coalesce_key is None and any(item.text == text for item in lane):
+                # o Twitch rejeita repetidas; não gasta token com isso
+                self.stats["dropped"] += 1
+                return False
+
+            if merged is None:
+                return self._enqueue(lane_id, text, coalesce_key, part, render)
+
+        # render (pode resolver variáveis) fora do lock; só aplica se ainda estiver na fila
+        parts = list(merged.parts)
+        text = render(parts)
+        with self._cond:
+            if self._by_key.get(coalesce_key) is merged and len(merged.parts) == len(parts):
+                merged.text = text
+        return False
+
+    def _enqueue(self, lane_id, text, coalesce_key, part, render):
+        """Chamar com o lock."""
+        lane = self._lanes[lane_id]
+        if len(lane) >= self.LANE_MAX[lane_id]:
+            old = lane.popleft()
+            if old.key is not None:
+                self._by_key.pop(old.key, None)
+            self.stats["dropped"] += 1
+
+        item = _Outgoing(text, coalesce_key, [part] if part is not None else [], render, self._clock())
+        lane.append(item)
+        if coalesce_key is not None:
+            self._by_key[coalesce_key] = item
+        self._cond.notify()
+        return True
+
+    def start(self):
+        if self._thread is None:
+            self._stop = False
+            self._thread = threading.Thread(target=self._loop, name="irc-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(2)
+            self._thread = None
+        with self._cond:
+            for q in self._lanes.values():
+                q.clear()
+            self._by_key.clear()
+
+    def _wait_for_slot(self):
+        """Segundos até poder enviar (0 = já pode), descartando envios fora da janela. Chamar com o lock."""
+        now = self._clock()
+        sent = self._sent
+        while sent and now - sent[0] >= self.window_s:
+            sent.popleft()
+        if len(sent) < self.limit:
+            return 0.0
+        return sent[len(sent) - self.limit] + self.window_s - now
+
+    def _next(self):
+        """Próxima mensagem válida pela prioridade. Chamar com o lock."""
+        now = self._clock()
+        for lane_id, lane in self._lanes.items():
+            stale_after = self.STALE_AFTER_S.get(lane_id)
+            while lane:
+                item = lane.popleft()
+                if item.key is not None:
+                    self._by_key.pop(item.key, None)
+                if stale_after is not None and now - item.enqueued_at > stale_after:
+                    self.stats["stale"] += 1
+                    continue
+                return item
+        return None
+
+    def _poll(self):
+        """
+        Um passo do writer. Chamar com o lock. Retorna (mensagem, 0) quando há o que enviar agora,
+        (None, segundos) enquanto a janela está cheia e (None, None) com a fila vazia.
+        """
+        while any(self._lanes.values()):
+            wait = self._wait_for_slot()
+            if wait > 0:
+                return None, wait
+            item = self._next()
+            if item is not None:
+                self._sent.append(self._clock())
+                return item, 0
+        return None, None
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                while True:
+                    if self._stop:
+                        return
+                    item, wait = self._poll()
+                    if item is not None:
+                        break
+                    self._cond.wait(wait)
+            try:
+                self._write(item.text)
+                self.stats["sent"] += 1
+            except Exception as e:
+                self.log(f"❌ Erro ao enviar mensagem: {e}", "error")
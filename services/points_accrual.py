@@ -0,0 +1,83 @@
+import threading
+import time
+
+
+class PointsAccrual:
+    """
+    Acúmulo de pontos por mensagem em lote: cada mensagem elegível só soma em memória,
+    e a cada `interval_s` os saldos pendentes vão para o PointsService num único add_many.
+    O cooldown por usuário expira sozinho (entradas velhas são varridas a cada tick).
+    """
+    def __init__(self, points_service, get_settings, interval_s=5.0, logger=lambda *a, **k: None,
+                 clock=time.monotonic):
+        self.points = points_service
+        self._get_settings = get_settings
+        self.interval_s = interval_s
+        self.log = logger
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._last_seen = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="points-accrual", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(2)
+            self._thread = None
+        self.flush()
+
+    def note_message(self, user: str, bypass_cooldown=False) -> bool:
+        """Registra uma mensagem; retorna True se ela rende pontos."""
+        ps = self._get_settings() or {}
+        amount = int(ps.get("points_accrual_per_msg", 1) or 0)
+        cd = int(ps.get("points_accrual_cooldown_s", 60) or 0)
+        u = user.lower()
+        now = self._clock()
+        with self._lock:
+            last = self._last_seen.get(u)
+            if not bypass_cooldown and last is not None and now - last < cd:
+                return False
+            self._last_seen[u] = now
+            if amount <= 0:
+                return False
+            self._pending[u] = self._pending.get(u, 0) + amount
+        if self._thread is None:
+            self.start()
+        return True
+
+    def pending(self, user: str) -> int:
+        with self._lock:
+            return self._pending.get(user.lower(), 0)
+
+    def flush(self):
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        if batch:
+            try:
+                self.points.add_many(batch)
+            except Exception as e:
+                self.log(f"⚠️ points acumulados: {e}", "warning")
+                with self._lock:
+                    for u, amount in batch.items():
+                        self._pending[u] = self._pending.get(u, 0) + amount
+        self._sweep()
+
+    def _sweep(self):
+        cd = int((self._get_settings() or {}).get("points_accrual_cooldown_s", 60) or 0)
+        cutoff = self._clock() - cd
+        with self._lock:
+            stale = [u for u, ts in self._last_seen.items() if ts <= cutoff]
+            for u in stale:
+                del self._last_seen[u]
+
+    def _loop(self):
+        while not self._stop.wait(self.interval_s):
+            self.flush()
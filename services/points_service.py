@@ -1,59 +1,75 @@
+import threading
 
-import json, os, threading
+from services.storage import JsonStore
 
 class PointsService:
-    """Sistema simples de pontos local, salvo em points.json."""
-    def __init__(self, storage_path="points.json", logger=lambda *a, **k: None):
-        self.storage_path = storage_path
+    """
+    Sistema simples de pontos local, salvo em points.json (ou no backend configurado).
+    Por padrão usa JsonStore write-behind: alterações vão para memória + journal
+    e são compactadas no arquivo em segundo plano.
+    """
+    def __init__(self, storage_path="points.json", logger=lambda *a, **k: None,
+                 flush_interval_s=10, flush_ops=500, store=None):
         self.log = logger
         self._lock = threading.Lock()
-        self._data = {}
-        self._load()
-
-    def _load(self):
-        try:
-            if os.path.exists(self.storage_path):
-                with open(self.storage_path, "r", encoding="utf-8") as f:
-                    self._data = json.load(f)
-            else:
-                self._data = {}
-        except Exception as e:
-            self.log(f"❌ Erro ao carregar {self.storage_path}: {e}", "error")
-            self._data = {}
-
-    def _save(self):
-        try:
-            with open(self.storage_path, "w", encoding="utf-8") as f:
-                json.dump(self._data, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            self.log(f"❌ Erro ao salvar {self.storage_path}: {e}", "error")
+        self.store = store or JsonStore(storage_path, logger, flush_interval_s=flush_interval_s,
+                                        flush_ops=flush_ops)
+
+    @property
+    def storage_path(self):
+        return getattr(self.store, "path", None)
+
+    @storage_path.setter
+    def storage_path(self, value):
+        if hasattr(self.store, "path") and value:
+            self.store.path = value
+
+    def flush(self):
+        self.store.flush()
+
+    def close(self):
+        self.store.close()
+
+    def _get(self, u):
+        return int(self.store.get(u, 0) or 0)
 
     def get(self, user: str) -> int:
         with self._lock:
-            return int(self._data.get(user.lower(), 0))
+            return self._get(user.lower())
 
     def add(self, user: str, amount: int) -> int:
         with self._lock:
             u = user.lower()
-            self._data[u] = int(self._data.get(u, 0)) + int(amount)
-            self._save()
-            return self._data[u]
+            value = self._get(u) + int(amount)
+            self.store.put(u, value)
+            return value
 
     def set(self, user: str, amount: int) -> int:
         with self._lock:
             u = user.lower()
-            self._data[u] = int(amount)
-            self._save()
-            return self._data[u]
+            value = int(amount)
+            self.store.put(u, value)
+            return value
+
+    def add_many(self, amounts: dict) -> dict:
+        """Soma vários saldos numa única gravação. Retorna {usuario: novo_saldo}."""
+        with self._lock:
+            changed = {}
+            for user, amount in amounts.items():
+                u = user.lower()
+                changed[u] = changed.get(u, self._get(u)) + int(amount)
+            self.store.put_many(changed)
+            return changed
 
     def transfer(self, from_user: str, to_user: str, amount: int) -> bool:
         if amount <= 0:
             return False
         with self._lock:
             fu, tu = from_user.lower(), to_user.lower()
-            if int(self._data.get(fu, 0)) < amount:
+            balance = self._get(fu)
+            if balance < amount:
                 return False
-            self._data[fu] = int(self._data.get(fu, 0)) - amount
-            self._data[tu] = int(self._data.get(tu, 0)) + amount
-            self._save()
+            if fu == tu:
+                return True
+            self.store.put_many({fu: balance - amount, tu: self._get(tu) + amount})
             return True
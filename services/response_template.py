@@ -0,0 +1,141 @@
+import random
+import re
+import string
+import threading
+
+_SPECIAL_RE = re.compile(
+    r"\$count\{(?P<count>[^}]+)\}"
+    r"|(?i:\$rand)\{(?P<rand>\s*\d+\s*,\s*\d+\s*)\}"
+)
+_COUNT_OP_RE = re.compile(r"^(\w+)\s*([\+\-])\s*(\d+)$", re.I)
+_FORMATTER = string.Formatter()
+
+LIT, VAR, COUNT, RAND = 0, 1, 2, 3
+
+
+class CompiledTemplate:
+    """
+    Template de resposta já quebrado em pedaços literais e placeholders tipados:
+    (LIT, texto) | (VAR, nome, spec, conversão, original) | (COUNT, chave, delta) | (RAND, min, max)
+    """
+    __slots__ = ("source", "nodes", "fields", "has_counts", "error")
+
+    def __init__(self, source, nodes, error=None):
+        self.source = source
+        self.nodes = nodes
+        self.fields = frozenset(n[1] for n in nodes if n[0] == VAR)
+        self.has_counts = any(n[0] == COUNT for n in nodes)
+        self.error = error
+
+    def render(self, values, counts=None, keep_missing=False):
+        """
+        Monta a string final em uma passada.
+        Retorna (texto, updates) onde updates é {contador: novo_valor} ou None.
+        Placeholder ausente levanta KeyError, a menos que keep_missing=True.
+        """
+        out = []
+        updates = None
+        for node in self.nodes:
+            op = node[0]
+            if op == LIT:
+                out.append(node[1])
+            elif op == VAR:
+                name = node[1]
+                if name in values:
+                    value = values[name]
+                elif keep_missing:
+                    out.append(node[4])
+                    continue
+                else:
+                    raise KeyError(name)
+                conv = node[3]
+                if conv:
+                    value = repr(value) if conv == "r" else ascii(value) if conv == "a" else str(value)
+                out.append(format(value, node[2]) if node[2] else str(value))
+            elif op == COUNT:
+                key, delta = node[1], node[2]
+                if updates and key in updates:
+                    current = updates[key]
+                else:
+                    current = (counts or {}).get(key, 0)
+                if delta is not None:
+                    current += delta
+                    if updates is None:
+                        updates = {}
+                    updates[key] = current
+                out.append(str(current))
+            else:
+                out.append(str(random.randint(node[1], node[2])))
+        return "".join(out), updates
+
+
+def _compile_format_chunk(chunk, nodes):
+    for literal, field, spec, conv in _FORMATTER.parse(chunk):
+        if literal:
+            nodes.append((LIT, literal))
+        if field is None:
+            continue
+        original = "{" + field + (("!" + conv) if conv else "") + ((":" + spec) if spec else "") + "}"
+        nodes.append((VAR, field, spec or "", conv, original))
+
+
+def compile_template(text: str) -> CompiledTemplate:
+    """Compila `$count{}`, `$rand{}` e os campos `{nome}` (sintaxe de str.format)."""
+    nodes = []
+    pos = 0
+    try:
+        for m in _SPECIAL_RE.finditer(text):
+            if m.start() > pos:
+                _compile_format_chunk(text[pos:m.start()], nodes)
+            pos = m.end()
+            if m.group("count") is not None:
+                content = m.group("count").strip()
+                op = _COUNT_OP_RE.match(content)
+                if op:
+                    delta = int(op.group(3))
+                    nodes.append((COUNT, op.group(1).lower(), delta if op.group(2) == "+" else -delta))
+                else:
+                    nodes.append((COUNT, content.lower(), None))
+            else:
+                lo, hi = (int(n) for n in m.group("rand").split(","))
+                nodes.append((RAND, min(lo, hi), max(lo, hi)))
+        if pos < len(text):
+            _compile_format_chunk(text[pos:], nodes)
+    except ValueError as e:
+        return CompiledTemplate(text, (), error=e)
+
+    merged = []
+    for node in nodes:
+        if node[0] == LIT and merged and merged[-1][0] == LIT:
+            merged[-1] = (LIT, merged[-1][1] + node[1])
+        else:
+            merged.append(node)
+    return CompiledTemplate(text, tuple(merged))
+
+
+class TemplateCache:
+    """Cache texto -> CompiledTemplate. Limpo quando commands.json muda."""
+    def __init__(self, max_size=1024):
+        self.max_size = max_size
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def get(self, text: str) -> CompiledTemplate:
+        tpl = self._cache.get(text)
+        if tpl is None:
+            tpl = compile_template(text)
+            with self._lock:
+                if len(self._cache) >= self.max_size:
+                    self._cache.clear()
+                self._cache[text] = tpl
+        return tpl
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def warm(self, commands: dict):
+        for cfg in (commands or {}).values():
+            response = cfg.get("response") if isinstance(cfg, dict) else None
+            if isinstance(response, str):
+                self.get(response)
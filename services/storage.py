@@ -0,0 +1,389 @@
+import json
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+
+_MISSING = object()
+
+
+class KeyValueStore(ABC):
+    """
+    Interface dos backends de armazenamento (um namespace por instância).
+    Valores são qualquer coisa serializável em JSON.
+    """
+    @abstractmethod
+    def get(self, key, default=None):
+        ...
+
+    def get_many(self, keys) -> dict:
+        """{chave: valor} só das chaves existentes."""
+        out = {}
+        for k in keys:
+            v = self.get(k, _MISSING)
+            if v is not _MISSING:
+                out[k] = v
+        return out
+
+    @abstractmethod
+    def put_many(self, items: dict):
+        """Grava todos os pares numa única operação/transação."""
+        ...
+
+    @abstractmethod
+    def delete(self, key):
+        ...
+
+    @abstractmethod
+    def items(self) -> list:
+        ...
+
+    @abstractmethod
+    def clear(self):
+        ...
+
+    def __len__(self):
+        return len(self.items())
+
+    def put(self, key, value):
+        self.put_many({key: value})
+
+    def reload(self):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+
+class JsonStore(KeyValueStore):
+    """
+    Arquivo JSON (dict no topo) inteiro em memória.
+    journal=True: write-behind — cada put vai para `<arquivo>.journal` (JSON lines, valores absolutos)
+    e uma thread compacta no snapshot a cada `flush_interval_s` s ou `flush_ops` operações.
+    journal=False: cada put regrava o arquivo (tmp + os.replace).
+    """
+    def __init__(self, path, logger=lambda *a, **k: None, journal=True,
+                 flush_interval_s=10, flush_ops=500, indent=None):
+        self.path = path
+        self.log = logger
+        self.journal = journal
+        self.flush_interval_s = flush_interval_s
+        self.flush_ops = flush_ops
+        self.indent = indent
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._data = {}
+        self._fh = None
+        self._fh_name = None
+        self._ops = 0
+        self._closed = False
+        self._wake = threading.Event()
+        self._load()
+        self._thread = None
+        if journal and flush_interval_s and flush_interval_s > 0:
+            self._thread = threading.Thread(target=self._flush_loop, name=f"store-flush:{os.path.basename(path)}",
+                                            daemon=True)
+            self._thread.start()
+
+    def _journal_path(self):
+        return f"{self.path}.journal"
+
+    def _load(self):
+        data = {}
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            if not isinstance(data, dict):
+                data = {}
+        except Exception as e:
+            self.log(f"❌ Erro ao carregar {self.path}: {e}", "error")
+            data = {}
+        self._data = data
+        # Compactação interrompida primeiro, depois o journal atual (valores absolutos: replay idempotente).
+        replayed = 0
+        for path in (self._journal_path() + ".compacting", self._journal_path()):
+            replayed += self._replay(path)
+        if replayed:
+            self._ops = replayed
+            self.log(f"ℹ️ {os.path.basename(self.path)}: {replayed} alterações recuperadas do journal.", "info")
+
+    def _replay(self, path):
+        if not os.path.exists(path):
+            return 0
+        count = 0
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        continue  # última linha truncada por queda
+                    if rec.get("c"):
+                        self._data.clear()
+                        count += 1
+                        continue
+                    key = rec.get("k", rec.get("u"))
+                    if rec.get("d"):
+                        self._data.pop(key, None)
+                    else:
+                        self._data[key] = rec["v"]
+                    count += 1
+        except Exception as e:
+            self.log(f"❌ Erro ao ler journal {path}: {e}", "error")
+        return count
+
+    def reload(self):
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+            self._ops = 0
+            self._load()
+
+    def get(self, key, default=None):
+        with self._lock:
+            return self._data.get(key, default)
+
+    def get_many(self, keys):
+        with self._lock:
+            data = self._data
+            return {k: data[k] for k in keys if k in data}
+
+    def items(self):
+        with self._lock:
+            return list(self._data.items())
+
+    def __len__(self):
+        return len(self._data)
+
+    def put_many(self, items):
+        if not items:
+            return
+        with self._lock:
+            self._data.update(items)
+            if self.journal:
+                self._append([{"k": k, "v": v} for k, v in items.items()])
+            else:
+                self._write_snapshot(dict(self._data))
+
+    def delete(self, key):
+        with self._lock:
+            if self._data.pop(key, _MISSING) is _MISSING:
+                return
+            if self.journal:
+                self._append([{"k": key, "d": 1}])
+            else:
+                self._write_snapshot(dict(self._data))
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            if self.journal:
+                self._append([{"c": 1}])
+            else:
+                self._write_snapshot({})
+
+    def _append(self, records):
+        try:
+            path = self._journal_path()
+            if self._fh is None or self._fh_name != path:
+                if self._fh is not None:
+                    self._fh.close()
+                self._fh = open(path, "a", encoding="utf-8")
+                self._fh_name = path
+            self._fh.write("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records))
+            self._fh.flush()
+        except Exception as e:
+            self.log(f"❌ Erro ao gravar journal de {self.path}: {e}", "error")
+        self._ops += len(records)
+        if self._ops >= self.flush_ops:
+            self._wake.set()
+
+    def _write_snapshot(self, snapshot):
+        tmp = f"{self.path}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, ensure_ascii=False, indent=self.indent)
+            os.replace(tmp, self.path)
+            return True
+        except Exception as e:
+            self.log(f"❌ Erro ao salvar {self.path}: {e}", "error")
+            return False
+
+    def _flush_loop(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval_s)
+            self._wake.clear()
+            if self._ops:
+                self.flush()
+
+    def flush(self):
+        """Compacta memória -> snapshot e descarta o journal já aplicado."""
+        if not self.journal:
+            return
+        with self._flush_lock:
+            with self._lock:
+                journal = self._journal_path()
+                if not self._ops and not os.path.exists(journal):
+                    return
+                snapshot = dict(self._data)
+                compacting = journal + ".compacting"
+                if self._fh is not None:
+                    self._fh.close()
+                    self._fh = None
+                try:
+                    if os.path.exists(journal):
+                        if os.path.exists(compacting):
+                            # compactação anterior falhou: mantém os dois até gravar o snapshot
+                            with open(journal, "r", encoding="utf-8") as src, \
+                                 open(compacting, "a", encoding="utf-8") as dst:
+                                dst.write(src.read())
+                            os.remove(journal)
+                        else:
+                            os.replace(journal, compacting)
+                except Exception as e:
+                    self.log(f"❌ Erro ao rotacionar journal de {self.path}: {e}", "error")
+                    return
+                self._ops = 0
+
+            if self._write_snapshot(snapshot) and os.path.exists(compacting):
+                try:
+                    os.remove(compacting)
+                except OSError:
+                    pass
+
+    def close(self):
+        self._closed = True
+        self._wake.set()
+        self.flush()
+
+
+class SQLiteStore(KeyValueStore):
+    """
+    Tabela kv(ns, k, v) em SQLite (WAL). Busca por chave indexada, sem carregar tudo na memória;
+    put_many roda numa transação só.
+    """
+    def __init__(self, db_path, namespace, logger=lambda *a, **k: None):
+        self.db_path = db_path
+        self.namespace = namespace
+        self.log = logger
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS kv ("
+            " ns TEXT NOT NULL, k TEXT NOT NULL, v TEXT NOT NULL,"
+            " PRIMARY KEY (ns, k)) WITHOUT ROWID"
+        )
+
+    def get(self, key, default=None):
+        with self._lock:
+            row = self._conn.execute("SELECT v FROM kv WHERE ns=? AND k=?", (self.namespace, key)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def get_many(self, keys):
+        keys = list(keys)
+        out = {}
+        with self._lock:
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                marks = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT k, v FROM kv WHERE ns=? AND k IN ({marks})", (self.namespace, *chunk)
+                ).fetchall()
+                out.update((k, json.loads(v)) for k, v in rows)
+        return out
+
+    def put_many(self, items):
+        if not items:
+            return
+        rows = [(self.namespace, k, json.dumps(v, ensure_ascii=False)) for k, v in items.items()]
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(
+                    "INSERT INTO kv(ns, k, v) VALUES (?, ?, ?) "
+                    "ON CONFLICT(ns, k) DO UPDATE SET v=excluded.v", rows
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def delete(self, key):
+        with self._lock:
+            self._conn.execute("DELETE FROM kv WHERE ns=? AND k=?", (self.namespace, key))
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM kv WHERE ns=?", (self.namespace,))
+
+    def items(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT k, v FROM kv WHERE ns=?", (self.namespace,)).fetchall()
+        return [(k, json.loads(v)) for k, v in rows]
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM kv WHERE ns=?", (self.namespace,)).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+
+
+def backup_sqlite(src_path, dest_path):
+    """
+    Copia o banco `src_path` para `dest_path` pela API de backup do SQLite: o destino recebe
+    um retrato consistente (sem -wal/-shm soltos) mesmo com outras conexões gravando.
+    """
+    src = sqlite3.connect(src_path, timeout=5)
+    try:
+        dst = sqlite3.connect(dest_path, timeout=5)
+        try:
+            src.backup(dst)
+        finally:
+            dst.close()
+    finally:
+        src.close()
+
+
+def _migrate_json(store, json_path, logger):
+    """Importa o JSON antigo (com journal pendente) para o SQLite uma única vez e renomeia o arquivo."""
+    if not json_path or not os.path.exists(json_path) or len(store):
+        return
+    try:
+        legacy = JsonStore(json_path, logger, journal=False)
+        items = dict(legacy.items())
+        store.put_many(items)
+        for path in (json_path, f"{json_path}.journal", f"{json_path}.journal.compacting"):
+            if os.path.exists(path):
+                os.replace(path, path + ".migrated")
+        logger(f"✅ {os.path.basename(json_path)} migrado para SQLite ({len(items)} registros).", "success")
+    except Exception as e:
+        logger(f"❌ Erro ao migrar {json_path} para SQLite: {e}", "error")
+
+
+def open_store(settings, namespace, json_path, logger=lambda *a, **k: None, **json_kwargs) -> KeyValueStore:
+    """
+    Cria o backend configurado em settings['storage_backend'] ('json' padrão ou 'sqlite').
+    No SQLite, o JSON existente do namespace é migrado na primeira abertura.
+    """
+    settings = settings or {}
+    backend = str(settings.get("storage_backend", "json")).lower()
+    if backend == "sqlite":
+        try:
+            store = SQLiteStore(settings.get("storage_db_file", "livechatbot.db"), namespace, logger)
+            _migrate_json(store, json_path, logger)
+            return store
+        except Exception as e:
+            logger(f"❌ SQLite indisponível ({e}); usando {json_path}.", "error")
+    return JsonStore(json_path, logger, **json_kwargs)
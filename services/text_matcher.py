@@ -0,0 +1,102 @@
+import unicodedata
+from collections import deque
+
+_LEET = {"0": "o", "1": "i", "3": "e", "4": "a", "5": "s", "7": "t", "8": "b",
+         "@": "a", "$": "s"}
+
+
+def _fold_char(ch, leet=True):
+    """Minúscula, sem acento e (opcional) sem leetspeak. Sempre 1 caractere -> 1 caractere."""
+    low = ch.lower()
+    if len(low) != 1:
+        low = ch
+    if leet and low in _LEET:
+        return _LEET[low]
+    if low.isascii():
+        return low
+    base = unicodedata.normalize("NFKD", low)[:1]
+    return base if base and not unicodedata.combining(base) else low
+
+
+class BlacklistMatcher:
+    """
+    Autômato Aho–Corasick com todas as palavras proibidas: uma única passada pelo texto,
+    independente do tamanho da lista. Imutável; para mudar a lista, crie outro.
+    """
+    __slots__ = ("words", "whole_word", "normalize", "_goto", "_fail", "_out", "_fold")
+
+    def __init__(self, words, whole_word=False, normalize=False):
+        self.whole_word = bool(whole_word)
+        self.normalize = bool(normalize)
+        self._fold = {}
+        self.words = tuple(dict.fromkeys(
+            self._norm(w.strip()) for w in (words or []) if w and w.strip()
+        ))
+        self._goto = [{}]
+        self._out = [()]
+        for w in self.words:
+            self._add(w)
+        self._build_fail()
+
+    def __bool__(self):
+        return bool(self.words)
+
+    def _norm(self, text):
+        if not self.normalize:
+            return text.lower()
+        fold = self._fold
+        out = []
+        for ch in text:
+            f = fold.get(ch)
+            if f is None:
+                f = fold[ch] = _fold_char(ch)
+            out.append(f)
+        return "".join(out)
+
+    def _add(self, word):
+        node = 0
+        for ch in word:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._out.append(())
+            node = nxt
+        self._out[node] = self._out[node] + (word,)
+
+    def _build_fail(self):
+        self._fail = [0] * len(self._goto)
+        q = deque(self._goto[0].values())
+        while q:
+            node = q.popleft()
+            for ch, nxt in self._goto[node].items():
+                q.append(nxt)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                cand = self._goto[f].get(ch, 0)
+                self._fail[nxt] = cand if cand != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def _is_boundary(self, text, i):
+        return i < 0 or i >= len(text) or not text[i].isalnum()
+
+    def find(self, text):
+        """Retorna a primeira palavra proibida encontrada (normalizada) ou None."""
+        if not self.words or not text:
+            return None
+        text = self._norm(text)
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                if not self.whole_word:
+                    return out[node][0]
+                for w in out[node]:
+                    if self._is_boundary(text, i - len(w)) and self._is_boundary(text, i + 1):
+                        return w
+        return None
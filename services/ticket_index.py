@@ -0,0 +1,99 @@
+import random
+
+
+class TicketIndex:
+    """
+    Bilhetes por usuário com árvore de Fenwick (somas de prefixo) para sorteio ponderado:
+    tickets_of O(1), add O(log n), draw O(log n). Usuários nunca saem do índice (ficam com 0).
+    """
+    __slots__ = ("_users", "_pos", "_counts", "_tree", "total")
+
+    def __init__(self, counts=None):
+        self._users = []
+        self._pos = {}
+        self._counts = []
+        self._tree = [0]
+        self.total = 0
+        if counts:
+            self._bulk_load(counts)
+
+    def _bulk_load(self, counts):
+        for user, n in counts.items():
+            n = int(n)
+            if n <= 0:
+                continue
+            self._pos[user] = len(self._users)
+            self._users.append(user)
+            self._counts.append(n)
+        size = len(self._counts)
+        tree = [0] * (size + 1)
+        for i, n in enumerate(self._counts, 1):
+            tree[i] += n
+            parent = i + (i & -i)
+            if parent <= size:
+                tree[parent] += tree[i]
+        self._tree = tree
+        self.total = sum(self._counts)
+
+    def __len__(self):
+        return len(self._users)
+
+    def unique_count(self):
+        return sum(1 for n in self._counts if n > 0)
+
+    def tickets_of(self, user) -> int:
+        i = self._pos.get(user)
+        return self._counts[i] if i is not None else 0
+
+    def add(self, user, n=1) -> int:
+        """Soma n bilhetes (pode ser negativo, sem ficar abaixo de zero). Retorna o total do usuário."""
+        i = self._pos.get(user)
+        if i is None:
+            if n <= 0:
+                return 0
+            i = self._pos[user] = len(self._users)
+            self._users.append(user)
+            self._counts.append(0)
+            self._grow()
+        n = max(n, -self._counts[i])
+        self._counts[i] += n
+        self.total += n
+        k = i + 1
+        tree = self._tree
+        while k < len(tree):
+            tree[k] += n
+            k += k & -k
+        return self._counts[i]
+
+    def _grow(self):
+        # novo nó k = tamanho: seu valor é a soma de (k - lowbit(k), k-1] já existente, mais zero
+        k = len(self._tree)
+        lo = k - (k & -k)
+        self._tree.append(self._prefix(k - 1) - self._prefix(lo))
+
+    def _prefix(self, k):
+        s = 0
+        tree = self._tree
+        while k > 0:
+            s += tree[k]
+            k -= k & -k
+        return s
+
+    def draw(self, rng=random):
+        """Usuário sorteado com peso = bilhetes, ou None se não há bilhetes."""
+        if self.total <= 0:
+            return None
+        target = rng.randrange(self.total)
+        tree = self._tree
+        pos = 0
+        step = 1 << (len(tree) - 1).bit_length()
+        while step:
+            nxt = pos + step
+            if nxt < len(tree) and tree[nxt] <= target:
+                target -= tree[nxt]
+                pos = nxt
+            step >>= 1
+        return self._users[pos]
+
+    def items(self):
+        return [(u, n) for u, n in zip(self._users, self._counts) if n > 0]
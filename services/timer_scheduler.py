@@ -0,0 +1,192 @@
+import heapq
+import random
+import re
+import threading
+import time
+
+
+_INTERVAL_RE = re.compile(r"^(?:(\d+)\s*m(?:in)?)?\s*(?:(\d+)\s*s)?$")
+
+
+class TimerScheduler:
+    """
+    Agenda os timers de mensagem num heap de prazos monotônicos, numa thread própria.
+    - Intervalo em segundos (`interval_s`) ou, nos timers antigos, `interval_min` * 60.
+    - Jitter (± `timers_jitter_pct` do intervalo) e espaçamento mínimo entre disparos
+      (`timers_min_gap_s`), para timers com o mesmo intervalo não saírem juntos.
+    - min_lines: compara o contador total de linhas do chat com a marca do último disparo.
+    fire(name, config) é chamado na thread do scheduler.
+    """
+    MIN_INTERVAL_S = 5
+
+    def __init__(self, get_timers, fire, get_lines, get_settings=lambda: {},
+                 logger=lambda *a, **k: None, clock=time.monotonic, rng=random.random):
+        self._get_timers = get_timers
+        self._fire = fire
+        self._get_lines = get_lines
+        self._get_settings = get_settings
+        self.log = logger
+        self._clock = clock
+        self._rng = rng
+        self._cond = threading.Condition()
+        self._heap = []
+        self._entries = {}
+        self._seq = 0
+        self._last_fire = None
+        self._stop = False
+        self._thread = None
+
+    @classmethod
+    def interval_of(cls, config) -> float:
+        try:
+            secs = float(config["interval_s"]) if config.get("interval_s") else float(config.get("interval_min", 10)) * 60
+        except (TypeError, ValueError):
+            secs = 600.0
+        return max(cls.MIN_INTERVAL_S, secs)
+
+    @classmethod
+    def parse_interval(cls, text):
+        """Texto do formulário -> segundos: "15" (minutos), "45s", "2m", "1m30s". None se inválido."""
+        text = str(text or "").strip().lower()
+        if text.isdigit():
+            secs = int(text) * 60
+        else:
+            m = _INTERVAL_RE.match(text)
+            if not text or not m or not (m.group(1) or m.group(2)):
+                return None
+            secs = int(m.group(1) or 0) * 60 + int(m.group(2) or 0)
+        return secs if secs >= cls.MIN_INTERVAL_S else None
+
+    @staticmethod
+    def interval_fields(secs) -> dict:
+        """Chaves de intervalo a gravar; minutos inteiros ficam só em interval_min (formato antigo)."""
+        secs = int(secs)
+        if secs % 60 == 0:
+            return {"interval_min": secs // 60}
+        return {"interval_min": max(1, round(secs / 60)), "interval_s": secs}
+
+    @classmethod
+    def format_interval(cls, config, compact=False) -> str:
+        """Intervalo para exibição ("15 min", "1 min 30s"); compact=True é o texto do campo ("15", "90s")."""
+        secs = int(cls.interval_of(config))
+        minutes, rest = divmod(secs, 60)
+        if compact:
+            return str(minutes) if not rest else f"{secs}s"
+        if not rest:
+            return f"{minutes} min"
+        return f"{minutes} min {rest}s" if minutes else f"{rest}s"
+
+    def _settings(self):
+        return self._get_settings() or {}
+
+    def _jittered(self, interval):
+        pct = float(self._settings().get("timers_jitter_pct", 0.1) or 0)
+        return interval * (1 + pct * (2 * self._rng() - 1))
+
+    def _push(self, name, deadline, sig):
+        # gen invalida entradas antigas do heap sem precisar removê-las
+        self._seq += 1
+        self._entries[name] = (self._seq, sig, deadline)
+        heapq.heappush(self._heap, (deadline, name, self._seq))
+
+    def reload(self):
+        """Reconcilia com a configuração atual: novos/alterados são (re)agendados, removidos saem."""
+        timers = self._get_timers() or {}
+        now = self._clock()
+        stagger = float(self._settings().get("timers_stagger_s", 15) or 0)
+        with self._cond:
+            for name in [n for n in self._entries if n not in timers or not timers[n].get("enabled", False)]:
+                del self._entries[name]
+            pos = 0
+            for name, config in timers.items():
+                if not config.get("enabled", False):
+                    continue
+                interval = self.interval_of(config)
+                sig = (interval, config.get("min_lines", 0))
+                cur = self._entries.get(name)
+                if cur and cur[1] == sig:
+                    continue
+                config.setdefault("line_mark", self._get_lines())
+                self._push(name, now + self._jittered(interval) + pos * stagger, sig)
+                pos += 1
+            self._cond.notify()
+
+    def start(self):
+        if self._thread is None:
+            self._stop = False
+            # o contador de linhas recomeça a cada conexão do bot
+            lines = self._get_lines()
+            for config in (self._get_timers() or {}).values():
+                config["line_mark"] = lines
+            self.reload()
+            self._thread = threading.Thread(target=self._loop, name="timers", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(2)
+            self._thread = None
+        with self._cond:
+            self._heap.clear()
+            self._entries.clear()
+
+    def next_due(self):
+        """(nome, segundos até o disparo) do próximo timer válido, ou None."""
+        with self._cond:
+            self._discard_stale()
+            if not self._heap:
+                return None
+            deadline, name, _ = self._heap[0]
+            return name, max(0.0, deadline - self._clock())
+
+    def _discard_stale(self):
+        heap = self._heap
+        while heap and self._entries.get(heap[0][1], (None,))[0] != heap[0][2]:
+            heapq.heappop(heap)
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                while not self._stop:
+                    self._discard_stale()
+                    if self._heap:
+                        wait = self._heap[0][0] - self._clock()
+                        if wait <= 0:
+                            break
+                        self._cond.wait(wait)
+                    else:
+                        self._cond.wait()
+                if self._stop:
+                    return
+                deadline, name, gen = heapq.heappop(self._heap)
+                sig = self._entries[name][1]
+
+                now = self._clock()
+                gap = float(self._settings().get("timers_min_gap_s", 5) or 0)
+                if self._last_fire is not None and now - self._last_fire < gap:
+                    self._push(name, self._last_fire + gap, sig)
+                    continue
+            self._run(name, sig, now)
+
+    def _run(self, name, sig, now):
+        config = (self._get_timers() or {}).get(name)
+        if not config or not config.get("enabled", False):
+            return
+        interval = sig[0]
+        lines = self._get_lines()
+        fired = False
+        if lines - config.get("line_mark", 0) >= int(config.get("min_lines", 0) or 0):
+            try:
+                self._fire(name, config)
+                fired = True
+            except Exception as e:
+                self.log(f"⚠️ Timer '{name}' falhou: {e}", "warning")
+        with self._cond:
+            if fired:
+                self._last_fire = now
+                config["line_mark"] = lines
+            if name in self._entries and self._entries[name][1] == sig:
+                self._push(name, now + self._jittered(interval), sig)
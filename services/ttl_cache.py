@@ -0,0 +1,90 @@
+import threading
+import time
+
+_MISS = object()
+
+
+class _Flight:
+    __slots__ = ("event", "result")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+
+
+class TTLCache:
+    """
+    Cache em memória com TTL por entrada e coalescência de requisições:
+    chamadas concorrentes para a mesma chave esperam um único loader em andamento.
+    """
+    MISS = _MISS
+
+    def __init__(self, max_size=4096, clock=time.monotonic):
+        self.max_size = max_size
+        self._clock = clock
+        self._data = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=_MISS):
+        item = self._data.get(key)
+        if item is None:
+            return default
+        value, expires = item
+        if self._clock() >= expires:
+            self._data.pop(key, None)
+            return default
+        return value
+
+    def set(self, key, value, ttl):
+        if ttl <= 0:
+            return
+        with self._lock:
+            if len(self._data) >= self.max_size and key not in self._data:
+                self._evict_expired()
+                if len(self._data) >= self.max_size:
+                    self._data.pop(next(iter(self._data)))
+            self._data[key] = (value, self._clock() + ttl)
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    def _evict_expired(self):
+        now = self._clock()
+        for k in [k for k, (_, exp) in self._data.items() if exp <= now]:
+            del self._data[k]
+
+    def get_or_load(self, key, loader, ttl, negative_ttl=0, wait_timeout=15):
+        """
+        Retorna o valor em cache ou chama loader() uma única vez.
+        Resultado None é guardado por negative_ttl; exceções não são cacheadas (viram None).
+        """
+        value = self.get(key)
+        if value is not _MISS:
+            return value
+
+        with self._lock:
+            value = self.get(key)
+            if value is not _MISS:
+                return value
+            flight = self._inflight.get(key)
+            owner = flight is None
+            if owner:
+                flight = self._inflight[key] = _Flight()
+
+        if not owner:
+            flight.event.wait(wait_timeout)
+            return flight.result
+
+        try:
+            flight.result = loader()
+            self.set(key, flight.result, ttl if flight.result is not None else negative_ttl)
+            return flight.result
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.event.set()
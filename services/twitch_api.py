@@ -1,12 +1,29 @@
 import requests
 from datetime import datetime, timezone
 
+from services.helix_client import get_helix_client
+from services.ttl_cache import TTLCache
+from services.user_id_cache import UserIdCache
+
 
 class TwitchAPIService:
     """Wrapper leve da Twitch Helix para dados e ações de moderação."""
-    def __init__(self, config, logger):
+    USER_TTL = 3600
+    USER_NOT_FOUND_TTL = 120
+    STREAM_TTL = 120
+    STREAM_OFFLINE_TTL = 30
+
+    def __init__(self, config, logger, helix=None):
         self.config = config
         self.log = logger
+        self.helix = helix or get_helix_client()
+        self.cache = TTLCache()
+        settings = config.get("settings", {}) if isinstance(config, dict) else {}
+        self.user_ids = UserIdCache(
+            settings.get("user_ids_store_file", "user_ids.json"),
+            max_size=int(settings.get("user_ids_cache_size", 50000)),
+            logger=logger
+        )
 
     def _headers(self):
         return {
@@ -14,107 +31,150 @@ class TwitchAPIService:
             "Client-Id": self.config.get("client_id", "")
         }
 
+    def _fetch_user(self, login: str):
+        r = self.helix.get(
+            "users",
+            params={"login": login},
+            headers=self._headers()
+        )
+        r.raise_for_status()
+        data = r.json().get("data", [])
+        return data[0] if data else None
+
+    def _fetch_stream(self, user_id: str):
+        r = self.helix.get(
+            "streams",
+            params={"user_id": user_id},
+            headers=self._headers()
+        )
+        r.raise_for_status()
+        data = r.json().get("data", [])
+        return data[0] if data else None
+
     def get_user(self, login: str):
+        login = (login or "").lstrip("@").lower()
+        if not login:
+            return None
         try:
-            r = requests.get(
-                "https://api.twitch.tv/helix/users",
-                params={"login": login},
-                headers=self._headers(),
-                timeout=6
+            return self.cache.get_or_load(
+                ("user", login), lambda: self._fetch_user(login),
+                ttl=self.USER_TTL, negative_ttl=self.USER_NOT_FOUND_TTL
             )
-            r.raise_for_status()
-            data = r.json().get("data", [])
-            return data[0] if data else None
         except Exception as e:
             self.log(f"❌ TwitchAPI get_user erro: {e}", "error")
             return None
 
     def get_user_id(self, login: str) -> str | None:
-        try:
-            r = requests.get(
-                "https://api.twitch.tv/helix/users",
-                params={"login": login.lstrip("@")},
-                headers=self._headers(),
-                timeout=6
-            )
-            r.raise_for_status()
-            data = r.json().get("data") or []
-            return data[0].get("id") if data else None
-        except Exception as e:
-            self.log(f"Helix get_user_id erro: {e}", "error")
+        uid = self.user_ids.get(login)
+        if uid:
+            return uid
+        user = self.get_user(login)
+        if not user:
             return None
+        self.user_ids.put(user.get("login") or login, user.get("id"))
+        return user.get("id")
+
+    def remember_user_id(self, login: str, user_id: str):
+        """Registra login -> id vindo da tag `user-id` do IRC."""
+        self.user_ids.put(login, user_id)
+
+    def _target_user_id(self, target_login_or_id: str, action: str) -> str | None:
+        if str(target_login_or_id).isdigit():
+            return str(target_login_or_id)
+        uid = self.get_user_id(str(target_login_or_id))
+        if not uid:
+            self.log(f"{action}: não achei user_id para {target_login_or_id}", "error")
+        return uid
+
+    def close(self):
+        self.user_ids.flush()
 
     def get_stream(self, user_id: str):
+        user_id = str(user_id or "")
+        if not user_id:
+            return None
         try:
-            r = requests.get(
-                "https://api.twitch.tv/helix/streams",
-                params={"user_id": user_id},
-                headers=self._headers(),
-                timeout=6
+            return self.cache.get_or_load(
+                ("stream", user_id), lambda: self._fetch_stream(user_id),
+                ttl=self.STREAM_TTL, negative_ttl=self.STREAM_OFFLINE_TTL
             )
-            r.raise_for_status()
-            data = r.json().get("data", [])
-            return data[0] if data else None
         except Exception as e:
             self.log(f"❌ TwitchAPI get_stream erro: {e}", "error")
             return None
 
+    def invalidate_stream(self, user_id: str = None):
+        """Força nova consulta (ex.: EventSub stream.online/offline)."""
+        if user_id:
+            self.cache.invalidate(("stream", str(user_id)))
+        else:
+            self.cache.invalidate()
+
     def get_uptime_seconds(self, channel_login: str = None, user_id: str = None) -> int:
-        """Retorna uptime em segundos (0 se offline/erro)."""
+        """Retorna uptime em segundos (0 se offline/erro). Calculado localmente a partir do started_at em cache."""
         try:
             uid = user_id
-            if not uid and channel_login:
-                u = self.get_user(channel_login)
-                uid = u.get("id") if u else None
             if not uid and self.config.get("target_channel_id"):
                 uid = str(self.config["target_channel_id"])
+            if not uid and channel_login:
+                uid = self.get_user_id(channel_login)
             if not uid:
                 return 0
 
             stream = self.get_stream(uid)
             if not stream or stream.get("type") != "live":
                 return 0
-            started_at = stream.get("started_at")
-            if not started_at:
-                return 0
+            started = stream.get("_started_dt")
+            if started is None:
+                started_at = stream.get("started_at")
+                if not started_at:
+                    return 0
+                started = datetime.fromisoformat(started_at.replace("Z", "+00:00"))
+                stream["_started_dt"] = started
 
-            dt = datetime.fromisoformat(started_at.replace("Z", "+00:00"))
             now = datetime.now(timezone.utc)
-            return max(0, int((now - dt).total_seconds()))
+            return max(0, int((now - started).total_seconds()))
         except Exception as e:
             self.log(f"❌ TwitchAPI uptime erro: {e}", "error")
             return 0
 
-    def get_chatters(self, broadcaster_id: str, moderator_id: str, first: int = 1000) -> list[str]:
+    def get_chatters(self, broadcaster_id: str, moderator_id: str, first: int = 1000,
+                     max_pages: int = 100) -> list[str]:
         """
         Requer escopo: moderator:read:chatters
-        GET https://api.twitch.tv/helix/chat/chatters?broadcaster_id=...&moderator_id=...&first=...
-        Retorna lista de user_logins.
+        GET https://api.twitch.tv/helix/chat/chatters?broadcaster_id=...&moderator_id=...&first=...&after=...
+        Segue o cursor de paginação até o fim (ou max_pages). Retorna lista de user_logins.
         """
-        url = "https://api.twitch.tv/helix/chat/chatters"
+        url = "chat/chatters"
         params = {
             "broadcaster_id": str(broadcaster_id),
             "moderator_id": str(moderator_id),
-            "first": int(first),
+            "first": max(1, min(int(first), 1000)),
         }
+        logins = []
         try:
-            r = requests.get(url, headers=self._headers(), params=params, timeout=6)
-            if r.status_code == 401 or r.status_code == 403:
-                self.log("❌ Token sem escopo 'moderator:read:chatters' ou bot não é mod no canal.", "error")
-                return []
-            r.raise_for_status()
-            data = r.json()
-            return [item.get('user_login') for item in data.get('data', []) if item.get('user_login')]
+            for _ in range(max(1, int(max_pages))):
+                r = self.helix.get(url, headers=self._headers(), params=params)
+                if r.status_code == 401 or r.status_code == 403:
+                    self.log("❌ Token sem escopo 'moderator:read:chatters' ou bot não é mod no canal.", "error")
+                    return logins
+                r.raise_for_status()
+                data = r.json()
+                logins.extend(item.get('user_login') for item in data.get('data', []) if item.get('user_login'))
+                cursor = (data.get('pagination') or {}).get('cursor')
+                if not cursor:
+                    break
+                params["after"] = cursor
+            return logins
         except requests.exceptions.HTTPError as e:
             code = getattr(e.response, "status_code", None)
             if code == 400:
                 self.log("❌ Erro 400: Parâmetros de API incorretos ao buscar chatters.", "error")
             else:
                 self.log(f"❌ Erro HTTP {code} ao buscar chatters.", "error")
-            return []
+            return logins
         except Exception as e:
             self.log(f"❌ Erro de conexão ao buscar chatters: {e}", "error")
-            return []
+            return logins
 
     def delete_chat_message(self, broadcaster_id: str, moderator_id: str, message_id: str) -> bool:
         """
@@ -122,13 +182,13 @@ class TwitchAPIService:
         DELETE https://api.twitch.tv/helix/moderation/chat?broadcaster_id=...&moderator_id=...&message_id=...
         """
         try:
-            url = "https://api.twitch.tv/helix/moderation/chat"
+            url = "moderation/chat"
             params = {
                 "broadcaster_id": str(broadcaster_id),
                 "moderator_id": str(moderator_id),
                 "message_id": message_id,
             }
-            r = requests.delete(url, headers=self._headers(), params=params, timeout=6)
+            r = self.helix.delete(url, headers=self._headers(), params=params)
             return r.status_code == 204
         except Exception as e:
             self.log(f"Helix delete_chat_message erro: {e}", "error")
@@ -141,15 +201,11 @@ class TwitchAPIService:
         POST /helix/moderation/bans + duration => timeout
         """
         try:
-            target_user_id = target_login_or_id
-            if not str(target_user_id).isdigit():
-                uid = self.get_user_id(str(target_login_or_id))
-                if not uid:
-                    self.log(f"timeout_user: não achei user_id para {target_login_or_id}", "error")
-                    return False
-                target_user_id = uid
-
-            url = "https://api.twitch.tv/helix/moderation/bans"
+            target_user_id = self._target_user_id(target_login_or_id, "timeout_user")
+            if not target_user_id:
+                return False
+
+            url = "moderation/bans"
             params = {
                 "broadcaster_id": str(broadcaster_id),
                 "moderator_id": str(moderator_id),
@@ -161,7 +217,7 @@ class TwitchAPIService:
                     "reason": (reason or "")[:500],
                 }
             }
-            r = requests.post(url, headers=self._headers(), params=params, json=payload, timeout=8)
+            r = self.helix.post(url, headers=self._headers(), params=params, json=payload)
             if r.status_code in (200, 201):
                 return True
             self.log(f"timeout_user falhou: {r.status_code} {r.text}", "error")
@@ -177,21 +233,17 @@ class TwitchAPIService:
         POST /helix/moderation/bans (sem duration) => ban permanente
         """
         try:
-            target_user_id = target_login_or_id
-            if not str(target_user_id).isdigit():
-                uid = self.get_user_id(str(target_login_or_id))
-                if not uid:
-                    self.log(f"ban_user: não achei user_id para {target_login_or_id}", "error")
-                    return False
-                target_user_id = uid
-
-            url = "https://api.twitch.tv/helix/moderation/bans"
+            target_user_id = self._target_user_id(target_login_or_id, "ban_user")
+            if not target_user_id:
+                return False
+
+            url = "moderation/bans"
             params = {
                 "broadcaster_id": str(broadcaster_id),
                 "moderator_id": str(moderator_id),
             }
             payload = {"data": {"user_id": str(target_user_id), "reason": (reason or "")[:500]}}
-            r = requests.post(url, headers=self._headers(), params=params, json=payload, timeout=8)
+            r = self.helix.post(url, headers=self._headers(), params=params, json=payload)
             if r.status_code in (200, 201):
                 return True
             self.log(f"ban_user falhou: {r.status_code} {r.text}", "error")
@@ -206,21 +258,17 @@ class TwitchAPIService:
         DELETE /helix/moderation/bans?broadcaster_id=...&moderator_id=...&user_id=...
         """
         try:
-            target_user_id = target_login_or_id
-            if not str(target_user_id).isdigit():
-                uid = self.get_user_id(str(target_login_or_id))
-                if not uid:
-                    self.log(f"unban_user: não achei user_id para {target_login_or_id}", "error")
-                    return False
-                target_user_id = uid
-
-            url = "https://api.twitch.tv/helix/moderation/bans"
+            target_user_id = self._target_user_id(target_login_or_id, "unban_user")
+            if not target_user_id:
+                return False
+
+            url = "moderation/bans"
             params = {
                 "broadcaster_id": str(broadcaster_id),
                 "moderator_id": str(moderator_id),
                 "user_id": str(target_user_id),
             }
-            r = requests.delete(url, headers=self._headers(), params=params, timeout=6)
+            r = self.helix.delete(url, headers=self._headers(), params=params)
             if r.status_code == 204:
                 return True
             self.log(f"unban_user falhou: {r.status_code} {r.text}", "error")
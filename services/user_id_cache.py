@@ -0,0 +1,81 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+
+
+class UserIdCache:
+    """
+    Mapa login -> user_id (LRU limitado) persistido em user_ids.json.
+    Alimentado pelas tags `user-id` do IRC para evitar /helix/users nas ações de moderação.
+    """
+    def __init__(self, storage_path="user_ids.json", max_size=50000, flush_delay_s=30,
+                 logger=lambda *a, **k: None):
+        self.storage_path = storage_path
+        self.max_size = max_size
+        self.flush_delay_s = flush_delay_s
+        self.log = logger
+        self._lock = threading.Lock()
+        self._data = OrderedDict()
+        self._dirty = False
+        self._flush_timer = None
+        self._load()
+
+    def _load(self):
+        try:
+            if os.path.exists(self.storage_path):
+                with open(self.storage_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    for login, uid in list(data.items())[-self.max_size:]:
+                        self._data[str(login).lower()] = str(uid)
+        except Exception as e:
+            self.log(f"❌ Erro ao carregar {self.storage_path}: {e}", "error")
+            self._data = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, login: str) -> str | None:
+        key = (login or "").lstrip("@").lower()
+        with self._lock:
+            uid = self._data.get(key)
+            if uid is not None:
+                self._data.move_to_end(key)
+            return uid
+
+    def put(self, login: str, user_id):
+        key = (login or "").lstrip("@").lower()
+        uid = str(user_id or "")
+        if not key or not uid.isdigit():
+            return
+        with self._lock:
+            if self._data.get(key) == uid:
+                self._data.move_to_end(key)
+                return
+            self._data[key] = uid
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+            self._dirty = True
+            if self._flush_timer is None and self.flush_delay_s > 0:
+                self._flush_timer = threading.Timer(self.flush_delay_s, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def flush(self):
+        """Grava em disco (tmp + rename) se houver alterações pendentes."""
+        with self._lock:
+            self._flush_timer = None
+            if not self._dirty:
+                return
+            snapshot = dict(self._data)
+            self._dirty = False
+        tmp = f"{self.storage_path}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, ensure_ascii=False)
+            os.replace(tmp, self.storage_path)
+        except Exception as e:
+            self._dirty = True
+            self.log(f"❌ Erro ao salvar {self.storage_path}: {e}", "error")
@@ -1,12 +1,16 @@
-
-import json
-import os
-import re
 from datetime import datetime, timezone
 
+from services.response_template import TemplateCache
+from services.storage import JsonStore
+
 _HUMAN = ((365*24*3600, "ano"), (30*24*3600, "mês"), (7*24*3600, "semana"),
           (24*3600, "dia"), (3600, "hora"), (60, "min"), (1, "s"))
 
+# Custo de cada variável: o resolver chama primeiro as locais e só depois cache/rede.
+COST_LOCAL = 0
+COST_CACHED = 1
+COST_NETWORK = 2
+
 def humanize_seconds(total):
     total = int(total or 0)
     if total <= 0:
@@ -21,47 +25,82 @@ def humanize_seconds(total):
     return " ".join(parts)
 
 class VariableResolver:
-    """Resolves placeholders like {user}, {watchtime}, {followage}, {points}, {uptime} etc."""
-    VAR_RE = re.compile(r"\{([a-zA-Z0-9_]+)\}")
+    """
+    Resolves placeholders like {user}, {watchtime}, {followage}, {points}, {uptime} etc.
+    Cada variável é um provider registrado com seu custo (local, cache ou rede);
+    só os placeholders presentes no template compilado são resolvidos.
+    """
 
-    def __init__(self, config, points_service=None, twitch_api=None, users_path="users.json"):
+    def __init__(self, config, points_service=None, twitch_api=None, users_path="users.json",
+                 templates=None, logger=lambda *a, **k: None, users_store=None):
         self.config = config
         self.points = points_service
         self.api = twitch_api
         self.users_path = users_path
-        self._users = self._load_users()
+        self.log = logger
+        self.templates = templates or TemplateCache()
+        self._providers = {}
+        self.users = users_store or JsonStore(users_path, logger, indent=2)
+        self._register_defaults()
 
-    def _load_users(self):
-        p = self.users_path
-        try:
-            if not os.path.exists(p):
-                return {}
-            with open(p, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception:
-            return {}
+    def _register_defaults(self):
+        self.register("user", lambda ctx: ctx.get("user"))
+        self.register("channel", lambda ctx: self.config.get("channel", ""))
+        self.register("watchtime", lambda ctx: self.get_watchtime(ctx["user"], True) if ctx.get("user") else None)
+        self.register("watchtime_raw", lambda ctx: self.get_watchtime(ctx["user"], False) if ctx.get("user") else None)
+        self.register("followage", lambda ctx: self.get_followage(ctx["user"]) if ctx.get("user") else None)
+        self.register("points", self._points_provider, COST_CACHED)
+        self.register("balance", self._points_provider, COST_CACHED)
+        self.register("uptime", self._uptime_provider, COST_NETWORK)
+
+    def register(self, name, provider, cost=COST_LOCAL):
+        """provider(ctx) -> valor; ctx traz 'user' e o contexto da chamada. None = não resolvido."""
+        self._providers[name.lower()] = (cost, provider)
+
+    def unregister(self, name):
+        self._providers.pop(name.lower(), None)
+
+    def _points_provider(self, ctx):
+        if self.points and ctx.get("user"):
+            return self.points.get(ctx["user"])
+        return 0
+
+    def _uptime_provider(self, ctx):
+        if not self.api:
+            return "0s"
+        secs = self.api.get_uptime_seconds(
+            channel_login=self.config.get("channel", ""),
+            user_id=str(self.config.get("target_channel_id", "") or "")
+        )
+        return humanize_seconds(secs)
 
     def save_users(self):
         try:
-            with open(self.users_path, "w", encoding="utf-8") as f:
-                json.dump(self._users, f, ensure_ascii=False, indent=2)
+            self.users.flush()
         except Exception:
             pass
 
     def ensure_user(self, username):
-        u = self._users.get(username.lower())
+        key = username.lower()
+        u = self.users.get(key)
         if not u:
             u = {"watchtime": 0, "followed_at": None}
-            self._users[username.lower()] = u
+            self.users.put(key, u)
+        return u
+
+    def update_user(self, username, **fields):
+        u = dict(self.ensure_user(username))
+        u.update(fields)
+        self.users.put(username.lower(), u)
         return u
 
     def get_watchtime(self, username, human=True):
-        u = self.ensure_user(username)
+        u = self.users.get(username.lower()) or {}
         wt = int(u.get("watchtime", 0) or 0)
         return humanize_seconds(wt) if human else wt
 
     def get_followage(self, username):
-        u = self.ensure_user(username)
+        u = self.users.get(username.lower()) or {}
         fa = u.get("followed_at")
         if not fa:
             return "0s"
@@ -72,23 +111,55 @@ class VariableResolver:
         except Exception:
             return "0s"
 
-    def format(self, text, username, extra=None):
+    def resolve(self, fields, ctx, extra=None):
+        """
+        Retorna {campo: valor} só para `fields`. Valores de `extra` têm prioridade;
+        os demais vêm dos providers, em ordem de custo (local -> cache -> rede).
+        """
         extra = extra or {}
-        def repl(m):
-            key = m.group(1).lower()
-            if key == "user": return username
-            if key == "channel": return self.config.get("channel", "")
-            if key == "watchtime": return str(self.get_watchtime(username, True))
-            if key == "watchtime_raw": return str(self.get_watchtime(username, False))
-            if key == "followage": return str(self.get_followage(username))
-            if key == "points" or key == "balance": 
-                if self.points: 
-                    return str(self.points.get_balance(username))
-                return "0"
-            if key == "uptime":
-                if self.api: 
-                    secs = self.api.get_uptime_seconds()
-                    return humanize_seconds(secs)
-                return "0s"
-            return str(extra.get(key, m.group(0)))
-        return self.VAR_RE.sub(repl, text)
+        values = {}
+        pending = []
+        for name in fields:
+            if name in extra:
+                values[name] = extra[name]
+                continue
+            key = name.lower()
+            if key in extra:
+                values[name] = extra[key]
+                continue
+            entry = self._providers.get(key)
+            if entry is not None:
+                pending.append((entry[0], name, entry[1]))
+
+        pending.sort(key=lambda p: p[0])
+        for _, name, provider in pending:
+            try:
+                value = provider(ctx)
+            except Exception as e:
+                self.log(f"⚠️ Variável {{{name}}} falhou: {e}", "warning")
+                continue
+            if value is not None:
+                values[name] = value
+        return values
+
+    def render(self, text, username=None, extra=None, counts=None, strict=False, ctx=None):
+        """
+        Renderiza `text` (string ou CompiledTemplate) e retorna (texto, updates_de_contadores).
+        strict=True levanta KeyError para placeholder desconhecido; senão ele é mantido.
+        """
+        tpl = self.templates.get(text) if isinstance(text, str) else text
+        if tpl.error is not None:
+            raise tpl.error
+        call_ctx = {"user": username}
+        if ctx:
+            call_ctx.update(ctx)
+        values = self.resolve(tpl.fields, call_ctx, extra)
+        return tpl.render(values, counts, keep_missing=not strict)
+
+    def format(self, text, username=None, extra=None):
+        try:
+            out, _ = self.render(text, username, extra,
+                                 counts=self.config.get("settings", {}).get("counts", {}))
+            return out
+        except ValueError:
+            return text
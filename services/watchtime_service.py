@@ -0,0 +1,110 @@
+import threading
+import time
+
+
+class WatchtimeService:
+    """
+    Acúmulo passivo de watchtime: a cada `watchtime_interval_s` tira um retrato de quem está
+    presente (roster do bot, que já inclui quem falou, ou chatters da Helix) e credita o tempo
+    decorrido a todos de uma vez (um get_many + um put_many no store de usuários).
+    Opcionalmente também credita pontos passivos (points_passive_per_min) num único add_many.
+    """
+    MAX_ELAPSED_FACTOR = 2
+
+    def __init__(self, twitch_api, users_store, points_service, get_settings, config,
+                 logger=lambda *a, **k: None, clock=time.monotonic, present_source=None):
+        self.api = twitch_api
+        self.users = users_store
+        self.points = points_service
+        self._get_settings = get_settings
+        self.config = config
+        self.log = logger
+        self._clock = clock
+        self._last_tick = None
+        self._carry = {}
+        self._stop = threading.Event()
+        self._thread = None
+        self.present_source = present_source
+        self.last_present_count = 0
+
+    def _interval(self):
+        return max(10, int((self._get_settings() or {}).get("watchtime_interval_s", 60) or 60))
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._last_tick = self._clock()
+            self._thread = threading.Thread(target=self._loop, name="watchtime", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(2)
+            self._thread = None
+
+    def _present_users(self):
+        """Conjunto de logins presentes: roster do bot ou Helix (paginado)."""
+        if self.present_source is not None:
+            present = set(self.present_source())
+        else:
+            present = set(u.lower() for u in self.api.get_chatters(
+                str(self.config.get("target_channel_id", "")),
+                str(self.config.get("bot_user_id", ""))
+            ))
+        present.discard(str(self.config.get("bot_user_name", "")).lower())
+        present.discard("")
+        return present
+
+    def _is_live(self):
+        return self.api.get_uptime_seconds(
+            channel_login=self.config.get("channel", ""),
+            user_id=str(self.config.get("target_channel_id", "") or "")
+        ) > 0
+
+    def tick(self):
+        ps = self._get_settings() or {}
+        now = self._clock()
+        interval = self._interval()
+        elapsed = now - (self._last_tick if self._last_tick is not None else now - interval)
+        self._last_tick = now
+        elapsed = int(min(elapsed, interval * self.MAX_ELAPSED_FACTOR))
+        if elapsed <= 0 or not ps.get("watchtime_enabled", True):
+            return 0
+        if ps.get("watchtime_only_live", True) and not self._is_live():
+            return 0
+
+        present = self._present_users()
+        self.last_present_count = len(present)
+        if not present:
+            return 0
+
+        current = self.users.get_many(present)
+        updates = {}
+        for u in present:
+            rec = current.get(u)
+            rec = dict(rec) if rec else {"watchtime": 0, "followed_at": None}
+            rec["watchtime"] = int(rec.get("watchtime", 0) or 0) + elapsed
+            updates[u] = rec
+        self.users.put_many(updates)
+
+        per_min = int(ps.get("points_passive_per_min", 0) or 0)
+        if ps.get("points_enabled", False) and ps.get("points_passive_enabled", False) and per_min > 0:
+            # fração de ponto (pontos*segundos que não fecharam um minuto) fica guardada por usuário
+            credits = {}
+            carry = {}
+            for u in present:
+                amount, carry[u] = divmod(per_min * elapsed + self._carry.get(u, 0), 60)
+                if amount > 0:
+                    credits[u] = amount
+            self._carry = carry
+            if credits:
+                self.points.add_many(credits)
+        return len(present)
+
+    def _loop(self):
+        while not self._stop.wait(self._interval()):
+            try:
+                self.tick()
+            except Exception as e:
+                self.log(f"⚠️ watchtime: {e}", "warning")
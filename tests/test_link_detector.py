@@ -0,0 +1,52 @@
+import re
+
+import pytest
+
+from services.link_detector import LinkDetector
+
+# regex que o LinkDetector substituiu (mesmo de benchmarks/bench_link_detector.py)
+OLD_LINK_RE = re.compile(
+    r"(https?://|www\.)[^\s]+|([a-z0-9-]+\.)+(com|net|org|gg|io|tv)(/[^\s]*)?",
+    re.I
+)
+
+SAME_AS_OLD_REGEX = [
+    "entra no meusite.com.br/promo agora",
+    "meusite.com.br",
+    "site.com.br/promo",
+    "http://localhost/",
+    "https://localhost",
+    "olha isso https://clips.twitch.tv/AbcDef123 muito bom",
+    "www.exemplo",
+    "loja.store.com",
+    "sub.dominio.gg/x",
+    "kkkkk que jogada absurda, GG demais",
+    "fim de frase. outra frase",
+    "http://",
+    "versão 1.2.3",
+]
+
+
+@pytest.mark.parametrize("text", SAME_AS_OLD_REGEX)
+def test_matches_old_regex(text):
+    assert bool(LinkDetector().find(text)) == bool(OLD_LINK_RE.search(text))
+
+
+@pytest.mark.parametrize("text", ["bem.me", "vamos.de", "fui.to", "isso.es"])
+def test_portuguese_without_space_is_not_a_link(text):
+    assert LinkDetector().find(text) is None
+
+
+def test_explicit_scheme_host_is_always_a_link():
+    assert LinkDetector().classify("http://localhost/") == "localhost"
+    assert LinkDetector().classify("https://intranet:8080/x") == "intranet"
+
+
+def test_multi_label_suffix_keeps_full_host():
+    assert LinkDetector().classify("meusite.com.br") == "meusite.com.br"
+
+
+def test_allow_and_deny_lists():
+    detector = LinkDetector(allow_domains=["twitch.tv"], deny_domains=["spam.xyz"])
+    assert detector.find("https://clips.twitch.tv/abc") is None
+    assert detector.classify("promo.spam.xyz") == "promo.spam.xyz"
@@ -0,0 +1,56 @@
+from services.outgoing_queue import OutgoingQueue, PRIORITY_COMMAND
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _drive(queue, clock, step=0.25, until=60.0):
+    """Roda o writer com o relógio falso; retorna os horários de envio."""
+    sent = []
+    while clock.now <= until:
+        with queue._cond:
+            item, wait = queue._poll()
+        if item is not None:
+            sent.append(clock.now)
+            continue
+        if wait is None:
+            break
+        clock.now += min(wait, step)
+    return sent
+
+
+def _max_in_window(times, window_s):
+    return max(sum(1 for t in times if start <= t < start + window_s) for start in times)
+
+
+def test_no_window_exceeds_limit():
+    clock = FakeClock()
+    queue = OutgoingQueue(lambda text: None, limit=20, window_s=3.0, clock=clock)
+    for i in range(100):
+        assert queue.submit(f"msg {i}", priority=PRIORITY_COMMAND)
+
+    sent = _drive(queue, clock)
+
+    assert len(sent) == 100
+    assert sum(1 for t in sent if t < 3.0) == 20
+    assert _max_in_window(sent, 3.0) <= 20
+
+
+def test_raising_limit_keeps_sends_already_in_window():
+    clock = FakeClock()
+    queue = OutgoingQueue(lambda text: None, limit=20, window_s=30.0, clock=clock)
+    for i in range(100):
+        queue.submit(f"msg {i}")
+
+    first = _drive(queue, clock, until=10.0)
+    queue.set_limit(100)
+    rest = _drive(queue, clock)
+
+    assert len(first) == 20
+    assert len(first) + len(rest) == 100
+    assert _max_in_window(first + rest, 30.0) <= 100
@@ -0,0 +1,70 @@
+import json
+import os
+
+from services.storage import JsonStore, SQLiteStore, open_store
+
+
+def _write_lines(path, records, tail=""):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("".join(json.dumps(r) + "\n" for r in records) + tail)
+
+
+def test_replays_uncompacted_journal(tmp_path):
+    path = str(tmp_path / "points.json")
+    store = JsonStore(path, flush_interval_s=0)
+    store.put_many({"alice": 10, "bob": 5})
+    store.delete("bob")
+    store.put("carol", 7)
+    # sem flush/close: simula queda com tudo ainda no journal
+    assert os.path.exists(path + ".journal")
+    assert not os.path.exists(path)
+
+    reopened = JsonStore(path, flush_interval_s=0)
+    assert dict(reopened.items()) == {"alice": 10, "carol": 7}
+
+    reopened.close()
+    assert not os.path.exists(path + ".journal")
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f) == {"alice": 10, "carol": 7}
+
+
+def test_recovers_leftover_compacting_file(tmp_path):
+    path = str(tmp_path / "points.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"alice": 1, "bob": 1}, f)
+    # compactação interrompida antes de gravar o snapshot + journal novo com linha truncada
+    _write_lines(path + ".journal.compacting", [{"k": "alice", "v": 2}, {"k": "carol", "v": 3}])
+    _write_lines(path + ".journal", [{"k": "carol", "v": 4}, {"k": "bob", "d": 1}], tail='{"k": "dave", "v"')
+
+    store = JsonStore(path, flush_interval_s=0)
+    assert dict(store.items()) == {"alice": 2, "carol": 4}
+
+    store.flush()
+    assert not os.path.exists(path + ".journal.compacting")
+    assert not os.path.exists(path + ".journal")
+    assert dict(JsonStore(path, flush_interval_s=0).items()) == {"alice": 2, "carol": 4}
+
+
+def test_migrates_json_to_empty_sqlite_once(tmp_path):
+    json_path = str(tmp_path / "points.json")
+    db = str(tmp_path / "livechatbot.db")
+    settings = {"storage_backend": "sqlite", "storage_db_file": db}
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump({"alice": 10}, f)
+    _write_lines(json_path + ".journal", [{"k": "bob", "v": 3}])
+
+    store = open_store(settings, "points", json_path)
+    assert isinstance(store, SQLiteStore)
+    assert dict(store.items()) == {"alice": 10, "bob": 3}
+    assert not os.path.exists(json_path)
+    assert os.path.exists(json_path + ".migrated")
+    assert os.path.exists(json_path + ".journal.migrated")
+    store.close()
+
+    # segunda abertura: o store já tem dados, um JSON que reapareça não é importado nem renomeado
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump({"alice": 999, "eve": 1}, f)
+    store = open_store(settings, "points", json_path)
+    assert dict(store.items()) == {"alice": 10, "bob": 3}
+    assert os.path.exists(json_path)
+    store.close()
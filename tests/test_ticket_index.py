@@ -0,0 +1,76 @@
+import random
+
+from services.ticket_index import TicketIndex
+
+
+class FixedRng:
+    """randrange devolve o alvo escolhido pelo teste."""
+    def __init__(self, target):
+        self.target = target
+
+    def randrange(self, n):
+        assert 0 <= self.target < n
+        return self.target
+
+
+def _expected(counts, target):
+    # busca linear na soma cumulativa, na ordem de inserção
+    for user, n in counts:
+        if target < n:
+            return user
+        target -= n
+    raise AssertionError("alvo fora do total")
+
+
+def _draws(index):
+    return [index.draw(FixedRng(t)) for t in range(index.total)]
+
+
+def test_cumulative_weight_boundaries():
+    index = TicketIndex({"a": 1, "b": 2, "c": 7})
+    assert _draws(index) == ["a"] + ["b"] * 2 + ["c"] * 7
+
+
+def test_incremental_adds_match_bulk_load():
+    rng = random.Random(1234)
+    counts = {f"u{i}": rng.randint(1, 5) for i in range(37)}
+    bulk = TicketIndex(counts)
+    incremental = TicketIndex()
+    for user, n in counts.items():
+        incremental.add(user, n)
+    assert incremental.total == bulk.total == sum(counts.values())
+    assert _draws(incremental) == _draws(bulk) == [_expected(list(counts.items()), t) for t in range(bulk.total)]
+
+
+def test_zero_weight_users_are_never_drawn():
+    index = TicketIndex({"a": 3, "zero": 0, "b": 2})
+    index.add("gone", 4)
+    index.add("gone", -4)
+    index.add("b", -10)
+    assert index.tickets_of("b") == 0
+    assert set(_draws(index)) == {"a"}
+    assert index.items() == [("a", 3)]
+
+
+def test_draw_after_removal_uses_remaining_weights():
+    rng = random.Random(42)
+    index = TicketIndex()
+    counts = {}
+    for i in range(50):
+        user = f"u{i}"
+        counts[user] = rng.randint(1, 6)
+        index.add(user, counts[user])
+    for user in rng.sample(sorted(counts), 20):
+        n = rng.randint(1, counts[user])
+        index.add(user, -n)
+        counts[user] -= n
+
+    order = [(u, counts[u]) for u in (f"u{i}" for i in range(50))]
+    assert index.total == sum(counts.values())
+    assert _draws(index) == [_expected(order, t) for t in range(index.total)]
+
+
+def test_empty_index_draws_none():
+    index = TicketIndex({"a": 1})
+    index.add("a", -1)
+    assert index.draw(random.Random(0)) is None
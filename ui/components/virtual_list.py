@@ -0,0 +1,226 @@
+import customtkinter as ctk
+from bisect import bisect_left, insort
+from typing import Callable, Optional
+
+
+class SortedRows:
+    """
+    Índice ordenado (chave -> valor) para listas grandes: lista de (sort_key, chave) mantida
+    com bisect, então inserir/atualizar/remover custa uma busca binária + um memmove,
+    sem reordenar tudo a cada mudança.
+    """
+    def __init__(self, sort_key: Callable = lambda key, value: (-value, key.lower())):
+        self._sort_key = sort_key
+        self._values = {}
+        self._order = []
+
+    def __len__(self):
+        return len(self._order)
+
+    def __contains__(self, key):
+        return key in self._values
+
+    def get(self, key, default=None):
+        return self._values.get(key, default)
+
+    def _unlink(self, key):
+        sk = (self._sort_key(key, self._values[key]), key)
+        i = bisect_left(self._order, sk)
+        if i < len(self._order) and self._order[i] == sk:
+            del self._order[i]
+
+    def upsert(self, key, value) -> bool:
+        """Insere ou atualiza; retorna False se nada mudou."""
+        old = self._values.get(key)
+        if old is not None:
+            if old == value:
+                return False
+            self._unlink(key)
+        self._values[key] = value
+        insort(self._order, (self._sort_key(key, value), key))
+        return True
+
+    def remove(self, key) -> bool:
+        if key not in self._values:
+            return False
+        self._unlink(key)
+        del self._values[key]
+        return True
+
+    def clear(self):
+        self._values.clear()
+        self._order.clear()
+
+    def sync(self, mapping: dict) -> int:
+        """Aplica o estado completo `mapping` como diff. Retorna quantas linhas mudaram."""
+        changed = 0
+        for key in [k for k in self._values if k not in mapping]:
+            self.remove(key)
+            changed += 1
+        if not self._order and mapping:
+            self._values = dict(mapping)
+            self._order = sorted((self._sort_key(k, v), k) for k, v in mapping.items())
+            return changed + len(mapping)
+        for key, value in mapping.items():
+            if self.upsert(key, value):
+                changed += 1
+        return changed
+
+    def keys(self, query: str = ""):
+        """Chaves na ordem do índice, opcionalmente filtradas por substring (sem caixa)."""
+        if not query:
+            return [k for _, k in self._order]
+        q = query.casefold()
+        return [k for _, k in self._order if q in k.casefold()]
+
+
+class VirtualList(ctk.CTkFrame):
+    """
+    Lista virtualizada: só existem widgets para as linhas visíveis (um pool reaproveitado);
+    rolar ou atualizar dados apenas reconfigura o texto dessas linhas.
+    - make_row(parent) cria uma linha; fill_row(row, key, value) preenche.
+    - upsert/remove/sync alteram o índice e agendam um único redesenho (after_idle).
+    - set_filter(texto) filtra por substring na chave.
+    """
+    def __init__(
+        self,
+        master,
+        make_row: Callable,
+        fill_row: Callable,
+        *,
+        row_height: int = 30,
+        sort_key: Optional[Callable] = None,
+        empty_text: str = "",
+        **kwargs
+    ):
+        super().__init__(master, **kwargs)
+        self.rows = SortedRows(sort_key) if sort_key else SortedRows()
+        self._make_row = make_row
+        self._fill_row = fill_row
+        self.row_height = row_height
+        self._query = ""
+        self._view = None
+        self._offset = 0
+        self._pool = []
+        self._render_pending = False
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+        self._body = ctk.CTkFrame(self, fg_color="transparent")
+        self._body.grid(row=0, column=0, sticky="nsew")
+        self._scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self._scrollbar.grid(row=0, column=1, sticky="ns")
+        self._empty = ctk.CTkLabel(self._body, text=empty_text)
+
+        self._body.bind("<Configure>", lambda _e: self._schedule_render(), add="+")
+        self._bind_wheel(self._body)
+
+    # ---------- dados ----------
+    def upsert(self, key, value):
+        if self.rows.upsert(key, value):
+            self._invalidate()
+
+    def remove(self, key):
+        if self.rows.remove(key):
+            self._invalidate()
+
+    def clear(self):
+        self.rows.clear()
+        self._offset = 0
+        self._invalidate()
+
+    def sync(self, mapping: dict):
+        if self.rows.sync(mapping):
+            self._invalidate()
+
+    def set_filter(self, query: str):
+        query = (query or "").strip()
+        if query != self._query:
+            self._query = query
+            self._offset = 0
+            self._invalidate()
+
+    def _invalidate(self):
+        self._view = None
+        self._schedule_render()
+
+    # ---------- rolagem ----------
+    def _bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", self._on_wheel, add="+")
+        widget.bind("<Button-4>", lambda _e: self.scroll_by(-3), add="+")
+        widget.bind("<Button-5>", lambda _e: self.scroll_by(3), add="+")
+
+    def _on_wheel(self, event):
+        step = -1 if event.delta > 0 else 1
+        self.scroll_by(step * max(1, abs(event.delta) // 120) * 3)
+
+    def _on_scrollbar(self, *args):
+        total = len(self._current_view())
+        if not args:
+            return
+        if args[0] == "moveto":
+            self._set_offset(int(float(args[1]) * total))
+        elif args[0] == "scroll":
+            n = int(args[1])
+            self.scroll_by(n * self._capacity() if args[2] == "pages" else n)
+
+    def scroll_by(self, n: int):
+        self._set_offset(self._offset + n)
+
+    def _set_offset(self, offset: int):
+        max_offset = max(0, len(self._current_view()) - self._capacity())
+        offset = min(max(0, offset), max_offset)
+        if offset != self._offset:
+            self._offset = offset
+            self._schedule_render()
+
+    # ---------- render ----------
+    def _current_view(self):
+        if self._view is None:
+            self._view = self.rows.keys(self._query)
+        return self._view
+
+    def _capacity(self):
+        height = self._body.winfo_height()
+        return max(1, height // self.row_height + 1) if height > 1 else 10
+
+    def _schedule_render(self):
+        if not self._render_pending:
+            self._render_pending = True
+            self.after_idle(self._render)
+
+    def _render(self):
+        self._render_pending = False
+        view = self._current_view()
+        cap = self._capacity()
+        self._offset = min(self._offset, max(0, len(view) - cap))
+
+        while len(self._pool) < min(cap, len(view)):
+            row = self._make_row(self._body)
+            row.configure(height=self.row_height)
+            row._vl_item = None
+            self._bind_wheel(row)
+            for child in row.winfo_children():
+                self._bind_wheel(child)
+            self._pool.append(row)
+
+        for i, row in enumerate(self._pool):
+            idx = self._offset + i
+            if i < cap and idx < len(view):
+                key = view[idx]
+                item = (key, self.rows.get(key))
+                if row._vl_item != item:
+                    self._fill_row(row, *item)
+                    row._vl_item = item
+                row.place(x=0, y=i * self.row_height, relwidth=1)
+            else:
+                row.place_forget()
+
+        if view:
+            self._empty.place_forget()
+            first = self._offset / len(view)
+            last = min(1.0, (self._offset + cap) / len(view))
+        else:
+            self._empty.place(x=8, y=8)
+            first, last = 0.0, 1.0
+        self._scrollbar.set(first, last)
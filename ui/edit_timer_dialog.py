@@ -2,6 +2,7 @@ from datetime import datetime
 import tkinter as tk
 import customtkinter as ctk
 
+from services.timer_scheduler import TimerScheduler
 from ui.custom_dialog import CustomDialog
 
 class EditTimerDialog(ctk.CTkToplevel):
@@ -64,9 +65,9 @@ class EditTimerDialog(ctk.CTkToplevel):
         interval_frame.grid_columnconfigure(1, weight=1)
         interval_frame.grid_columnconfigure(3, weight=1)
 
-        ctk.CTkLabel(interval_frame, text="Intervalo (min):", font=ctk.CTkFont(size=12)).grid(
+        ctk.CTkLabel(interval_frame, text="Intervalo (min ou 45s):", font=ctk.CTkFont(size=12)).grid(
             row=0, column=0, sticky="w", padx=(0, 10))
-        self.interval_var = tk.StringVar(value=str(timer_config.get("interval_min", 15)))
+        self.interval_var = tk.StringVar(value=TimerScheduler.format_interval(timer_config, compact=True))
         self.interval_entry = ctk.CTkEntry(
             interval_frame, textvariable=self.interval_var,
             fg_color=self.colors['surface_light'], border_color=self.colors['twitch_purple']
@@ -113,11 +114,13 @@ class EditTimerDialog(ctk.CTkToplevel):
         new_name = self.name_var.get().strip()
         new_message = self.message_var.get().strip()
         
+        new_interval = TimerScheduler.parse_interval(self.interval_var.get())
         try:
-            new_interval = int(self.interval_var.get())
             new_lines = int(self.lines_var.get())
         except ValueError:
-            CustomDialog(self, "Erro", "Intervalo e Linhas Mínimas devem ser números inteiros!", self.app.colors, 'error').wait_window()
+            new_lines = None
+        if new_interval is None or new_lines is None:
+            CustomDialog(self, "Erro", f"Intervalo (ex.: 15, 90s, 1m30s; mínimo {TimerScheduler.MIN_INTERVAL_S}s) e Linhas Mínimas devem ser números inteiros!", self.app.colors, 'error').wait_window()
             return
             
         if not new_name or not new_message:
@@ -128,13 +131,14 @@ class EditTimerDialog(ctk.CTkToplevel):
             CustomDialog(self, "Erro", f"O nome de timer '{new_name}' já existe!", self.app.colors, 'error').wait_window()
             return
         
-        new_config = {
-            "message": new_message,
-            "interval_min": new_interval,
-            "min_lines": new_lines,
-            "enabled": self.timer_config.get('enabled', True),
-            "last_run": self.timer_config.get('last_run', datetime.now())
-        }
+        # parte da config atual para manter as chaves de execução (line_mark, last_run...)
+        new_config = dict(self.timer_config)
+        new_config.pop("interval_s", None)
+        new_config.update(TimerScheduler.interval_fields(new_interval))
+        new_config["message"] = new_message
+        new_config["min_lines"] = new_lines
+        new_config.setdefault("enabled", True)
+        new_config.setdefault("last_run", datetime.now())
 
         target_dict = self.app.timers
         
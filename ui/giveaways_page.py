@@ -1,9 +1,10 @@
 import tkinter as tk
 import customtkinter as ctk
-from collections import Counter
 from datetime import datetime, timezone
 from services.giveaway_service import GiveawayService
+from services.event_bus import ChatMessage, GiveawayChanged, GiveawayWinner, COALESCE
 from ui.components.tooltip import attach_tooltip
+from ui.components.virtual_list import VirtualList
 from ui.toast_notification import ToastNotification
 from ui.custom_dialog import CustomDialog
 
@@ -14,10 +15,7 @@ class GiveawaysPage(ctk.CTkFrame):
         self.app = app
         self.grid(row=0, column=0, sticky="nsew")
 
-        self.service = GiveawayService(
-            storage_path=app.settings.get('giveaways_store_file', 'giveaways.json'),
-            logger=app.log_message
-        )
+        self.service = GiveawayService.from_settings(app.settings, app.log_message)
         self._winner = None
         root_card = ctk.CTkScrollableFrame(self, fg_color=app.colors['surface'], corner_radius=16)
         root_card.pack(fill=tk.BOTH, expand=True, padx=12, pady=(12, 5))
@@ -318,10 +316,21 @@ class GiveawaysPage(ctk.CTkFrame):
             text_color=self.app.colors['text_secondary']
         ).pack(anchor="w", padx=10, pady=(8, 0))
         ctk.CTkFrame(left_card, fg_color=self.app.colors['surface'], height=1).pack(fill=tk.X, padx=8, pady=(6, 4))
-        self.participants_box = ctk.CTkScrollableFrame(
-            left_card, fg_color="transparent", corner_radius=10, height=240
+        self._participants_filter = tk.StringVar(value="")
+        ctk.CTkEntry(
+            left_card, textvariable=self._participants_filter, placeholder_text="🔎 Buscar participante",
+            height=28, corner_radius=8
+        ).pack(fill=tk.X, padx=8, pady=(0, 4))
+        self.participants_box = VirtualList(
+            left_card, self._make_participant_row, self._fill_participant_row,
+            row_height=30, empty_text="Sem participantes ainda.",
+            fg_color="transparent", corner_radius=10, height=240
         )
         self.participants_box.pack(fill=tk.BOTH, expand=True, padx=8, pady=(0, 8))
+        self._participants_filter.trace_add(
+            "write", lambda *_: self.participants_box.set_filter(self._participants_filter.get())
+        )
+        self._history_sig = None
 
         right_card = ctk.CTkFrame(duo, fg_color=self.app.colors['surface_dark'], corner_radius=10)
         right_card.grid(row=0, column=1, sticky="nsew", padx=(6, 0), pady=4)
@@ -343,9 +352,18 @@ class GiveawaysPage(ctk.CTkFrame):
         )
         self.history_box.pack(fill=tk.BOTH, expand=True, padx=6, pady=(6, 2))
 
-        self._force_reload_from_disk()
         self._refresh_ui()
 
+        bus = getattr(app, "bus", None)
+        if bus is not None:
+            # só as falas do vencedor entram na fila; refresh repetido vira um só
+            bus.subscribe(
+                ChatMessage, lambda e: self.feed_chat(e.user, e.message), maxsize=200,
+                where=lambda e: bool(self._winner) and e.user.lower() == self._winner.lower()
+            )
+            bus.subscribe(GiveawayChanged, lambda e: self.refresh_from_bot(), policy=COALESCE)
+            bus.subscribe(GiveawayWinner, lambda e: self.set_winner_from_bot(e.winner), policy=COALESCE)
+
     def feed_chat(self, user: str, message: str):
         if not self._winner:
             return
@@ -448,11 +466,6 @@ class GiveawaysPage(ctk.CTkFrame):
             join_cmd = (self.app.settings.get("giveaways_cmd_join", "!sorteio") or "!sorteio").strip()
 
             if hasattr(self.app, "bot") and self.app.bot:
-                if hasattr(self.app.bot, "_reload_giveaways"):
-                    self.app.bot._reload_giveaways()
-                if hasattr(self.app.bot, "_notify_giveaways"):
-                    self.app.bot._notify_giveaways(refresh=True)
-
                 if self.app.bot.connected:
                     base = f"🎁 Sorteio criado: {title} | Digite {join_cmd} para participar!"
                     lim_user = f" (máximo de {max_per_user} entradas)" if max_per_user > 0 else ""
@@ -500,7 +513,6 @@ class GiveawaysPage(ctk.CTkFrame):
             pass
 
         self._set_create_controls_enabled(False)
-        self._force_reload_from_disk()
         self._refresh_ui()
 
     def _end(self):
@@ -517,7 +529,6 @@ class GiveawaysPage(ctk.CTkFrame):
                     self._winner = None
                     self._set_winner_chat_hint()
                     self._set_create_controls_enabled(True)
-                    self._force_reload_from_disk()
                     self._refresh_ui()
 
             CustomDialog(
@@ -538,7 +549,6 @@ class GiveawaysPage(ctk.CTkFrame):
         self._winner = None
         self._set_winner_chat_hint()
         self._set_create_controls_enabled(True)
-        self._force_reload_from_disk()
         self._refresh_ui()
 
     def _draw_winner(self):
@@ -590,7 +600,6 @@ class GiveawaysPage(ctk.CTkFrame):
         else:
             ToastNotification(self, "Sem participantes ainda.")
 
-        self._force_reload_from_disk()
         self._refresh_ui()
 
     def _redraw_winner(self):
@@ -659,29 +668,18 @@ class GiveawaysPage(ctk.CTkFrame):
         self.badge_unique.configure(text=f"👤 {unique_count}")
         self.badge_tickets.configure(text=f"🎟️ {total_tickets}")
 
-        for w in list(self.participants_box.winfo_children()):
-            w.destroy()
         if cur and cur.get("entrants"):
-            counts = Counter(cur["entrants"])
-            for user, tickets in sorted(counts.items(), key=lambda x: (-x[1], x[0].lower())):
-                row = ctk.CTkFrame(self.participants_box, fg_color="transparent")
-                row.pack(fill=tk.X, padx=8, pady=3)
-                name = ctk.CTkLabel(row, text=f"@{user}", font=ctk.CTkFont(size=12, weight="bold"))
-                name.pack(side=tk.LEFT)
-                pill = ctk.CTkLabel(
-                    row, text=f"{tickets} ticket(s)",
-                    font=ctk.CTkFont(size=11, weight="bold"),
-                    text_color="white",
-                    fg_color=self.app.colors.get('twitch_purple_light', '#8b5cf6'),
-                    corner_radius=999, padx=8, pady=2
-                )
-                pill.pack(side=tk.RIGHT)
+            self.participants_box.sync(cur["entrants"])
         else:
-            ctk.CTkLabel(self.participants_box, text="Sem participantes ainda.").pack(anchor="w", padx=8, pady=8)
+            self.participants_box.clear()
 
+        hist = self.service.history()[:50]
+        sig = tuple((h.get('title'), h.get('ended_at'), h.get('winner')) for h in hist)
+        if sig == self._history_sig:
+            return
+        self._history_sig = sig
         for child in self.history_box.winfo_children():
             child.destroy()
-        hist = self.service.history()[:50]
         if not hist:
             ctk.CTkLabel(self.history_box, text="Nenhum sorteio finalizado ainda.").pack(anchor="w", padx=8, pady=6)
         else:
@@ -698,8 +696,25 @@ class GiveawaysPage(ctk.CTkFrame):
                     text_color=self.app.colors['text_secondary']
                 ).pack(side=tk.RIGHT)
 
+    def _make_participant_row(self, parent):
+        row = ctk.CTkFrame(parent, fg_color="transparent")
+        row.user_lbl = ctk.CTkLabel(row, text="", font=ctk.CTkFont(size=12, weight="bold"))
+        row.user_lbl.pack(side=tk.LEFT)
+        row.tickets_lbl = ctk.CTkLabel(
+            row, text="",
+            font=ctk.CTkFont(size=11, weight="bold"),
+            text_color="white",
+            fg_color=self.app.colors.get('twitch_purple_light', '#8b5cf6'),
+            corner_radius=999, padx=8, pady=2
+        )
+        row.tickets_lbl.pack(side=tk.RIGHT)
+        return row
+
+    def _fill_participant_row(self, row, user, tickets):
+        row.user_lbl.configure(text=f"@{user}")
+        row.tickets_lbl.configure(text=f"{tickets} ticket(s)")
+
     def refresh_from_bot(self):
-        self._force_reload_from_disk()
         self._refresh_ui()
 
     def set_winner_from_bot(self, winner: str | None):
@@ -708,33 +723,17 @@ class GiveawaysPage(ctk.CTkFrame):
             self._reset_winner_chat_area()
         else:
             self._set_winner_chat_hint()
-        self._force_reload_from_disk()
         self._refresh_ui()
 
-    def _force_reload_from_disk(self):
-        try:
-            for m in ("reload", "reload_from_disk", "load", "refresh"):
-                if hasattr(self.service, m) and callable(getattr(self.service, m)):
-                    getattr(self.service, m)()
-                    return
-        except Exception:
-            print("❌ Erro ao recarregar serviço de sorteios via método.")
-        try:
-            self.service = GiveawayService(
-                storage_path=self.app.settings.get('giveaways_store_file', 'giveaways.json'),
-                logger=self.app.log_message
-            )
-        except Exception:
-            print("❌ Erro ao recarregar serviço de sorteios.")
-
     def _set_entries_locked(self, locked: bool):
+        if locked:
+            bot = getattr(self.app, "bot", None)
+            pipeline = getattr(bot, "giveaway_entries", None)
+            if pipeline is not None:
+                # processa as entradas enfileiradas antes da trava
+                pipeline.flush()
         self.app.settings['giveaways_entries_locked'] = bool(locked)
         self.app.save_settings()
-        try:
-            if hasattr(self.app, "bot") and self.app.bot and hasattr(self.app.bot, "_notify_giveaways"):
-                self.app.bot._notify_giveaways(refresh=True)
-        except Exception:
-            pass
 
     def _toggle_lock(self):
         cur_state = bool(self.app.settings.get('giveaways_entries_locked', False))
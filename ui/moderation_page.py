@@ -140,6 +140,25 @@ class ModerationPage(ctk.CTkFrame):
             colors=self.app.colors, delay=350, wraplength=360
         )
 
+        bl_opts = ctk.CTkFrame(s2, fg_color="transparent")
+        bl_opts.pack(fill=tk.X, padx=12, pady=(0, 8))
+
+        self.blacklist_whole_word = ctk.CTkSwitch(bl_opts, text="Palavra inteira", command=self._save)
+        self.blacklist_whole_word.pack(side=tk.LEFT, padx=(3, 15))
+        attach_tooltip(
+            self.blacklist_whole_word, "Palavra inteira",
+            "Só bloqueia quando a palavra aparece isolada (ex.: 'ass' não bloqueia 'class').",
+            colors=self.app.colors, delay=350, wraplength=360
+        )
+
+        self.blacklist_normalize = ctk.CTkSwitch(bl_opts, text="Ignorar acentos/leet", command=self._save)
+        self.blacklist_normalize.pack(side=tk.LEFT, padx=15)
+        attach_tooltip(
+            self.blacklist_normalize, "Normalizar",
+            "Compara sem acentos e convertendo leetspeak (ex.: 'p4l4vr@' = 'palavra').",
+            colors=self.app.colors, delay=350, wraplength=360
+        )
+
         s3 = self._section(root, "Comando !permit",
                            "Concede permissão temporária para postar links.")
 
@@ -260,6 +279,8 @@ class ModerationPage(ctk.CTkFrame):
         (self.mod_enabled.select() if m.get('enabled', True) else self.mod_enabled.deselect())
         (self.anti_link.select() if m.get('anti_link_spam', False) else self.anti_link.deselect())
         (self.blacklist_enabled.select() if m.get('blacklist_enabled', False) else self.blacklist_enabled.deselect())
+        (self.blacklist_whole_word.select() if m.get('blacklist_whole_word', False) else self.blacklist_whole_word.deselect())
+        (self.blacklist_normalize.select() if m.get('blacklist_normalize', False) else self.blacklist_normalize.deselect())
 
         words = "\n".join(m.get('blacklist_words', []))
         self.blacklist_text.delete("1.0", tk.END)
@@ -299,6 +320,8 @@ class ModerationPage(ctk.CTkFrame):
         m['enabled'] = bool(self.mod_enabled.get())
         m['anti_link_spam'] = bool(self.anti_link.get())
         m['blacklist_enabled'] = bool(self.blacklist_enabled.get())
+        m['blacklist_whole_word'] = bool(self.blacklist_whole_word.get())
+        m['blacklist_normalize'] = bool(self.blacklist_normalize.get())
 
         words = [w.strip() for w in self.blacklist_text.get('1.0', tk.END).splitlines() if w.strip()]
         m['blacklist_words'] = words
@@ -18,6 +18,8 @@ from ui.timers_page import TimersPage
 from ui.tts_page import TTSPage
 from ui.points_page import PointsPage
 from ui.giveaways_page import GiveawaysPage
+from services.event_bus import EventBus, ActivityEvent
+from services.timer_scheduler import TimerScheduler
 
 class ModernTwitchBaseView(ctk.CTk):
         def __init__(self, root=None, *args, **kwargs):
@@ -36,13 +38,17 @@ class ModernTwitchBaseView(ctk.CTk):
             self.eventsub_thread = None
             self._update_timestamps_after_id = None
             self.mixer_volume = 0.5
-            self.timer_tick_count = 0
+            self.timer_scheduler = None
             self.tts_queue = queue.Queue()
+            self._log_queue = deque()
+            self._log_tags_configured = set()
+            self.bus = EventBus(self.log_message)
 
 
             self.commands_file = "commands.json"
             self.settings_file = "settings.json"
             self.activity_log_file = "activity_log.json"
+            self.activity_journal_dir = "activity_journal"
             self.timers_file = "timers.json"
 
             self.timers = {}
@@ -50,6 +56,8 @@ class ModernTwitchBaseView(ctk.CTk):
             self.settings = {}
             self.default_commands = {}
             self.activity_log = deque(maxlen=100)
+            self._activity_bubbles = deque()
+            self._pending_activity = []
 
             self._load_activity_log_from_file()
             self.load_settings()
@@ -58,6 +66,14 @@ class ModernTwitchBaseView(ctk.CTk):
 
             self.setup_ui()
 
+            self.bus.subscribe(
+                ActivityEvent,
+                lambda e: self.add_activity_entry(e.event_type, e.user, e.details),
+                maxsize=500
+            )
+            self.root.after(50, self._pump_events)
+            self.root.after(50, self._drain_log_queue)
+
             self.refresh_commands_list()
             self.refresh_rewards_list()
             self.refresh_timers_list()
@@ -82,6 +98,14 @@ class ModernTwitchBaseView(ctk.CTk):
                  self.root.destroy()
 
 
+        def _pump_events(self):
+            """Entrega, na thread do Tk, os eventos publicados pelo bot/EventSub."""
+            try:
+                self.bus.drain()
+            finally:
+                self.root.after(50, self._pump_events)
+
+
         def setup_custom_theme(self):
             """Sets up the color theme."""
             self.colors = {
@@ -133,6 +157,7 @@ class ModernTwitchBaseView(ctk.CTk):
             self.pages["sorteios"] = self.giveaways_page
             self.pages["giveaways"] = self.giveaways_page
             self.giveaways = self.giveaways_page
+            self.giveaways_service = self.giveaways_page.service
 
             self.select_frame_by_name("connect")
 
@@ -163,30 +188,67 @@ class ModernTwitchBaseView(ctk.CTk):
             self.activity_scroll_frame.grid(row=1, column=0, sticky="nsew", padx=15, pady=(0, 15))
             self.activity_scroll_frame.grid_columnconfigure(0, weight=1)
 
-        def _create_activity_item_widget(self, parent_frame, event_data):
+        def _create_activity_item_widget(self, parent_frame, event_data=None):
             """
-            Cria e retorna um widget CTkFrame estilizado para um item de atividade,
-            COM TAGS E USUÁRIO NA MESMA LINHA.
+            Cria um 'balão' de atividade (CTkFrame) com todos os sub-widgets fixos,
+            COM TAGS E USUÁRIO NA MESMA LINHA. O conteúdo é aplicado por
+            _bind_activity_item_widget, então o mesmo balão pode ser reaproveitado.
             """
-            raw_event_type = event_data['raw_event_type']
-            user_name = event_data['user']
-            details = event_data['details']
-            timestamp_obj = event_data['timestamp_obj']
-            time_ago_str = self._get_time_ago_string(timestamp_obj)
-
             item_frame = ctk.CTkFrame(
                 parent_frame,
                 fg_color=self.colors['surface_dark'],
                 corner_radius=8
             )
 
-            item_frame.timestamp_obj = timestamp_obj
-
             item_frame.grid_columnconfigure(0, weight=0)
             item_frame.grid_columnconfigure(1, weight=1)
             item_frame.grid_columnconfigure(2, weight=0)
             item_frame.grid_rowconfigure(0, weight=1)
 
+            item_frame.icon_label = ctk.CTkLabel(item_frame, text="", font=ctk.CTkFont(size=18))
+            item_frame.icon_label.grid(row=0, column=0, padx=(10, 5), pady=5, sticky="ew")
+
+            content_frame = ctk.CTkFrame(item_frame, fg_color="transparent")
+            content_frame.grid(row=0, column=1, sticky="w", pady=5, padx=5)
+
+            item_frame.badge_label = ctk.CTkLabel(
+                content_frame, text="", text_color=self.colors['text_primary'],
+                font=ctk.CTkFont(size=10, weight="bold"), corner_radius=5, padx=6, pady=2
+            )
+            item_frame.event_label = ctk.CTkLabel(
+                content_frame, text="", fg_color=self.colors['surface_lighter'], text_color=self.colors['text_primary'],
+                font=ctk.CTkFont(size=10, weight="bold"), corner_radius=5, padx=6, pady=2
+            )
+            item_frame.user_label = ctk.CTkLabel(
+                content_frame, text="", font=ctk.CTkFont(size=12, weight="bold"),
+                text_color=self.colors['text_primary'],
+                anchor="w"
+            )
+            item_frame.message_label = ctk.CTkLabel(
+                content_frame, text="", font=ctk.CTkFont(size=11),
+                text_color=self.colors['text_secondary'],
+                anchor="w"
+            )
+
+            time_label = ctk.CTkLabel(
+                item_frame, text="", font=ctk.CTkFont(size=12),
+                text_color=self.colors['text_secondary']
+            )
+            time_label.grid(row=0, column=2, padx=(0, 10), pady=5, sticky="e")
+            item_frame.time_label_widget = time_label
+            item_frame.timestamp_obj = None
+
+            if event_data is not None:
+                self._bind_activity_item_widget(item_frame, event_data)
+            return item_frame
+
+        def _bind_activity_item_widget(self, item_frame, event_data):
+            """Aplica os dados de uma atividade a um balão existente (só configure, sem criar widgets)."""
+            raw_event_type = event_data['raw_event_type']
+            user_name = event_data['user']
+            details = event_data['details']
+            timestamp_obj = event_data['timestamp_obj']
+
             icon_char = "❓"
             icon_color = self.colors['text_secondary']
             if raw_event_type == 'channel.follow':
@@ -199,33 +261,16 @@ class ModernTwitchBaseView(ctk.CTk):
                  icon_char = "🎁"; icon_color = self.colors['twitch_purple_light']
             elif raw_event_type == 'tts.redemption':
                  icon_char = "🗣️"; icon_color = self.colors['twitch_purple_light']
-
-            ctk.CTkLabel(
-                item_frame, text=icon_char, font=ctk.CTkFont(size=18), text_color=icon_color
-            ).grid(row=0, column=0, padx=(10, 5), pady=5, sticky="ew")
-
-            content_frame = ctk.CTkFrame(item_frame, fg_color="transparent")
-            content_frame.grid(row=0, column=1, sticky="w", pady=5, padx=5)
+            item_frame.icon_label.configure(text=icon_char, text_color=icon_color)
 
             badge_type_text = ""
             badge_type_color = ""
-            badge_text_color = self.colors['text_primary']
             if raw_event_type in ('channel.follow', 'channel.subscribe'):
                  badge_type_text = "New"; badge_type_color = self.colors['accent']
             elif raw_event_type in ('channel.channel_points_custom_reward_redemption.add', 'tts.redemption'):
                  badge_type_text = "Points"; badge_type_color = self.colors['twitch_purple']
 
-            if badge_type_text:
-                badge_type_label = ctk.CTkLabel(
-                    content_frame,
-                    text=badge_type_text, fg_color=badge_type_color, text_color=badge_text_color,
-                    font=ctk.CTkFont(size=10, weight="bold"), corner_radius=5, padx=6, pady=2
-                )
-                badge_type_label.pack(side=tk.LEFT, padx=(0, 5))
-
             event_name_text = ""
-            event_name_color = self.colors['surface_lighter']
-
             if raw_event_type == 'channel.follow':
                  event_name_text = "Follow"
             elif raw_event_type == 'channel.subscribe':
@@ -237,43 +282,32 @@ class ModernTwitchBaseView(ctk.CTk):
             elif raw_event_type == 'tts.redemption':
                  event_name_text = "TTS"
 
-            if event_name_text:
-                event_name_label = ctk.CTkLabel(
-                    content_frame,
-                    text=event_name_text, fg_color=event_name_color, text_color=self.colors['text_primary'],
-                    font=ctk.CTkFont(size=10, weight="bold"), corner_radius=5, padx=6, pady=2
-                )
-                event_name_label.pack(side=tk.LEFT, padx=(0, 5))
-
-            user_label = ctk.CTkLabel(
-                content_frame,
-                text=user_name, font=ctk.CTkFont(size=12, weight="bold"),
-                text_color=self.colors['text_primary'],
-                anchor="w"
-            )
-            user_label.pack(side=tk.LEFT, padx=(5, 0))
-
+            message_text = ""
             if raw_event_type == 'tts.redemption':
                 tts_message = details
                 truncated_message = tts_message[:60] + "..." if len(tts_message) > 40 else tts_message
-
-                message_label = ctk.CTkLabel(
-                    content_frame,
-                    text=f"Mensagem: \"{truncated_message}\"",
-                    font=ctk.CTkFont(size=11),
-                    text_color=self.colors['text_secondary'],
-                    anchor="w"
-                )
-                message_label.pack(side=tk.LEFT, padx=(5, 0))
-
-            time_label = ctk.CTkLabel(
-                item_frame, text=time_ago_str, font=ctk.CTkFont(size=12),
-                text_color=self.colors['text_secondary']
+                message_text = f"Mensagem: \"{truncated_message}\""
+
+            item_frame.badge_label.configure(text=badge_type_text, fg_color=badge_type_color or "transparent")
+            item_frame.event_label.configure(text=event_name_text)
+            item_frame.user_label.configure(text=user_name)
+            item_frame.message_label.configure(text=message_text)
+
+            # reempacota na ordem, omitindo os rótulos vazios
+            labels = (
+                (item_frame.badge_label, badge_type_text, (0, 5)),
+                (item_frame.event_label, event_name_text, (0, 5)),
+                (item_frame.user_label, True, (5, 0)),
+                (item_frame.message_label, message_text, (5, 0)),
             )
-            time_label.grid(row=0, column=2, padx=(0, 10), pady=5, sticky="e")
-            item_frame.time_label_widget = time_label
+            for label, _, _ in labels:
+                label.pack_forget()
+            for label, shown, padx in labels:
+                if shown:
+                    label.pack(side=tk.LEFT, padx=padx)
 
-            return item_frame
+            item_frame.timestamp_obj = timestamp_obj
+            item_frame.time_label_widget.configure(text=self._get_time_ago_string(timestamp_obj))
 
         def show_help(self):
             """Mostrar ajuda sobre comandos, incluindo a nova sintaxe avançada."""
@@ -583,9 +617,8 @@ class ModernTwitchBaseView(ctk.CTk):
             )
             msg_label.grid(row=1, column=1, padx=10, pady=(0, 5), sticky="ew")
 
-            interval_min = timer_config.get('interval_min', 0)
             min_lines = timer_config.get('min_lines', 0)
-            interval_text = f"{interval_min} min / {min_lines} linhas"
+            interval_text = f"{TimerScheduler.format_interval(timer_config)} / {min_lines} linhas"
             interval_label = ctk.CTkLabel(
                 item_frame, text=interval_text,
                 font=ctk.CTkFont(size=11),
@@ -1,6 +1,6 @@
 from datetime import datetime
-import json
-import os
+
+from services.activity_journal import ActivityJournal
 
 
 class ActivityMixin:
@@ -23,15 +23,25 @@ class ActivityMixin:
                 "timestamp_obj": current_datetime
             }
             self.activity_log.append(log_entry_data)
+            self.activity_journal.append(log_entry_data)
+
+            # rajadas (gift bombs, raids de bots) viram um único redesenho
+            self._pending_activity.append(log_entry_data)
+            if len(self._pending_activity) == 1:
+                self.root.after(0, self._flush_pending_activity)
+
 
-            #self.log_message("DEBUG: Agendando _add_new_activity_bubble...", "warning")
-            self.root.after(0, self._add_new_activity_bubble, log_entry_data)
+        def _flush_pending_activity(self):
+            """Desenha as atividades pendentes; só as últimas `maxlen` chegam a virar balão."""
+            pending, self._pending_activity = self._pending_activity, []
+            for event_data in pending[-self.activity_log.maxlen:]:
+                self._add_new_activity_bubble(event_data)
 
 
         def _load_initial_activity_display(self):
             """
-            Limpa e recria TODOS os 'balões' de atividade no ScrollableFrame,
-            usando grid. Chamado APENAS na conexão inicial.
+            Limpa e recria TODOS os 'balões' de atividade no ScrollableFrame
+            (o pool de balões). Chamado APENAS na conexão inicial.
             """
             if not hasattr(self, 'activity_page') or not hasattr(self.activity_page, 'activity_scroll_frame'):
                 # self.log_message("Aviso: Tentativa carregar feed antes da ActivityPage estar pronta.", "warning")
@@ -41,6 +51,7 @@ class ActivityMixin:
 
             for widget in frame.winfo_children():
                 widget.destroy()
+            self._activity_bubbles.clear()
 
             if not self.activity_log:
                  self.log_message("Feed de atividade inicial: Vazio.", "info")
@@ -48,17 +59,15 @@ class ActivityMixin:
 
             #self.log_message(f"Carregando {len(self.activity_log)} entradas no feed inicial...", "info")
 
-            row_index = 0
-            for entry_data in reversed(self.activity_log):
-                item_widget = self._create_activity_item_widget(frame, entry_data)
-                item_widget.grid(row=row_index, column=0, sticky="ew", padx=5, pady=(5, 0))
-                row_index += 1
+            for entry_data in self.activity_log:
+                self._add_new_activity_bubble(entry_data)
 
 
         def _add_new_activity_bubble(self, event_data):
             """
-            Adiciona UM novo 'balão' de atividade no TOPO (row=0) do ScrollableFrame,
-            usando grid e reconfigurando os existentes.
+            Adiciona UM novo 'balão' de atividade no TOPO do ScrollableFrame.
+            Com o feed cheio, reaproveita o balão mais antigo (o de baixo): reaplica os dados
+            e o move para o topo com pack(before=...), sem recriar nem reposicionar os demais.
             """
             #self.log_message(f"DEBUG: _add_new_activity_bubble chamada com dados: {event_data}", "warning")
 
@@ -67,111 +76,77 @@ class ActivityMixin:
                 return
 
             frame = self.activity_page.activity_scroll_frame
-            existing_widgets = frame.winfo_children()
-
-            for widget in existing_widgets:
-                try:
-                    grid_info = widget.grid_info()
-                    current_row = grid_info.get('row', 0)
-                    widget.grid_configure(row=current_row + 1)
-                except Exception as e:
-                    self.log_message(f"DEBUG: Erro ao reconfigurar grid do widget {widget}: {e}", "error")
-
-            item_widget = self._create_activity_item_widget(frame, event_data)
-
-            item_widget.grid(row=0, column=0, sticky="ew", padx=5, pady=(5, 0))
-            current_widgets_after_add = frame.winfo_children()
-            max_bubbles = self.activity_log.maxlen
-
-            if len(current_widgets_after_add) > max_bubbles:
-                widget_to_remove = None
-                max_row = -1
-                for widget in current_widgets_after_add:
-                     try:
-                         grid_info = widget.grid_info()
-                         row = grid_info.get('row', -1)
-                         if row > max_row:
-                             max_row = row
-                             widget_to_remove = widget
-                     except:
-                         continue
-
-                if widget_to_remove:
-                    self.log_message(f"DEBUG: Removendo balão antigo da row {max_row}.", "info")
-                    widget_to_remove.destroy()
-                else:
-                     self.log_message("DEBUG: Limpeza visual não encontrou widget para remover.", "warning")
+            bubbles = self._activity_bubbles
 
+            if len(bubbles) >= self.activity_log.maxlen:
+                item_widget = bubbles.pop()
+                self._bind_activity_item_widget(item_widget, event_data)
+            else:
+                item_widget = self._create_activity_item_widget(frame, event_data)
 
-        def _load_activity_log_from_file(self):
-            """Carrega o histórico de atividades do arquivo JSON, limitado ao maxlen do deque."""
-            if os.path.exists(self.activity_log_file):
-                try:
-                    with open(self.activity_log_file, 'r', encoding='utf-8') as f:
-                        log_data_list_full = json.load(f)
+            if bubbles:
+                item_widget.pack(fill="x", padx=5, pady=(5, 0), before=bubbles[0])
+            else:
+                item_widget.pack(fill="x", padx=5, pady=(5, 0))
+            bubbles.appendleft(item_widget)
 
-                    limit = self.activity_log.maxlen
-                    log_data_list = log_data_list_full[-limit:]
 
-                    loaded_entries = []
-                    for entry_dict in log_data_list:
-                        try:
-                            entry_dict['timestamp_obj'] = datetime.fromisoformat(entry_dict['timestamp_iso'])
-                            loaded_entries.append(entry_dict)
-                        except (ValueError, KeyError):
-                            print(f"Aviso: Ignorando entrada de log inválida: {entry_dict}")
-                            continue
+        def _load_activity_log_from_file(self):
+            """
+            Abre o diário de atividades (JSONL diário, sem limite), migrando o antigo
+            activity_log.json na primeira vez, e preenche o deque com a cauda (últimas maxlen).
+            """
+            try:
+                self.activity_journal = ActivityJournal(self.activity_journal_dir, self.log_message)
+                self.activity_journal.migrate_json(self.activity_log_file)
 
-                    self.activity_log.clear()
-                    self.activity_log.extend(loaded_entries)
+                limit = self.activity_log.maxlen
+                self.activity_log.clear()
+                self.activity_log.extend(self.activity_journal.tail(limit))
 
-                    self.log_message(f"📜 Histórico de {len(self.activity_log)} atividades carregado (Limitado aos últimos {limit}).", "system")
+                if self.activity_log:
+                    self.log_message(f"📜 Histórico de {len(self.activity_log)} atividades carregado (Exibindo as últimas {limit}).", "system")
+                else:
+                    self.log_message("📜 Nenhum histórico de atividades encontrado.", "info")
 
-                except Exception as e:
-                    self.log_message(f"❌ Erro ao carregar {self.activity_log_file}: {e}", "error")
-                    self.activity_log.clear()
-            else:
-                self.log_message("📜 Nenhum histórico de atividades encontrado.", "info")
+            except Exception as e:
+                self.log_message(f"❌ Erro ao carregar {self.activity_journal_dir}: {e}", "error")
+                self.activity_log.clear()
 
 
         def _save_activity_log_to_file(self):
-            """Salva o histórico atual de atividades no arquivo JSON."""
+            """As atividades já são gravadas uma a uma; aqui só persiste o índice do segmento atual."""
             try:
-                log_data_list = list(self.activity_log)
-                serializable_list = []
-                for entry_dict in log_data_list:
-                    save_entry = entry_dict.copy() 
-                    if isinstance(save_entry.get('timestamp_obj'), datetime):
-                        save_entry['timestamp_iso'] = save_entry['timestamp_obj'].isoformat()
-                    save_entry.pop('timestamp_obj', None) 
-                    serializable_list.append(save_entry)
-
-                with open(self.activity_log_file, 'w', encoding='utf-8') as f:
-                    json.dump(serializable_list, f, indent=2, ensure_ascii=False)
-                self.log_message(f"📜 Histórico de atividades salvo ({len(serializable_list)} entradas).", "system")
-
+                self.activity_journal.flush()
             except Exception as e:
-                self.log_message(f"❌ Erro ao salvar {self.activity_log_file}: {e}", "error")
+                self.log_message(f"❌ Erro ao salvar {self.activity_journal_dir}: {e}", "error")
 
 
         def _update_all_activity_timestamps(self):
-            """Percorre todos os balões visíveis e atualiza seus timestamps."""
+            """Atualiza os timestamps apenas dos balões visíveis na área rolável."""
 
             if not hasattr(self, 'activity_page') or not hasattr(self.activity_page, 'activity_scroll_frame') or not self.is_running:
                 return
             frame = self.activity_page.activity_scroll_frame
+            if not frame.winfo_ismapped():
+                return
 
             # self.log_message("DEBUG: Atualizando timestamps...", "info")
             try:
-                activity_items = frame.winfo_children()
-                for item_widget in activity_items:
-                    if hasattr(item_widget, 'timestamp_obj') and hasattr(item_widget, 'time_label_widget'):
-                        original_timestamp = item_widget.timestamp_obj
-                        time_label = item_widget.time_label_widget
-                        new_time_ago_str = self._get_time_ago_string(original_timestamp)
-                        if time_label.cget("text") != new_time_ago_str:
-                            time_label.configure(text=new_time_ago_str)
+                activity_items = list(self._activity_bubbles)
+                n = len(activity_items)
+                try:
+                    top, bottom = frame._parent_canvas.yview()
+                    lo, hi = max(0, int(top * n) - 1), min(n, int(bottom * n) + 2)
+                except Exception:
+                    lo, hi = 0, n
+                for item_widget in activity_items[lo:hi]:
+                    if item_widget.timestamp_obj is None:
+                        continue
+                    time_label = item_widget.time_label_widget
+                    new_time_ago_str = self._get_time_ago_string(item_widget.timestamp_obj)
+                    if time_label.cget("text") != new_time_ago_str:
+                        time_label.configure(text=new_time_ago_str)
 
             except Exception as e:
                 self.log_message(f"Erro ao atualizar timestamps: {e}", "error")
-
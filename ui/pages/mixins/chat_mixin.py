@@ -4,6 +4,13 @@ import tkinter as tk
 from ui.custom_dialog import CustomDialog
 from ui.toast_notification import ToastNotification
 
+LOG_COLORS = {
+    "info": "#adadb8", "chat": "#bf94ff", "bot": "#00ff7f",
+    "error": "#ff5555", "system": "#9146FF", "success": "#00ff7f"
+}
+LOG_FRAME_MS = 50
+LOG_BATCH_MAX = 2000
+
 
 class ChatMixin:
         def start_bot(self):
@@ -39,6 +46,9 @@ class ChatMixin:
             if not self.is_running: return
             self.is_running = False
 
+            if self.timer_scheduler:
+                self.timer_scheduler.stop()
+                self.timer_scheduler = None
             if self.bot: self.bot.disconnect()
             if self.eventsub: self.eventsub.stop()
 
@@ -63,30 +73,48 @@ class ChatMixin:
 
 
         def log_message(self, message, message_type="info"):
-            """Adicionar mensagem ao chat"""
+            """Adicionar mensagem ao chat (enfileira; _drain_log_queue desenha em lote)"""
 
             if hasattr(self, 'chat_page') and hasattr(self.chat_page, 'chat_text'):
-                chat_widget = self.chat_page.chat_text
+                timestamp = datetime.now().strftime("%H:%M:%S")
+                self._log_queue.append((timestamp, message, message_type))
+            else:
+                print(f"[{message_type.upper()}] {message}")
+
 
-                def update_chat():
-                    timestamp = datetime.now().strftime("%H:%M:%S")
-                    colors = {
-                        "info": "#adadb8", "chat": "#bf94ff", "bot": "#00ff7f", 
-                        "error": "#ff5555", "system": "#9146FF", "success": "#00ff7f"
-                    }
-                    color = colors.get(message_type, "#adadb8")
+        def _drain_log_queue(self):
+            """A ~20 Hz: insere todas as linhas pendentes com um único toggle de estado e corta o início."""
+            try:
+                if self._log_queue and hasattr(self, 'chat_page') and hasattr(self.chat_page, 'chat_text'):
+                    chat_widget = self.chat_page.chat_text
+                    configured = self._log_tags_configured
+                    if not configured:
+                        chat_widget.tag_config("timestamp", foreground="#6e6e7a")
+                        for tag, color in LOG_COLORS.items():
+                            chat_widget.tag_config(tag, foreground=color)
+                        configured.update(LOG_COLORS)
+                        configured.add("timestamp")
+
+                    parts = []
+                    for _ in range(min(len(self._log_queue), LOG_BATCH_MAX)):
+                        timestamp, message, message_type = self._log_queue.popleft()
+                        if message_type not in configured:
+                            chat_widget.tag_config(message_type, foreground=LOG_COLORS["info"])
+                            configured.add(message_type)
+                        parts += (f"[{timestamp}] ", "timestamp", f"{message}\n", message_type)
+
+                    max_lines = int((self.settings or {}).get("chat_log_max_lines", 2000) or 2000)
                     chat_widget.configure(state=tk.NORMAL)
-                    chat_widget.insert(tk.END, f"[{timestamp}] ", "timestamp")
-                    chat_widget.insert(tk.END, f"{message}\n", message_type)
-                    chat_widget.tag_config("timestamp", foreground="#6e6e7a")
-                    chat_widget.tag_config(message_type, foreground=color)
+                    chat_widget.insert(tk.END, *parts)
+                    lines = int(chat_widget.index("end-1c").split(".")[0])
+                    if lines > max_lines:
+                        chat_widget.delete("1.0", f"{lines - max_lines + 1}.0")
                     chat_widget.configure(state=tk.DISABLED)
                     chat_widget.see(tk.END)
-
-                self.root.after(0, update_chat)
-
-            else:
-                print(f"[{message_type.upper()}] {message}")
+            except Exception as e:
+                print(f"[ERROR] log: {e}")
+            finally:
+                self.root.after(LOG_FRAME_MS, self._drain_log_queue)
 
 
         def clear_chat_display(self):
@@ -62,6 +62,7 @@ class CommandsMixin:
             try:
                 with open(self.commands_file, 'w', encoding='utf-8') as f:
                     json.dump(self.default_commands, f, indent=2, ensure_ascii=False)
+                self._invalidate_bot_commands()
                 self.log_message("💾 Comandos salvos com sucesso!", "success")
                 ToastNotification(self.root, f"Comandos salvos!", colors=self.colors, toast_type="success")
             except Exception as e:
@@ -74,9 +75,17 @@ class CommandsMixin:
             self.refresh_commands_list()
             if self.bot:
                 self.bot.config['commands'] = self.default_commands
+            self._invalidate_bot_commands()
             self.log_message("🔄 Comandos recarregados!", "system")
 
 
+        def _invalidate_bot_commands(self, templates=True):
+            """Avisa o bot que comandos/configs mudaram (tabela de dispatch e templates compilados)."""
+            invalidate = getattr(self.bot, "invalidate_commands", None) if self.bot else None
+            if invalidate is not None:
+                invalidate(templates=templates)
+
+
         def add_command(self):
             """Adicionar novo comando (com cooldowns, bypass e som)."""
             cmd = self.new_cmd_var.get().strip()
@@ -259,6 +268,7 @@ class CommandsMixin:
 
                     if self.bot:
                         self.bot.config['commands'] = self.default_commands
+                    self._invalidate_bot_commands()
 
                     return f"✅ {user} adicionou: {cmd}. Contadores verificados."
 
@@ -278,6 +288,7 @@ class CommandsMixin:
 
                     if self.bot:
                         self.bot.config['commands'] = self.default_commands
+                    self._invalidate_bot_commands()
 
                     return f"✅ {user} removeu: {cmd}"
 
@@ -1,12 +1,15 @@
 
 import os
+import shutil
 import subprocess
 import sys
+import tempfile
 import zipfile
 from datetime import datetime
 from tkinter import filedialog
 import json
 
+from services.storage import backup_sqlite
 from ui.toast_notification import ToastNotification
 
 class ProfilesMixin:
@@ -15,7 +18,8 @@ class ProfilesMixin:
       - settings.json
       - commands.json
       - timers.json
-      - activity_file.json (se existir)
+      - activity_file.json (se existir) e os segmentos do diário de atividades
+      - o banco SQLite (backend 'sqlite'), como um retrato consistente via API de backup
     Operações usam o diretório atual como base (compatível com PyInstaller).
     Requisitos:
       - self.settings_file / self.commands_file / self.timers_file
@@ -31,8 +35,22 @@ class ProfilesMixin:
         rewards_file = getattr(self, "rewards_file", None)
         if rewards_file:
             files.append(rewards_file)
+        journal_dir = getattr(self, "activity_journal_dir", None)
+        if journal_dir and os.path.isdir(journal_dir):
+            files += [os.path.join(journal_dir, n) for n in sorted(os.listdir(journal_dir)) if not n.endswith(".tmp")]
         return [f for f in files if f and os.path.exists(f)]
 
+    def _profile_db_file(self, settings=None):
+        settings = (getattr(self, "settings", None) or {}) if settings is None else settings
+        if settings.get("storage_backend") != "sqlite":
+            return None
+        return settings.get("storage_db_file", "livechatbot.db")
+
+    @staticmethod
+    def _profile_arcname(path):
+        rel = os.path.relpath(path)
+        return rel if not rel.startswith("..") else os.path.basename(path)
+
     def export_profile(self):
         """Abre dialog e exporta os JSONs num .zip."""
         profile_name = f"LiveChatBot_Profile_{datetime.now():%Y%m%d_%H%M%S}.zip"
@@ -45,9 +63,25 @@ class ProfilesMixin:
         if not path:
             return
         try:
+            points = getattr(getattr(self, "bot", None), "points", None)
+            if points is not None and hasattr(points, "flush"):
+                points.flush()
+            journal = getattr(self, "activity_journal", None)
+            if journal is not None:
+                journal.flush()
+            db = self._profile_db_file()
             with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as z:
                 for f in self._profile_files():
-                    z.write(f, os.path.basename(f))
+                    z.write(f, self._profile_arcname(f))
+                if db and os.path.exists(db):
+                    # o bot pode estar gravando: exporta um retrato, nunca o arquivo vivo + -wal/-shm
+                    tmp_dir = tempfile.mkdtemp(prefix="livechatbot_")
+                    try:
+                        snapshot = os.path.join(tmp_dir, os.path.basename(db))
+                        backup_sqlite(db, snapshot)
+                        z.write(snapshot, self._profile_arcname(db))
+                    finally:
+                        shutil.rmtree(tmp_dir, ignore_errors=True)
             self.log_message(f"✅ Perfil exportado para: {path}", "success")
             ToastNotification(self.root, "Perfil exportado!", colors=self.colors, toast_type="success")
         except Exception as e:
@@ -64,7 +98,27 @@ class ProfilesMixin:
             return
         try:
             with zipfile.ZipFile(path, "r") as z:
-                z.extractall(".")
+                settings = getattr(self, "settings", None) or {}
+                settings_name = self._profile_arcname(getattr(self, "settings_file", "settings.json"))
+                if settings_name in z.namelist():
+                    try:
+                        settings = json.loads(z.read(settings_name).decode("utf-8")) or {}
+                    except ValueError:
+                        pass
+                db = self._profile_db_file(settings)
+                db_name = self._profile_arcname(db) if db else None
+
+                members = [m for m in z.namelist()
+                           if not m.endswith(("-wal", "-shm")) and m != db_name]
+                z.extractall(".", members)
+
+                if db_name in z.namelist():
+                    # o banco está aberto pelo bot: restaura pela API de backup em vez de sobrescrever o arquivo
+                    tmp_dir = tempfile.mkdtemp(prefix="livechatbot_")
+                    try:
+                        backup_sqlite(z.extract(db_name, tmp_dir), db)
+                    finally:
+                        shutil.rmtree(tmp_dir, ignore_errors=True)
             self.log_message("✅ Perfil importado. Recarregando configurações...", "success")
             ToastNotification(self.root, "Perfil importado!", colors=self.colors, toast_type="success")
 
@@ -133,6 +133,9 @@ class SettingsMixin:
                     mod['enabled'] = bool(mp.mod_enabled.get())
                     mod['anti_link_spam'] = bool(mp.anti_link.get())
                     mod['blacklist_enabled'] = bool(mp.blacklist_enabled.get())
+                    if hasattr(mp, 'blacklist_whole_word'):
+                        mod['blacklist_whole_word'] = bool(mp.blacklist_whole_word.get())
+                        mod['blacklist_normalize'] = bool(mp.blacklist_normalize.get())
 
                     if hasattr(mp, 'blacklist_text'):
                         try:
@@ -179,6 +182,9 @@ class SettingsMixin:
             try:
                 with open(self.settings_file, 'w', encoding='utf-8') as f:
                     json.dump(self.settings, f, indent=2, ensure_ascii=False)
+                self._invalidate_bot_commands(templates=False)
+                if self.bot and hasattr(self.bot, 'moderation'):
+                    self.bot.moderation.blacklist_matcher()
 
                 if not quiet:
                     if hasattr(self, 'messages_page'):
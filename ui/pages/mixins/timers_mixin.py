@@ -4,6 +4,8 @@ import os
 
 import customtkinter as ctk
 
+from services.outgoing_queue import PRIORITY_TIMER
+from services.timer_scheduler import TimerScheduler
 from ui.custom_dialog import CustomDialog
 from ui.edit_timer_dialog import EditTimerDialog
 from ui.toast_notification import ToastNotification
@@ -26,20 +28,23 @@ class TimersMixin:
 
             for name, config in self.timers.items():
                 config['last_run'] = datetime.now()
-                config['lines_since_last_run'] = 0
 
 
         def save_timers(self):
-            """Salva os timers no arquivo JSON (sem a chave last_run)."""
+            """Salva os timers no arquivo JSON (sem as chaves de execução) e reagenda os alterados."""
             serializable_timers = {}
             try:
                 for name, config in self.timers.items():
                     temp_config = config.copy()
                     temp_config.pop('last_run', None)
+                    temp_config.pop('line_mark', None)
+                    temp_config.pop('lines_since_last_run', None)
                     serializable_timers[name] = temp_config
 
                 with open(self.timers_file, 'w', encoding='utf-8') as f:
                     json.dump(serializable_timers, f, indent=2, ensure_ascii=False)
+                if self.timer_scheduler:
+                    self.timer_scheduler.reload()
                 self.log_message("💾 Timers salvos com sucesso!", "success")
                 ToastNotification(self.root, "Timers salvos!", colors=self.colors, toast_type="success")
             except Exception as e:
@@ -47,37 +52,13 @@ class TimersMixin:
                 ToastNotification(self.root, "Erro ao salvar timers!", colors=self.colors, toast_type="error")
 
 
-        def _timer_loop_check(self):
-            """
-            Verifica se algum timer precisa ser disparado.
-            Roda a cada 60 segundos (1 "Tick").
-            """
-            if not self.is_running or not self.bot:
-                if self.is_running:
-                     self.root.after(60000, self._timer_loop_check)
+        def _fire_timer(self, name, config):
+            """Dispara um timer (chamado pela thread do TimerScheduler)."""
+            if not self.bot or not self.bot.connected:
                 return
-
-            self.timer_tick_count += 1
-            lines_this_tick = self.bot.chat_lines_this_tick
-            self.bot.chat_lines_this_tick = 0
-
-            for name, config in self.timers.items():
-                if not config.get('enabled', False):
-                    continue
-
-                config['lines_since_last_run'] = config.get('lines_since_last_run', 0) + lines_this_tick
-
-                interval_min = config.get('interval_min', 10)
-
-                if (self.timer_tick_count % interval_min) == 0:
-                    min_lines = config.get('min_lines', 0)
-
-                    if config['lines_since_last_run'] >= min_lines:
-                        self.log_message(f"⏱️ Disparando Timer: {name}", "system")
-                        self.bot.send_message(config['message'])
-                        config['lines_since_last_run'] = 0 
-
-            self.root.after(60000, self._timer_loop_check)
+            self.log_message(f"⏱️ Disparando Timer: {name}", "system")
+            self.bot.send_message(self.bot.vars.format(config['message']), priority=PRIORITY_TIMER)
+            config['last_run'] = datetime.now()
 
 
         def add_new_timer(self):
@@ -87,11 +68,13 @@ class TimersMixin:
             page = self.timers_page
             name = page.new_timer_name_var.get().strip()
             message = page.new_timer_msg_var.get().strip()
+            interval = TimerScheduler.parse_interval(page.new_timer_interval_var.get())
             try:
-                interval = int(page.new_timer_interval_var.get())
                 min_lines = int(page.new_timer_lines_var.get())
             except ValueError:
-                CustomDialog(self.root, "Erro", "Intervalo e Linhas Mínimas devem ser números inteiros!", self.colors, 'error')
+                min_lines = None
+            if interval is None or min_lines is None:
+                CustomDialog(self.root, "Erro", f"Intervalo (ex.: 15, 90s, 1m30s; mínimo {TimerScheduler.MIN_INTERVAL_S}s) e Linhas Mínimas devem ser números inteiros!", self.colors, 'error')
                 return
 
             if not name or not message:
@@ -104,7 +87,7 @@ class TimersMixin:
 
             self.timers[name] = {
                 "message": message,
-                "interval_min": interval,
+                **TimerScheduler.interval_fields(interval),
                 "min_lines": min_lines,
                 "enabled": True,
                 "last_run": datetime.now()
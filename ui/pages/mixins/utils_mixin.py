@@ -4,6 +4,8 @@ import requests
 
 from bot import TwitchChatBot
 from eventsub import TwitchEventSubClient
+from services.helix_client import get_helix_client
+from services.timer_scheduler import TimerScheduler
 from ui.custom_dialog import CustomDialog
 from ui.toast_notification import ToastNotification
 
@@ -37,9 +39,10 @@ class UtilsMixin:
             """Verifies token, permissions via Twitch API in a separate thread."""
             self.log_message(f"🔍 Verificando permissões para #{channel_name}...", "system")
             try:
+                helix = get_helix_client()
                 api_token = token.replace("oauth:", "")
                 headers_validate = {'Authorization': f'OAuth {api_token}'}
-                resp_validate = requests.get('https://id.twitch.tv/oauth2/validate', headers=headers_validate)
+                resp_validate = helix.get('https://id.twitch.tv/oauth2/validate', headers=headers_validate)
                 if resp_validate.status_code != 200:
                     self.root.after(0, self.on_verification_failed, f"Token inválido/expirado ({resp_validate.status_code})")
                     return
@@ -52,7 +55,7 @@ class UtilsMixin:
 
                 headers_api = {'Authorization': f'Bearer {api_token}', 'Client-Id': client_id}
                 try:
-                    resp_channel = requests.get(f'https://api.twitch.tv/helix/users?login={channel_name}', headers=headers_api)
+                    resp_channel = helix.get('users', params={'login': channel_name}, headers=headers_api)
                     resp_channel.raise_for_status()
                     channel_data = resp_channel.json().get('data')
                     if not channel_data:
@@ -67,8 +70,9 @@ class UtilsMixin:
                 is_moderator = False
                 if bot_login.lower() != channel_name.lower():
                     try:
-                        resp_mod = requests.get(
-                            f'https://api.twitch.tv/helix/moderation/channels?user_id={bot_user_id}',
+                        resp_mod = helix.get(
+                            'moderation/channels',
+                            params={'user_id': bot_user_id},
                             headers=headers_api
                         )
                         if resp_mod.status_code == 401 or resp_mod.status_code == 403:
@@ -152,8 +156,12 @@ class UtilsMixin:
             self.root.after(200, self._load_initial_activity_display)
             self.root.after(300, self._update_reward_test_buttons_state, True)
 
-            self.timer_tick_count = 0
-            self.root.after(5000, self._timer_loop_check)
+            self.timer_scheduler = TimerScheduler(
+                lambda: self.timers, self._fire_timer,
+                lambda: self.bot.chat_lines_total if self.bot else 0,
+                lambda: self.settings, self.log_message
+            )
+            self.timer_scheduler.start()
 
             if self._update_timestamps_after_id: self.root.after_cancel(self._update_timestamps_after_id)
             self._update_timestamps_after_id = self.root.after(60000, self._schedule_timestamp_update)
@@ -50,7 +50,7 @@ class TimersPage(ctk.CTkFrame):
             border_color=self.app.colors['twitch_purple']
         ).grid(row=1, column=1, columnspan=5, sticky="ew", padx=10, pady=5)
 
-        ctk.CTkLabel(add_timer_frame, text="Intervalo (min):", font=ctk.CTkFont(size=12)).grid(
+        ctk.CTkLabel(add_timer_frame, text="Intervalo (min ou 45s):", font=ctk.CTkFont(size=12)).grid(
             row=2, column=0, sticky="w", padx=10, pady=5)
         self.new_timer_interval_var = tk.StringVar(value="15")
         ctk.CTkEntry(